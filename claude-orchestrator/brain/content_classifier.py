@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Content Classifier - Single-pass multi-pattern indicator counting
+
+Decides whether a document is transient (reports, findings) or permanent
+(architecture, specifications) by counting indicator words. All indicators
+are compiled into one case-insensitive regex that is run once over the text
+(instead of one substring scan per indicator over a lowercased copy), and
+files are streamed in chunks so large reports are never loaded in full.
+
+Counting is exact for overlapping indicators: the regex reports a match at
+every start position (zero-width lookahead), and indicators that are a prefix
+of a longer match at the same position are credited from a precomputed table.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_TRANSIENT_INDICATORS = [
+    "report", "status", "findings", "analysis",
+    "reorganization", "cleanup", "temporary"
+]
+
+DEFAULT_PERMANENT_INDICATORS = [
+    "architecture", "design", "api", "handbook",
+    "vision", "specification", "contract"
+]
+
+CHUNK_SIZE = 64 * 1024
+
+
+class IndicatorClassifier:
+    """Counts transient and permanent indicators in one pass"""
+
+    def __init__(self, transient: Iterable[str], permanent: Iterable[str]):
+        self.transient = sorted({str(word).lower() for word in transient if word})
+        self.permanent = sorted({str(word).lower() for word in permanent if word})
+        indicators = sorted(set(self.transient) | set(self.permanent), key=len, reverse=True)
+        self.indicators = indicators
+        self.max_length = max((len(word) for word in indicators), default=1)
+
+        # Longest alternative first, so each position reports its longest match
+        alternatives = "|".join(re.escape(word) for word in indicators) or "(?!)"
+        self._pattern = re.compile(f"(?=({alternatives}))", re.IGNORECASE)
+
+        # Shorter indicators that are prefixes of a longer one start at the same position
+        self._prefixes = {
+            word: [other for other in indicators if other != word and word.startswith(other)]
+            for word in indicators
+        }
+
+    def _count_matches(self, text: str, counts: Dict[str, int], limit: Optional[int] = None):
+        for match in self._pattern.finditer(text):
+            if limit is not None and match.start() >= limit:
+                break
+            word = match.group(1).lower()
+            counts[word] += 1
+            for prefix in self._prefixes[word]:
+                counts[prefix] += 1
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Return occurrences of every indicator in text"""
+        counts = dict.fromkeys(self.indicators, 0)
+        if text:
+            self._count_matches(text, counts)
+        return counts
+
+    def count_stream(self, stream: IO[str], chunk_size: int = CHUNK_SIZE) -> Dict[str, int]:
+        """Count indicators while reading a text stream chunk by chunk
+
+        The last max_length - 1 characters of each chunk are carried over so
+        indicators spanning a chunk boundary are counted exactly once.
+        """
+        counts = dict.fromkeys(self.indicators, 0)
+        overlap = self.max_length - 1
+        carry = ""
+
+        while True:
+            chunk = stream.read(chunk_size)
+            if not chunk:
+                break
+            buffer = carry + chunk
+            limit = len(buffer) - overlap
+            if limit > 0:
+                self._count_matches(buffer, counts, limit)
+                carry = buffer[limit:]
+            else:
+                carry = buffer
+
+        if carry:
+            self._count_matches(carry, counts)
+        return counts
+
+    def count_file(self, path: Path, chunk_size: int = CHUNK_SIZE) -> Dict[str, int]:
+        """Count indicators in a file without loading it fully"""
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return self.count_stream(f, chunk_size)
+
+    def summarize(self, counts: Dict[str, int]) -> Tuple[int, int]:
+        """Return (transient, permanent) numbers of distinct indicators present"""
+        transient = sum(1 for word in self.transient if counts.get(word))
+        permanent = sum(1 for word in self.permanent if counts.get(word))
+        return transient, permanent
+
+    def is_transient(self, counts: Dict[str, int]) -> bool:
+        """More distinct transient than permanent indicators present"""
+        transient, permanent = self.summarize(counts)
+        return transient > permanent
+
+    def classify_files(self, paths: Iterable[Path], workers: int = 1) -> Iterator[Dict[str, object]]:
+        """Classify many documents, optionally across a process pool
+
+        Yields:
+            {"path", "transient", "counts"} per document (unreadable files
+            are reported with an "error" instead)
+        """
+        paths = [Path(path) for path in paths]
+        if workers <= 1 or len(paths) < 2:
+            for path in paths:
+                yield _classify_file(self, path)
+            return
+
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(_classify_file, [self] * len(paths), paths, chunksize=16)
+
+
+def _classify_file(classifier: IndicatorClassifier, path: Path) -> Dict[str, object]:
+    try:
+        counts = classifier.count_file(path)
+    except OSError as e:
+        return {"path": str(path), "error": str(e)}
+    return {"path": str(path), "transient": classifier.is_transient(counts), "counts": counts}
+
+
+def build_classifier(documentation_rules: Optional[Dict] = None) -> IndicatorClassifier:
+    """Build a classifier from the defaults plus documentation.yaml indicators"""
+    documentation_rules = documentation_rules or {}
+    transient: List[str] = DEFAULT_TRANSIENT_INDICATORS + list(
+        documentation_rules.get('transient_indicators', []) or [])
+    permanent: List[str] = DEFAULT_PERMANENT_INDICATORS + list(
+        documentation_rules.get('permanent_indicators', []) or [])
+    return IndicatorClassifier(transient, permanent)
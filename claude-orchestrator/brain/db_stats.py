@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Database Stats - Constant-time row counts for the session database
+
+SELECT COUNT(*) scans the whole table, and handover gathers used to run it
+for every table. Instead every table gets an AFTER INSERT / AFTER DELETE
+trigger that keeps its row count in table_stats, so reading all counts is
+a single small query.
+
+schema.sql creates the counters for new databases; ensure_row_counters()
+adds them to existing databases (and to tables added later). The counters
+can drift if rows are replaced by INSERT OR REPLACE without recursive
+triggers, or if a trigger was missing while rows were written; deep_check()
+runs exact counts plus PRAGMA integrity_check and resets drifted counters.
+"""
+
+import re
+import sqlite3
+from typing import Any, Dict, List
+
+STATS_TABLE = "table_stats"
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+def _user_tables(conn: sqlite3.Connection) -> List[str]:
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type='table' "
+                        "AND name NOT LIKE 'sqlite_%' AND name != ?", (STATS_TABLE,))
+    return [name for (name,) in rows if _IDENTIFIER.match(name)]
+
+
+def _trigger_sql(table: str) -> List[str]:
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {table}_count_insert AFTER INSERT ON {table} BEGIN "
+        f"UPDATE {STATS_TABLE} SET row_count = row_count + 1 WHERE table_name = '{table}'; END",
+        f"CREATE TRIGGER IF NOT EXISTS {table}_count_delete AFTER DELETE ON {table} BEGIN "
+        f"UPDATE {STATS_TABLE} SET row_count = row_count - 1 WHERE table_name = '{table}'; END"
+    ]
+
+
+def has_row_counters(conn: sqlite3.Connection) -> bool:
+    """Whether every user table already has its counter and triggers"""
+    tables = _user_tables(conn)
+    if not tables:
+        return True
+    try:
+        counted = {name for (name,) in conn.execute(f"SELECT table_name FROM {STATS_TABLE}")}
+    except sqlite3.OperationalError:
+        return False
+    triggers = {name for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='trigger'")}
+    return all(table in counted and f"{table}_count_insert" in triggers
+               and f"{table}_count_delete" in triggers for table in tables)
+
+
+def ensure_row_counters(conn: sqlite3.Connection) -> bool:
+    """Create the stats table and triggers where missing
+
+    Tables that get a counter for the first time are counted once, in the
+    same transaction as the trigger creation.
+
+    Returns:
+        True if anything was installed
+    """
+    if has_row_counters(conn):
+        return False
+
+    with conn:
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {STATS_TABLE} ("
+                     f"table_name TEXT PRIMARY KEY, row_count INTEGER NOT NULL DEFAULT 0)")
+        counted = {name for (name,) in conn.execute(f"SELECT table_name FROM {STATS_TABLE}")}
+        for table in _user_tables(conn):
+            for statement in _trigger_sql(table):
+                conn.execute(statement)
+            if table not in counted:
+                conn.execute(f"INSERT INTO {STATS_TABLE} (table_name, row_count) "
+                             f"SELECT ?, COUNT(*) FROM {table}", (table,))
+    return True
+
+
+def read_row_counts(conn: sqlite3.Connection) -> Dict[str, int]:
+    """Row count per table from the trigger-maintained counters (O(1) per table)"""
+    return dict(conn.execute(f"SELECT table_name, row_count FROM {STATS_TABLE}"))
+
+
+def deep_check(conn: sqlite3.Connection, repair: bool = True) -> Dict[str, Any]:
+    """Exact counts and an integrity check
+
+    Args:
+        repair: Reset counters that disagree with the exact counts
+
+    Returns:
+        {"integrity": [messages] ("ok" when healthy), "counts": exact counts,
+        "drift": {table: counter - exact}}
+    """
+    integrity = [row[0] for row in conn.execute("PRAGMA integrity_check")]
+    exact = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+             for table in _user_tables(conn)}
+
+    try:
+        counters = read_row_counts(conn)
+    except sqlite3.OperationalError:
+        counters = {}
+    drift = {table: counters[table] - count for table, count in exact.items()
+             if table in counters and counters[table] != count}
+
+    if repair and drift:
+        with conn:
+            conn.executemany(f"UPDATE {STATS_TABLE} SET row_count = ? WHERE table_name = ?",
+                             [(exact[table], table) for table in drift])
+
+    return {"integrity": integrity, "counts": exact, "drift": drift}
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Decision Store - Maintenance task decisions in the session database
+
+User decisions on maintenance findings used to live only in one
+decisions_<task>_<session>.json file per task in docs/status/session-reports/,
+so every cross-session question meant globbing and parsing all of them.
+They are now rows in session_state.db:
+- task_decision_sets: one row per task and session (timestamp, approval,
+  other top-level keys such as findings_count)
+- task_decisions: one row per decided item (item, action, details,
+  approval, execution status), indexed by task/action/status/approval,
+  session/task, item and timestamp
+
+Sets are written in one transaction with batched inserts; saving a set
+again for the same task and session replaces it. export() returns the
+original JSON shape, which is still written next to the reports because
+fix-mode agents read the decisions file. Old JSON files are imported with
+import_json_files().
+
+The tables are defined in short-term-memory/schema.sql, which is applied
+when they are missing.
+"""
+
+import re
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+SET_KEYS = ("session_id", "task", "timestamp", "approved_by_user", "decisions")
+ITEM_KEYS = ("item", "action", "details", "approved", "status")
+DECISION_STATES = ("pending", "done", "failed", "skipped")
+
+LEGACY_NAME_PATTERN = re.compile(r'^decisions_(.+)_(session-[\d-]+)\.json$')
+
+
+class DecisionStore:
+    """Indexed decision sets and items in the session database"""
+
+    def __init__(self, db_path: Path, schema_path: Optional[Path] = None):
+        self.db_path = Path(db_path)
+        self.schema_path = Path(schema_path) if schema_path else self.db_path.parent / "schema.sql"
+        self._conn = None
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            present = {name for (name,) in self._conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' "
+                "AND name IN ('task_decision_sets', 'task_decisions')")}
+            if len(present) < 2:
+                # Every statement in schema.sql is idempotent
+                with open(self.schema_path, 'r') as f:
+                    self._conn.executescript(f.read())
+                self._conn.commit()
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def save(self, task: str, session_id: str, decisions: Dict[str, Any]) -> int:
+        """Store one decision set (replacing an earlier one for the same task and session)
+
+        Returns:
+            Number of decision items stored
+        """
+        return self.save_many([(task, session_id, decisions)])
+
+    def save_many(self, sets: Iterable[tuple]) -> int:
+        """Store several (task, session_id, decisions) sets in one transaction
+
+        Returns:
+            Number of decision items stored
+        """
+        conn = self._get_connection()
+        stored = 0
+        with conn:
+            for task, session_id, decisions in sets:
+                timestamp = str(decisions.get("timestamp") or datetime.now().isoformat())
+                approved = bool(decisions.get("approved_by_user", True))
+                extra = {key: value for key, value in decisions.items() if key not in SET_KEYS}
+
+                previous = conn.execute("SELECT set_id FROM task_decision_sets WHERE task = ? AND session_id = ?",
+                                        (task, session_id)).fetchone()
+                if previous:
+                    conn.execute("DELETE FROM task_decisions WHERE set_id = ?", previous)
+                    conn.execute("DELETE FROM task_decision_sets WHERE set_id = ?", previous)
+
+                set_id = conn.execute(
+                    "INSERT INTO task_decision_sets (session_id, task, timestamp, approved_by_user, extra) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (session_id, task, timestamp, approved, json.dumps(extra) if extra else None)).lastrowid
+
+                rows = []
+                for position, item in enumerate(decisions.get("decisions", [])):
+                    item_extra = {key: value for key, value in item.items() if key not in ITEM_KEYS}
+                    rows.append((set_id, session_id, task, position, item.get("item"), item.get("action"),
+                                 item.get("details"), bool(item.get("approved", approved)),
+                                 item.get("status", "pending"), timestamp,
+                                 json.dumps(item_extra) if item_extra else None))
+                conn.executemany(
+                    "INSERT INTO task_decisions (set_id, session_id, task, position, item, action, details, "
+                    "approved, status, timestamp, extra) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                stored += len(rows)
+        return stored
+
+    def export(self, task: str, session_id: str) -> Optional[Dict[str, Any]]:
+        """One decision set in the decisions_<task>_<session>.json shape
+
+        Returns:
+            The decisions dictionary, or None if nothing is stored
+        """
+        conn = self._get_connection()
+        row = conn.execute("SELECT set_id, timestamp, approved_by_user, extra FROM task_decision_sets "
+                           "WHERE task = ? AND session_id = ?", (task, session_id)).fetchone()
+        if row is None:
+            return None
+        set_id, timestamp, approved, extra = row
+
+        data = {"session_id": session_id, "task": task, "timestamp": timestamp,
+                "approved_by_user": bool(approved)}
+        data.update(json.loads(extra) if extra else {})
+        data["decisions"] = [self._item_dict(item) for item in conn.execute(
+            "SELECT decision_id, item, action, details, approved, status, extra FROM task_decisions "
+            "WHERE set_id = ? ORDER BY position", (set_id,))]
+        return data
+
+    @staticmethod
+    def _item_dict(row: tuple, with_id: bool = False) -> Dict[str, Any]:
+        decision_id, item, action, details, approved, status, extra = row
+        data = {"item": item, "action": action, "details": details}
+        data.update(json.loads(extra) if extra else {})
+        if not approved:
+            data["approved"] = False
+        if status != "pending":
+            data["status"] = status
+        if with_id:
+            data["id"] = decision_id
+        return data
+
+    def query(self, task: Optional[str] = None, session_id: Optional[str] = None,
+              action: Optional[str] = None, status: Optional[str] = None,
+              approved: Optional[bool] = None, item: Optional[str] = None,
+              since: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Decision items across sessions, newest first
+
+        Args:
+            task: Task name
+            session_id: Session id
+            action: Decided action (e.g. "add", "archive", "skip")
+            status: One of DECISION_STATES
+            approved: Only approved (True) or rejected (False) items
+            item: Exact item text
+            since: Only items with a timestamp at or after this ISO time
+            limit: Maximum number of items
+        """
+        conditions, params = [], []
+        for column, value in (("task", task), ("session_id", session_id), ("action", action),
+                              ("status", status), ("item", item)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if approved is not None:
+            conditions.append("approved = ?")
+            params.append(approved)
+        if since is not None:
+            conditions.append("timestamp >= ?")
+            params.append(since)
+
+        sql = ("SELECT decision_id, item, action, details, approved, status, extra, "
+               "session_id, task, timestamp FROM task_decisions")
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY timestamp DESC, position"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        results = []
+        for row in self._get_connection().execute(sql, params):
+            data = self._item_dict(row[:7], with_id=True)
+            data.update({"session_id": row[7], "task": row[8], "timestamp": row[9]})
+            data.setdefault("status", "pending")
+            results.append(data)
+        return results
+
+    def set_status(self, decision_ids: Iterable[int], status: str) -> int:
+        """Record the execution result of decision items
+
+        Returns:
+            Number of items updated
+        """
+        if status not in DECISION_STATES:
+            raise ValueError(f"Unknown decision status: {status}")
+        conn = self._get_connection()
+        with conn:
+            cursor = conn.executemany("UPDATE task_decisions SET status = ? WHERE decision_id = ?",
+                                      [(status, decision_id) for decision_id in decision_ids])
+        return cursor.rowcount
+
+    def import_json_files(self, reports_dir: Path) -> Dict[str, int]:
+        """Import decisions_*.json files that are not stored yet (one transaction)
+
+        Task and session come from the file content, or from the file name
+        for files without them.
+
+        Returns:
+            {"imported", "skipped"} counts
+        """
+        conn = self._get_connection()
+        known = set(conn.execute("SELECT task, session_id FROM task_decision_sets"))
+        sets, skipped = [], 0
+        for path in sorted(Path(reports_dir).glob("decisions_*.json")):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                skipped += 1
+                continue
+            match = LEGACY_NAME_PATTERN.match(path.name)
+            task = data.get("task") or (match.group(1) if match else None)
+            session_id = data.get("session_id") or (match.group(2) if match else None)
+            if not task or not session_id or (task, session_id) in known:
+                skipped += 1
+                continue
+            known.add((task, session_id))
+            sets.append((task, session_id, data))
+        self.save_many(sets)
+        return {"imported": len(sets), "skipped": skipped}
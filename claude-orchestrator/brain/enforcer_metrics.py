@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Enforcer Metrics - Counters and latency histograms for the RuleEnforcer
+
+Hooks call the enforcer throughout a session, so it needs to be cheap and
+we need to be able to see whether it is. This module keeps:
+- counters for checks run (per check type), violations (per rule) and
+  cache hits/misses
+- a fixed-bucket latency histogram per check type
+- the most recent violations in a bounded ring buffer, so memory stays flat
+
+Everything exports to plain JSON for dashboards.
+"""
+
+import json
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Optional
+
+# Histogram bucket upper bounds in microseconds (last bucket is open-ended)
+LATENCY_BUCKETS_US = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 100000, 1000000)
+
+DEFAULT_VIOLATION_BUFFER = 1000
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (microseconds)"""
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS_US) + 1)
+        self.count = 0
+        self.total_us = 0.0
+        self.min_us: Optional[float] = None
+        self.max_us: Optional[float] = None
+
+    def record(self, elapsed_us: float):
+        self.count += 1
+        self.total_us += elapsed_us
+        self.min_us = elapsed_us if self.min_us is None else min(self.min_us, elapsed_us)
+        self.max_us = elapsed_us if self.max_us is None else max(self.max_us, elapsed_us)
+        for i, bound in enumerate(LATENCY_BUCKETS_US):
+            if elapsed_us <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Upper bound of the bucket holding the given fraction of samples"""
+        if not self.count:
+            return None
+        threshold = fraction * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= threshold:
+                return LATENCY_BUCKETS_US[i] if i < len(LATENCY_BUCKETS_US) else self.max_us
+        return self.max_us
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"<={bound}us" for bound in LATENCY_BUCKETS_US] + [f">{LATENCY_BUCKETS_US[-1]}us"]
+        return {
+            "count": self.count,
+            "mean_us": round(self.total_us / self.count, 2) if self.count else None,
+            "min_us": round(self.min_us, 2) if self.min_us is not None else None,
+            "max_us": round(self.max_us, 2) if self.max_us is not None else None,
+            "p50_us": self.percentile(0.5),
+            "p95_us": self.percentile(0.95),
+            "buckets": {label: n for label, n in zip(labels, self.buckets) if n}
+        }
+
+
+class EnforcerMetrics:
+    """All instrumentation for one RuleEnforcer instance"""
+
+    def __init__(self, violation_buffer: int = DEFAULT_VIOLATION_BUFFER):
+        self.started = time.time()
+        self.checks: Counter = Counter()          # check type -> runs
+        self.violations_by_rule: Counter = Counter()
+        self.cache: Counter = Counter()           # e.g. snapshot_hits, snapshot_misses
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.recent_violations: Deque[Dict[str, Any]] = deque(maxlen=violation_buffer)
+
+    @contextmanager
+    def timed(self, check: str, runs: int = 1):
+        """Count and time one check (or a batch of `runs` checks)
+
+        Use runs=0 for operations that should be timed but not counted as
+        checks (e.g. loading rules).
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record(check, (time.perf_counter_ns() - start) / 1000, runs)
+
+    def record(self, check: str, elapsed_us: float, runs: int = 1):
+        """Record a check (or batch of checks) timed elsewhere, e.g. in a worker"""
+        if runs:
+            self.checks[check] += runs
+        histogram = self.latency.get(check)
+        if histogram is None:
+            histogram = self.latency[check] = LatencyHistogram()
+        histogram.record(elapsed_us)
+
+    def record_violation(self, record: Dict[str, Any]):
+        self.violations_by_rule[record.get("rule", "unknown")] += 1
+        self.recent_violations.append(record)
+
+    def record_cache(self, name: str, hit: bool):
+        self.cache[f"{name}_{'hits' if hit else 'misses'}"] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "since": self.started,
+            "checks_performed": sum(self.checks.values()),
+            "checks_by_type": dict(self.checks),
+            "total_violations": sum(self.violations_by_rule.values()),
+            "violations_by_rule": dict(self.violations_by_rule),
+            "cache": dict(self.cache),
+            "latency": {check: histogram.to_dict() for check, histogram in sorted(self.latency.items())},
+            "recent_violations": list(self.recent_violations)
+        }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent, default=str)
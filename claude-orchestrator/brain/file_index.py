@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+File Index - Persisted file metadata shared by the brain modules
+
+Keeps path, type, mtime, size and content hash of every project file that
+git would not ignore in an SQLite database under .orchestrator/state/, so
+HandoverManager, RuleEnforcer and the maintenance tooling query one index
+instead of each walking and stat-ing the tree:
+- recent(): top-K most recently modified files (optionally below a folder)
+- list_dir(): the entries of one folder
+- changed_since(): files modified after a point in time
+- files(): every file below a folder (e.g. all Markdown documents)
+
+refresh() brings the index up to date, either for the whole project or for
+a few folders (optionally non-recursive). Files are re-hashed only when
+their mtime or size changed (or when they were indexed without a hash),
+and entries that disappeared from a refreshed folder are removed. Refreshing is stat-based: there is no
+filesystem watcher (inotify is Linux-only and not in the standard library).
+"""
+
+import os
+import stat as stat_module
+import sqlite3
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from tree_walker import walk_tree
+
+INDEX_VERSION = 1
+
+# Larger files are indexed without a content hash
+HASH_SIZE_LIMIT = 16 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,          -- file, dir or link (symlinks are not followed)
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_files_parent ON files(parent);
+CREATE INDEX IF NOT EXISTS idx_files_mtime ON files(mtime_ns);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+_indexes: Dict[str, "FileIndex"] = {}
+
+
+def hash_file(path: Path) -> Optional[str]:
+    """SHA-1 of a file's content, read in blocks"""
+    digest = hashlib.sha1()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def _add_suffix_filter(sql: str, params: List[Any], suffix: Optional[str]) -> str:
+    """Restrict a query to names ending in suffix (case-sensitive, no wildcards)"""
+    if not suffix:
+        return sql
+    params.extend([suffix, suffix])
+    return sql + " AND substr(name, -length(?)) = ?"
+
+
+def _prefix_range(folder: str) -> Tuple[str, str]:
+    """Bounds matching every path below folder ('/' + 1 == '0')"""
+    return f"{folder}/", f"{folder}0"
+
+
+class FileIndex:
+    """File metadata index for one project root"""
+
+    def __init__(self, root: Path, db_path: Optional[Path] = None):
+        self.root = Path(root)
+        if db_path is None:
+            from utils import get_state_dir
+            digest = hashlib.sha1(str(self.root.resolve()).encode()).hexdigest()[:12]
+            db_path = get_state_dir() / f"file-index-{digest}.db"
+        self.db_path = Path(db_path)
+        self._conn = None
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.executescript(SCHEMA)
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != str(INDEX_VERSION):
+                with self._conn:
+                    self._conn.execute("DELETE FROM files")
+                    self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                                       (str(INDEX_VERSION),))
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def refresh(self, folders: Optional[Iterable[str]] = None, recursive: bool = True,
+                hash_files: bool = True) -> Dict[str, List[str]]:
+        """Update the index from the filesystem
+
+        Args:
+            folders: Folders to rescan, relative to the root (whole project if None)
+            recursive: Also rescan their subfolders
+            hash_files: Hash new and changed files, and unchanged files that
+                were indexed without a hash
+
+        Returns:
+            {"added", "modified", "removed"} relative paths
+        """
+        conn = self._get_connection()
+        changes = {"added": [], "modified": [], "removed": []}
+        folders = [''] if folders is None else [folder.strip('/') for folder in folders]
+
+        with conn:
+            for folder in folders:
+                self._refresh_folder(conn, folder, recursive, hash_files, changes)
+        return changes
+
+    def _refresh_folder(self, conn: sqlite3.Connection, folder: str, recursive: bool,
+                        hash_files: bool, changes: Dict[str, List[str]]):
+        if folder:
+            low, high = _prefix_range(folder)
+            if recursive:
+                rows = conn.execute("SELECT path, mtime_ns, size, hash FROM files "
+                                    "WHERE path >= ? AND path < ?", (low, high))
+            else:
+                rows = conn.execute("SELECT path, mtime_ns, size, hash FROM files WHERE parent = ?",
+                                    (folder,))
+        elif recursive:
+            rows = conn.execute("SELECT path, mtime_ns, size, hash FROM files")
+        else:
+            rows = conn.execute("SELECT path, mtime_ns, size, hash FROM files WHERE parent = ''")
+        known = {row["path"]: (row["mtime_ns"], row["size"], row["hash"]) for row in rows}
+
+        updates = []
+        for rel_path, is_dir in walk_tree(self.root, start=folder, recursive=recursive):
+            try:
+                stat = os.lstat(self.root / rel_path)
+            except OSError:
+                continue
+            previous = known.pop(rel_path, None)
+            size = 0 if is_dir else stat.st_size
+            kind = "dir" if is_dir else "link" if stat_module.S_ISLNK(stat.st_mode) else "file"
+            hashed = hash_files and kind == "file" and size <= HASH_SIZE_LIMIT
+            unchanged = previous is not None and previous[:2] == (stat.st_mtime_ns, size)
+            # Unchanged rows from a refresh without hashing only get their hash filled in
+            if unchanged and (previous[2] is not None or not hashed):
+                continue
+
+            digest = hash_file(self.root / rel_path) if hashed else None
+            parent, _, name = rel_path.rpartition('/')
+            updates.append((rel_path, parent, name, kind, stat.st_mtime_ns, size, digest))
+            if not unchanged:
+                changes["modified" if previous is not None else "added"].append(rel_path)
+
+        conn.executemany("INSERT OR REPLACE INTO files (path, parent, name, kind, mtime_ns, size, hash) "
+                         "VALUES (?, ?, ?, ?, ?, ?, ?)", updates)
+
+        # Whatever was indexed in this scope but not seen any more is gone
+        if known:
+            conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in known])
+            changes["removed"].extend(sorted(known))
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        return {"path": row["path"], "kind": row["kind"], "mtime": row["mtime_ns"] / 1e9,
+                "size": row["size"], "hash": row["hash"]}
+
+    def _scope(self, under: str, recursive: bool) -> Tuple[str, List[Any]]:
+        under = under.strip('/')
+        if not recursive:
+            return "parent = ?", [under]
+        if not under:
+            return "1", []
+        return "path >= ? AND path < ?", list(_prefix_range(under))
+
+    def get(self, path: str) -> Optional[Dict[str, Any]]:
+        row = self._get_connection().execute("SELECT * FROM files WHERE path = ?",
+                                             (path.strip('/'),)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def recent(self, limit: int = 10, under: str = '', suffix: Optional[str] = None,
+               recursive: bool = True) -> List[Dict[str, Any]]:
+        """Most recently modified files, newest first"""
+        where, params = self._scope(under, recursive)
+        sql = _add_suffix_filter(f"SELECT * FROM files WHERE kind = 'file' AND {where}", params, suffix)
+        sql += " ORDER BY mtime_ns DESC LIMIT ?"
+        return [self._to_dict(row) for row in self._get_connection().execute(sql, params + [limit])]
+
+    def list_dir(self, folder: str = '', suffix: Optional[str] = None,
+                 kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Entries directly inside a folder, by name"""
+        sql = "SELECT * FROM files WHERE parent = ?"
+        params: List[Any] = [folder.strip('/')]
+        sql = _add_suffix_filter(sql, params, suffix)
+        if kind:
+            sql += " AND kind = ?"
+            params.append(kind)
+        sql += " ORDER BY name"
+        return [self._to_dict(row) for row in self._get_connection().execute(sql, params)]
+
+    def files(self, under: str = '', suffix: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Every file below a folder, by path"""
+        where, params = self._scope(under, True)
+        sql = _add_suffix_filter(f"SELECT * FROM files WHERE kind = 'file' AND {where}", params, suffix)
+        sql += " ORDER BY path"
+        return [self._to_dict(row) for row in self._get_connection().execute(sql, params)]
+
+    def changed_since(self, timestamp: float, under: str = '') -> List[Dict[str, Any]]:
+        """Files modified after a Unix timestamp, oldest first"""
+        where, params = self._scope(under, True)
+        sql = f"SELECT * FROM files WHERE kind = 'file' AND mtime_ns > ? AND {where} ORDER BY mtime_ns"
+        return [self._to_dict(row) for row in
+                self._get_connection().execute(sql, [int(timestamp * 1e9)] + params)]
+
+    def iter_paths(self, include_dirs: bool = True) -> Iterator[Tuple[str, bool]]:
+        """(relative path, is_dir) for every indexed entry, like walk_tree"""
+        sql = "SELECT path, kind FROM files" + ("" if include_dirs else " WHERE kind = 'file'")
+        for path, kind in self._get_connection().execute(sql + " ORDER BY path"):
+            yield path, kind == "dir"
+
+    def get_statistics(self) -> Dict[str, Any]:
+        conn = self._get_connection()
+        counts = dict(conn.execute("SELECT kind, COUNT(*) FROM files GROUP BY kind").fetchall())
+        return {"root": str(self.root), "db_path": str(self.db_path),
+                "files": counts.get("file", 0), "dirs": counts.get("dir", 0),
+                "links": counts.get("link", 0)}
+
+
+def get_file_index(root: Optional[Path] = None) -> FileIndex:
+    """Shared FileIndex for a project root (one per process)
+
+    Args:
+        root: Project root (defaults to find_project_root())
+    """
+    if root is None:
+        from utils import find_project_root
+        root = find_project_root() or Path.cwd()
+    key = str(Path(root).resolve())
+    if key not in _indexes:
+        _indexes[key] = FileIndex(Path(root))
+    return _indexes[key]
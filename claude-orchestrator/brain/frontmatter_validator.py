@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Frontmatter Validator - Streaming check of Markdown YAML headers
+
+The YAML header check used to be an agent opening every document in full.
+validate_files() reads each file only up to the closing '---' of its
+frontmatter (at most MAX_HEADER_LINES lines), parses that block with the
+same flat parser as markdown_index and checks it against HEADER_SCHEMA.
+Files are checked in a thread pool; the work is almost entirely file I/O,
+so threads are enough and nothing has to be pickled.
+
+The report is plain JSON-serializable data:
+{"checked", "valid", "invalid", "elapsed_ms", "schema",
+ "files": [{"path", "status", "errors", "warnings", "fields"}]}
+where only files with errors or warnings are listed and status is one of
+"valid", "invalid", "missing" (no frontmatter) or "unterminated".
+"""
+
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from markdown_index import parse_frontmatter
+
+# Field -> expected shape: "text" (a non-empty value) or "list" (items, or
+# an inline [a, b] list)
+HEADER_SCHEMA = {
+    "project": "text",
+    "title": "text",
+    "version": "text",
+    "summary": "list",
+    "tags": "list",
+}
+
+# Frontmatter blocks longer than this are reported as unterminated
+MAX_HEADER_LINES = 200
+SUMMARY_ITEMS = (3, 5)
+
+PLACEHOLDER_VALUE = re.compile(r'^\[[^\]]*\]$')
+
+
+def read_frontmatter(path: Path, max_lines: int = MAX_HEADER_LINES) -> Dict[str, Any]:
+    """Read and parse only the frontmatter block of a file
+
+    Returns:
+        {"status": "ok" | "missing" | "unterminated" | "unreadable",
+        "fields": parsed fields (empty unless status is "ok")}
+    """
+    lines = []
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                line = line.rstrip('\r\n')
+                if not lines and line.strip() != '---':
+                    return {"status": "missing", "fields": {}}
+                lines.append(line)
+                if len(lines) > 1 and line.strip() == '---':
+                    break
+                if len(lines) > max_lines:
+                    return {"status": "unterminated", "fields": {}}
+    except OSError:
+        return {"status": "unreadable", "fields": {}}
+
+    parsed = parse_frontmatter(lines)
+    if parsed is None:
+        return {"status": "missing" if not lines else "unterminated", "fields": {}}
+    return {"status": "ok", "fields": parsed[0]}
+
+
+def check_fields(fields: Dict[str, Any], schema: Dict[str, str] = HEADER_SCHEMA) -> Dict[str, List[str]]:
+    """Check parsed frontmatter fields against a schema
+
+    Returns:
+        {"errors": [...], "warnings": [...]}
+    """
+    errors, warnings = [], []
+    for field, shape in schema.items():
+        if field not in fields:
+            errors.append(f"Missing field '{field}'")
+            continue
+        value = fields[field]
+        if not value:
+            errors.append(f"Empty field '{field}'")
+        elif shape == "text" and isinstance(value, list):
+            errors.append(f"Field '{field}' should be a single value, not a list")
+        elif shape == "text" and PLACEHOLDER_VALUE.match(value):
+            errors.append(f"Field '{field}' is a template placeholder: {value}")
+        elif shape == "list" and isinstance(value, str) and not PLACEHOLDER_VALUE.match(value):
+            errors.append(f"Field '{field}' should be a list ('- item' lines or [a, b])")
+
+    summary = fields.get("summary")
+    if "summary" in schema and isinstance(summary, list) and summary:
+        low, high = SUMMARY_ITEMS
+        if not low <= len(summary) <= high:
+            warnings.append(f"Summary has {len(summary)} item(s) (expected {low}-{high})")
+    return {"errors": errors, "warnings": warnings}
+
+
+def validate_file(root: Path, path: str, schema: Dict[str, str] = HEADER_SCHEMA) -> Dict[str, Any]:
+    """Validate the frontmatter of one file (path relative to root)"""
+    header = read_frontmatter(Path(root) / path)
+    result = {"path": path, "status": "valid", "errors": [], "warnings": [],
+              "fields": sorted(header["fields"])}
+    if header["status"] != "ok":
+        result["status"] = header["status"]
+        result["errors"].append({"missing": "No YAML frontmatter (file should start with '---')",
+                                 "unterminated": "Frontmatter is not closed with '---'",
+                                 "unreadable": "File cannot be read"}[header["status"]])
+        return result
+
+    checks = check_fields(header["fields"], schema)
+    result["errors"], result["warnings"] = checks["errors"], checks["warnings"]
+    if result["errors"]:
+        result["status"] = "invalid"
+    return result
+
+
+def validate_files(root: Path, paths: Iterable[str], schema: Dict[str, str] = HEADER_SCHEMA,
+                   workers: Optional[int] = None) -> Dict[str, Any]:
+    """Validate the frontmatter of many files concurrently
+
+    Args:
+        root: Project root the paths are relative to
+        paths: Markdown files to check
+        schema: Field -> "text" | "list"
+        workers: Threads (defaults to ThreadPoolExecutor's default)
+
+    Returns:
+        The report described in the module docstring
+    """
+    start = time.perf_counter()
+    paths = list(paths)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda path: validate_file(root, path, schema), paths))
+
+    flagged = [result for result in results if result["errors"] or result["warnings"]]
+    invalid = sum(1 for result in results if result["status"] != "valid")
+    return {"checked": len(results), "valid": len(results) - invalid, "invalid": invalid,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+            "schema": dict(schema), "files": flagged}
@@ -5,21 +5,63 @@ Handover Manager - Helper tools for LLM-driven handover creation
 This module provides utilities that the LLM can use to gather information
 and save handover documents. The LLM remains in control of the content
 creation and user interaction.
+
+GATHER CACHE:
+A session end runs info/gather several times. Each gathered section is
+stored in .orchestrator/state/gather-cache.json with its own invalidation
+key and only recomputed when that key changes:
+- git: mtimes of .git/index, HEAD and the current branch ref (plus a short
+  maximum age, since editing a tracked file does not touch the index)
+- todo: todo.md mtime and size
+- database: database file mtime and size, and SQLite's data_version on the
+  cached connection
+- previous_handover: handover-next.md mtime and size
+The project structure listing is cheap and always recomputed.
 """
 
 import os
+import re
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 import sqlite3
 import json
+import hashlib
 import subprocess
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 sys.path.insert(0, str(Path(__file__).parent))
-from utils import find_project_root
+from utils import find_project_root, get_state_dir
+from markdown_index import index_file, index_text, MarkdownIndex
+from frontmatter_validator import check_fields
+from handover_archive import HandoverArchive
+from db_stats import ensure_row_counters, read_row_counts, deep_check
+
+GATHER_CACHE_FILE = "gather-cache.json"
+GATHER_CACHE_VERSION = 1
+
+# Seconds a cached git section stays valid even if its key is unchanged
+GIT_CACHE_MAX_AGE = 30
+
+# Template placeholders that must not survive into a saved handover
+PLACEHOLDER_CHECKS = [
+    ("[TODO]", "unfilled TODO placeholder"),
+    ("[project name]", "project name placeholder - should be actual project name"),
+    ("[YYYY-MM-DD]", "date placeholder - should be actual date like 2025-08-11"),
+    ("[timestamp]", "timestamp placeholder - should be actual time like 14:30"),
+    ("[Brief Session Focus]", "session focus placeholder - should describe actual session work"),
+    ("[Document Path]", "document path placeholder - should be actual file path"),
+    ("[...]", "ellipsis placeholder - should have actual content"),
+    ("XXXX", "placeholder X's - should be replaced with actual content")
+]
+PLACEHOLDER_PATTERN = re.compile("|".join(re.escape(placeholder) for placeholder, _ in PLACEHOLDER_CHECKS))
+
+# Frontmatter fields a handover must have (the template has no version)
+HANDOVER_HEADER_SCHEMA = {"title": "text", "project": "text", "summary": "list"}
 
 class HandoverManager:
     """Provides helper functions for handover management"""
@@ -42,34 +84,192 @@ class HandoverManager:
         self.handover_dir = self.project_root / "docs" / "status"
         self.db_path = Path(__file__).parent.parent / "short-term-memory" / "session_state.db"
         self.todo_path = self.project_root / "docs" / "status" / "todo.md"
+        self._conn = None
+        self._gather_cache = None
+        self.archive = HandoverArchive(self.handover_dir / "archive")
+        self._search_index = None
         
         # Ensure handover directory exists
         self.handover_dir.mkdir(parents=True, exist_ok=True)
     
-    def gather_session_info(self) -> Dict[str, Any]:
+    def _get_connection(self) -> sqlite3.Connection:
+        """Return the session database connection, opened once and reused
+        
+        Long-lived processes (the orchestrator daemon) keep the connection warm
+        across commands instead of reconnecting on every gather.
+        """
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self._conn
+    
+    def close(self):
+        """Close the cached database connections"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        if self._search_index is not None:
+            self._search_index.close()
+    
+    def get_search_index(self):
+        """Full-text index over handovers, decisions and issues (opened once)"""
+        if self._search_index is None:
+            from search_index import SearchIndex
+            self._search_index = SearchIndex(get_state_dir() / "search-index.db",
+                                             self.handover_dir, self.db_path, archive=self.archive)
+        return self._search_index
+    
+    def gather_session_info(self, use_cache: bool = True, deep: bool = False) -> Dict[str, Any]:
         """Gather all available session information for LLM to analyze
         
         This is a helper function that collects raw data. The LLM will
         interpret this data and create the actual handover content.
         
+        The independent sections (git, database, TODO, structure, previous
+        handover) are collected concurrently; git status is read once and
+        shared by git_status and modified_files.
+        
+        Args:
+            use_cache: Reuse cached sections whose invalidation key is unchanged
+            deep: Check the database with exact counts and an integrity check
+        
         Returns:
-            Dictionary with various session information
+            Dictionary with various session information, including
+            per-section collection times in "timings_ms" and the cache
+            "hits" and "misses" in "cache"
         """
+        sections = {
+            "git": self._get_git_snapshot,
+            "database": (lambda: self._check_database_state(deep=True)) if deep else self._check_database_state,
+            "todo": self._get_todo_priorities,
+            "structure": self._get_relevant_structure,
+            "previous_handover": self._get_previous_handover_summary
+        }
+        
+        self._load_gather_cache()
+        with ThreadPoolExecutor(max_workers=len(sections)) as pool:
+            futures = {name: pool.submit(self._cached_section, name, collect,
+                                         use_cache and not (deep and name == "database"))
+                       for name, collect in sections.items()}
+            results = {name: future.result() for name, future in futures.items()}
+        
+        cache_report = {"hits": [], "misses": []}
+        for name, (_, _, hit) in results.items():
+            if hit is not None:
+                cache_report["hits" if hit else "misses"].append(name)
+        if cache_report["misses"]:
+            self._save_gather_cache()
+        
+        git_snapshot = results["git"][0]
+        previous_handover = results["previous_handover"][0]
         info = {
             "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M"),
-            "git_status": self._get_git_status(),
-            "modified_files": self._get_modified_files(),
-            "database_state": self._check_database_state(),
-            "todo_items": self._get_todo_priorities(),
-            "project_structure": self._get_relevant_structure(),
-            "previous_handover": self._get_previous_handover_summary(),
-            "session_goals": self._extract_session_goals(),
+            "git_status": self._get_git_status(git_snapshot),
+            "modified_files": self._get_modified_files(git_snapshot),
+            "database_state": results["database"][0],
+            "todo_items": results["todo"][0],
+            "project_structure": results["structure"][0],
+            "previous_handover": previous_handover,
+            "session_goals": previous_handover.get("session_goals", []),
             "warnings": [],
-            "template_path": str(self.project_root / "claude-orchestrator" / "resource-library" / "documents" / "handovers" / "Session_Handover_Template.md")
+            "template_path": str(self.project_root / "claude-orchestrator" / "resource-library" / "documents" / "handovers" / "Session_Handover_Template.md"),
+            "timings_ms": {name: result[1] for name, result in results.items()},
+            "cache": cache_report
         }
         
         return info
     
+    def _cached_section(self, name: str, collect, use_cache: bool) -> Tuple[Any, float, Optional[bool]]:
+        """Return a gather section from the cache or by collecting it
+        
+        Returns:
+            (result, elapsed milliseconds, cache hit) where cache hit is None
+            for sections that are never cached
+        """
+        start = time.perf_counter()
+        key = self._section_key(name)
+        hit = None
+        
+        if key is not None:
+            cache = self._load_gather_cache()
+            entry = cache.get(name)
+            max_age = GIT_CACHE_MAX_AGE if name == "git" else None
+            hit = (use_cache and entry is not None and entry.get("key") == key
+                   and (max_age is None or time.time() - entry.get("stored_at", 0) <= max_age))
+        
+        if hit:
+            result = entry["value"]
+        else:
+            result = collect()
+            if key is not None:
+                # Round-trip through JSON so hits and misses return the same types
+                cache[name] = json.loads(json.dumps(
+                    {"key": key, "stored_at": time.time(), "value": result}, default=str))
+                result = cache[name]["value"]
+        
+        return result, round((time.perf_counter() - start) * 1000, 2), hit
+    
+    def _section_key(self, name: str) -> Optional[List[Any]]:
+        """Invalidation key for a cached gather section (None = not cached)"""
+        if name == "git":
+            git_dir = self.project_root / ".git"
+            key = [self._stat_key(git_dir / "index"), self._stat_key(git_dir / "HEAD")]
+            try:
+                head = (git_dir / "HEAD").read_text().strip()
+            except OSError:
+                return None
+            if head.startswith("ref: "):
+                key.append(self._stat_key(git_dir / head[5:]))
+                key.append(self._stat_key(git_dir / "packed-refs"))
+            return key
+        if name == "todo":
+            return [self._stat_key(self.todo_path)]
+        if name == "database":
+            key = [self._stat_key(self.db_path), self._stat_key(Path(f"{self.db_path}-wal"))]
+            if self._conn is not None:
+                # data_version only changes when another connection commits
+                try:
+                    key.append(self._conn.execute("PRAGMA data_version").fetchone()[0])
+                except sqlite3.Error:
+                    return None
+            return key
+        if name == "previous_handover":
+            return [self._stat_key(self.handover_dir / "handover-next.md")]
+        return None
+    
+    @staticmethod
+    def _stat_key(path: Path) -> Optional[List[int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+    
+    def _load_gather_cache(self) -> Dict[str, Any]:
+        """Load this project's cached sections (once per manager)"""
+        if self._gather_cache is None:
+            self._gather_cache = {}
+            try:
+                with open(get_state_dir() / GATHER_CACHE_FILE, 'r') as f:
+                    stored = json.load(f)
+                if (stored.get("version") == GATHER_CACHE_VERSION
+                        and stored.get("project_root") == str(self.project_root)):
+                    self._gather_cache = stored.get("sections", {})
+            except (OSError, ValueError):
+                pass
+        return self._gather_cache
+    
+    def _save_gather_cache(self):
+        """Store the cached sections atomically"""
+        cache_path = get_state_dir() / GATHER_CACHE_FILE
+        try:
+            tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({"version": GATHER_CACHE_VERSION, "project_root": str(self.project_root),
+                           "sections": self._load_gather_cache()}, f, default=str)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"⚠️ Could not write gather cache: {e}", file=sys.stderr)
+    
     def archive_and_save_handover(self, content: str) -> str:
         """Archive existing handover and save new content
         
@@ -97,12 +297,8 @@ class HandoverManager:
         with open(handover_path, 'w') as f:
             f.write(content)
         
-        # Also save timestamped archive
-        archive_dir = self.handover_dir / "archive"
-        archive_dir.mkdir(parents=True, exist_ok=True)
-        archive_path = archive_dir / f"handover-{timestamp}.md"
-        with open(archive_path, 'w') as f:
-            f.write(content)
+        # Also archive it (compressed, stored once per distinct content)
+        archive_entry = self.archive.add(content, timestamp, source="saved")
         
         # CRITICAL: Post-save sanity check
         if not handover_path.exists():
@@ -111,13 +307,13 @@ class HandoverManager:
         actual_size = handover_path.stat().st_size
         if actual_size < 100:
             # Try to restore from archive if main save failed
-            if actual_size == 0 and archive_path.exists():
+            if actual_size == 0:
                 print("⚠️ CRITICAL: Main handover is empty! Checking archive...", file=sys.stderr)
-                archive_size = archive_path.stat().st_size
-                if archive_size > 100:
+                archived = self.archive.read(archive_entry["id"]) or ""
+                if len(archived) > 100:
                     print("✅ Archive has content. Restoring from archive...", file=sys.stderr)
-                    import shutil
-                    shutil.copy2(archive_path, handover_path)
+                    with open(handover_path, 'w') as f:
+                        f.write(archived)
                     actual_size = handover_path.stat().st_size
                 else:
                     raise IOError(f"❌ CRITICAL: Both handover and archive are empty! Save failed completely.")
@@ -149,6 +345,14 @@ class HandoverManager:
         
         return content
     
+    def get_handover_index(self) -> Optional[MarkdownIndex]:
+        """Section index of handover-next.md (parsed once, cached by mtime)
+        
+        Returns:
+            MarkdownIndex or None if there is no handover
+        """
+        return index_file(self.handover_dir / "handover-next.md")
+    
     def validate_handover_structure(self, content: str) -> Dict[str, Any]:
         """Quick validation of handover structure
         
@@ -172,6 +376,9 @@ class HandoverManager:
             validation["errors"].append("Handover too short (< 500 chars)")
             validation["valid"] = False
         
+        # One pass over the document; all section checks use the index
+        index = index_text(content)
+        
         # Check required sections with descriptive names
         required_sections = [
             ("# Session Handover:", "Main handover title"),
@@ -186,14 +393,14 @@ class HandoverManager:
         
         # Check sections that can have variations
         goal_sections = ["## 🎯 Next Session Goal", "## 🎯 This Session Goal"]
-        if not any(section in content for section in goal_sections):
+        if not any(index.find_heading(section) for section in goal_sections):
             validation["errors"].append("Missing section: Session Goal (should be '## 🎯 Next Session Goal' or '## 🎯 This Session Goal')")
             validation["valid"] = False
         else:
             validation["section_count"] += 1
             
         task_sections = ["## 📋 Task Breakdown", "## 📋 Session Task Breakdown"]
-        if not any(section in content for section in task_sections):
+        if not any(index.find_heading(section) for section in task_sections):
             validation["errors"].append("Missing section: Task Breakdown (should be '## 📋 Task Breakdown' or '## 📋 Session Task Breakdown')")
             validation["valid"] = False
         else:
@@ -201,46 +408,32 @@ class HandoverManager:
         
         # Check other required sections
         for section_marker, section_name in required_sections:
-            if section_marker not in content:
+            if not index.find_heading(section_marker):
                 validation["errors"].append(f"Missing section: {section_name} ('{section_marker}')")
                 validation["valid"] = False
             else:
                 validation["section_count"] += 1
         
-        # Check for template placeholders with context
-        placeholder_checks = [
-            ("[TODO]", "unfilled TODO placeholder"),
-            ("[project name]", "project name placeholder - should be actual project name"),
-            ("[YYYY-MM-DD]", "date placeholder - should be actual date like 2025-08-11"),
-            ("[timestamp]", "timestamp placeholder - should be actual time like 14:30"),
-            ("[Brief Session Focus]", "session focus placeholder - should describe actual session work"),
-            ("[Document Path]", "document path placeholder - should be actual file path"),
-            ("[...]", "ellipsis placeholder - should have actual content"),
-            ("XXXX", "placeholder X's - should be replaced with actual content")
-        ]
-        
-        for placeholder, description in placeholder_checks:
-            if placeholder in content:
+        # Check for template placeholders with context (one regex pass)
+        found_placeholders = set(PLACEHOLDER_PATTERN.findall(content))
+        for placeholder, description in PLACEHOLDER_CHECKS:
+            if placeholder in found_placeholders:
                 validation["warnings"].append(f"Found {description}: '{placeholder}'")
                 validation["valid"] = False
         
         # Check YAML frontmatter
-        if not content.startswith("---"):
+        if not index.has_frontmatter:
             validation["errors"].append("Missing YAML frontmatter (document should start with '---')")
             validation["valid"] = False
         else:
-            # Check YAML has required fields
-            yaml_section = content.split("---")[1] if "---" in content else ""
-            if "title:" not in yaml_section:
-                validation["warnings"].append("YAML frontmatter missing 'title' field")
-            if "project:" not in yaml_section:
-                validation["warnings"].append("YAML frontmatter missing 'project' field")
-            if "summary:" not in yaml_section:
-                validation["warnings"].append("YAML frontmatter missing 'summary' field")
+            # Check YAML has required fields (same checks as YAML_Headers_Check)
+            for problem in check_fields(index.frontmatter, HANDOVER_HEADER_SCHEMA)["errors"]:
+                validation["warnings"].append(f"YAML frontmatter: {problem}")
         
         # Check for critical content elements
-        if "MANDATORY READS" in content:
-            mandatory_section = content[content.find("MANDATORY READS"):content.find("##", content.find("MANDATORY READS") + 1) if "##" in content[content.find("MANDATORY READS") + 1:] else len(content)]
+        mandatory = index.find("MANDATORY READS")
+        if mandatory:
+            mandatory_section = index.section_text(mandatory[0], subtree=True)
             if "/docs/read-first.md" not in mandatory_section and "docs/read-first.md" not in mandatory_section:
                 validation["warnings"].append("Mandatory Reads section missing reference to 'docs/read-first.md'")
             if "CLAUDE.md" not in mandatory_section:
@@ -251,8 +444,9 @@ class HandoverManager:
             validation["warnings"].append("No working directory specified (should specify project directory)")
         
         # Additional quality checks
-        if content.count("##") < 8:
-            validation["warnings"].append(f"Only {content.count('##')} section headers found (expected at least 10)")
+        header_count = sum(1 for section in index.sections if section.level >= 2)
+        if header_count < 8:
+            validation["warnings"].append(f"Only {header_count} section headers found (expected at least 10)")
         
         if "⚠️" not in content and "WARNING" not in content.upper():
             validation["warnings"].append("No warnings section found (every handover should note potential issues)")
@@ -260,99 +454,230 @@ class HandoverManager:
         return validation
     
     def _archive_existing_handover(self, timestamp: str):
-        """Archive the existing handover-next.md if it exists"""
+        """Archive the existing handover-next.md if it exists
+        
+        Usually a no-op: the previous handover was archived when it was saved,
+        and the archive skips content identical to its latest entry.
+        
+        Returns:
+            Id of the archive entry or None
+        """
         current_handover = self.handover_dir / "handover-next.md"
         
         if current_handover.exists():
-            archive_dir = self.handover_dir / "archive"
-            archive_dir.mkdir(parents=True, exist_ok=True)
-            
-            archive_path = archive_dir / f"handover-archived-{timestamp}.md"
-            
             with open(current_handover, 'r') as f:
                 content = f.read()
             
-            with open(archive_path, 'w') as f:
-                f.write(content)
-            
-            return str(archive_path.relative_to(self.project_root))
+            return self.archive.add(content, timestamp, source="previous")["id"]
         return None
     
-    def _get_git_status(self) -> Dict[str, Any]:
-        """Get detailed git status information"""
-        status = {"branch": "unknown", "changes": [], "uncommitted_count": 0}
+    def render_handover_draft(self, use_cache: bool = True) -> Dict[str, Any]:
+        """Pre-render the factual sections of the handover template
+        
+        Git state, modified files, TODO counts, recorded decisions and open
+        issues, the previous handover reference and the mandatory reads are
+        filled in from session data; the narrative sections keep their
+        placeholders for the LLM.
+        
+        Args:
+            use_cache: Reuse cached gather sections
+        
+        Returns:
+            {"content", "rendered", "open"} (see handover_draft.render_draft)
+        """
+        from handover_draft import render_draft
+        
+        info = self.gather_session_info(use_cache=use_cache)
+        template_path = Path(info["template_path"])
+        template = template_path.read_text(encoding='utf-8')
+        
+        facts = {
+            "timestamp": info["timestamp"],
+            "project": self.project_root.name,  # or the previous handover's, below
+            "project_root": str(self.project_root),
+            "read_first": [f"/{path}" if path.startswith("docs") else path
+                           for path in ("docs/read-first.md", "docs/status/read-first.md", "CLAUDE.md")
+                           if (self.project_root / path).exists()],
+            "previous_handover": None,
+            "git": info["git_status"],
+            "modified_files": info["modified_files"],
+            "todo": info["todo_items"],
+            "database": info["database_state"],
+            "carried_warnings": info["previous_handover"].get("warnings", []),
+            "commands": info["project_structure"].get("commands", []),
+            **self._get_recent_records()
+        }
         
+        # The current handover becomes the previous one; the archive finds it by hash
+        current = self.read_handover()
+        if current:
+            index = self.get_handover_index()
+            frontmatter = index.frontmatter if index is not None else {}
+            title = frontmatter.get("title")
+            if isinstance(frontmatter.get("project"), str) and frontmatter["project"]:
+                facts["project"] = frontmatter["project"]
+            facts["previous_handover"] = {
+                "hash": hashlib.sha256(current.encode('utf-8')).hexdigest(),
+                "title": title if isinstance(title, str) else ""
+            }
+        
+        return render_draft(template, facts)
+    
+    def _get_recent_records(self, limit: int = 5) -> Dict[str, List[Dict[str, Any]]]:
+        """Latest decisions and unresolved issues from the session database"""
+        records = {"decisions": [], "open_issues": []}
+        if not self.db_path.exists():
+            return records
         try:
-            # Get branch
-            result = subprocess.run(
-                ["git", "branch", "--show-current"],
-                capture_output=True, text=True, cwd=self.project_root
-            )
-            status["branch"] = result.stdout.strip()
-            
-            # Get changed files
-            result = subprocess.run(
-                ["git", "status", "--porcelain"],
-                capture_output=True, text=True, cwd=self.project_root
+            conn = self._get_connection()
+            rows = conn.execute("SELECT what_was_decided, reason, approved_by_user, timestamp "
+                                "FROM decisions ORDER BY decision_id DESC LIMIT ?", (limit,)).fetchall()
+            records["decisions"] = [{"what": what, "reason": reason, "approved": bool(approved),
+                                     "timestamp": timestamp} for what, reason, approved, timestamp in rows]
+            rows = conn.execute("SELECT issue_description, resolution_attempted, timestamp FROM issues "
+                                "WHERE NOT resolved ORDER BY issue_id DESC LIMIT ?", (limit,)).fetchall()
+            records["open_issues"] = [{"description": description, "attempted": attempted,
+                                       "timestamp": timestamp} for description, attempted, timestamp in rows]
+        except sqlite3.Error:
+            pass
+        return records
+    
+    def _get_git_snapshot(self) -> Dict[str, Any]:
+        """Read branch and working tree state with a single git status call
+        
+        Runs 'git status --porcelain=v2 --branch -z' (and 'git log -1'
+        alongside it) and parses the result into one structure shared by
+        _get_git_status and _get_modified_files.
+        
+        Returns:
+            {"branch", "oid", "upstream", "ahead", "behind", "last_commit",
+            "entries": [(XY status, path, original path or None)]} or
+            {"error": ...} if git could not be run
+        """
+        snapshot = {"branch": "unknown", "oid": None, "upstream": None,
+                    "ahead": 0, "behind": 0, "last_commit": "", "entries": []}
+        
+        try:
+            status_proc = subprocess.Popen(
+                ["git", "status", "--porcelain=v2", "--branch", "-z"],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, cwd=self.project_root
             )
-            
-            if result.stdout:
-                changes = result.stdout.strip().split('\n')
-                status["changes"] = changes
-                status["uncommitted_count"] = len(changes)
-            
-            # Get last commit
-            result = subprocess.run(
+            log_proc = subprocess.Popen(
                 ["git", "log", "-1", "--oneline"],
-                capture_output=True, text=True, cwd=self.project_root
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, cwd=self.project_root
             )
-            status["last_commit"] = result.stdout.strip()
-            
+            status_out = status_proc.communicate()[0].decode('utf-8', errors='replace')
+            snapshot["last_commit"] = log_proc.communicate()[0].decode('utf-8', errors='replace').strip()
         except Exception as e:
-            status["error"] = str(e)
+            return {"error": str(e)}
+        
+        records = status_out.split('\0')
+        i = 0
+        while i < len(records):
+            record = records[i]
+            i += 1
+            if not record:
+                continue
+            kind = record[0]
+            if kind == '#':
+                header = record[2:].split(' ', 1)
+                value = header[1] if len(header) > 1 else ""
+                if header[0] == 'branch.head':
+                    snapshot["branch"] = "" if value == "(detached)" else value
+                elif header[0] == 'branch.oid':
+                    snapshot["oid"] = None if value == "(initial)" else value
+                elif header[0] == 'branch.upstream':
+                    snapshot["upstream"] = value
+                elif header[0] == 'branch.ab':
+                    ahead, behind = value.split()
+                    snapshot["ahead"], snapshot["behind"] = int(ahead), -int(behind)
+            elif kind == '1':
+                # 1 XY sub mH mI mW hH hI path
+                fields = record.split(' ', 8)
+                snapshot["entries"].append((fields[1].replace('.', ' '), fields[8], None))
+            elif kind == '2':
+                # 2 XY sub mH mI mW hH hI Xscore path, followed by the original path
+                fields = record.split(' ', 9)
+                orig_path = records[i] if i < len(records) else None
+                i += 1
+                snapshot["entries"].append((fields[1].replace('.', ' '), fields[9], orig_path))
+            elif kind == 'u':
+                # u XY sub m1 m2 m3 mW h1 h2 h3 path
+                fields = record.split(' ', 10)
+                snapshot["entries"].append((fields[1], fields[10], None))
+            elif kind == '?':
+                snapshot["entries"].append(('??', record[2:], None))
+        
+        return snapshot
+    
+    def _get_git_status(self, snapshot: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get detailed git status information
+        
+        Args:
+            snapshot: Result of _get_git_snapshot (read if not given)
+        """
+        snapshot = snapshot if snapshot is not None else self._get_git_snapshot()
+        status = {"branch": "unknown", "changes": [], "uncommitted_count": 0}
+        
+        if "error" in snapshot:
+            status["error"] = snapshot["error"]
+            return status
+        
+        status["branch"] = snapshot["branch"]
+        
+        # Same "XY path" lines as 'git status --porcelain'
+        changes = []
+        for xy, path, orig_path in snapshot["entries"]:
+            changes.append(f"{xy} {orig_path} -> {path}" if orig_path else f"{xy} {path}")
+        status["changes"] = changes
+        status["uncommitted_count"] = len(changes)
+        
+        if snapshot["upstream"]:
+            status["upstream"] = snapshot["upstream"]
+            status["ahead"] = snapshot["ahead"]
+            status["behind"] = snapshot["behind"]
+        status["last_commit"] = snapshot["last_commit"]
         
         return status
     
-    def _get_modified_files(self) -> List[Dict[str, str]]:
-        """Get list of recently modified files with context"""
+    def _get_modified_files(self, snapshot: Optional[Dict[str, Any]] = None) -> List[Dict[str, str]]:
+        """Get list of recently modified files with context
+        
+        Args:
+            snapshot: Result of _get_git_snapshot (read if not given)
+        """
+        snapshot = snapshot if snapshot is not None else self._get_git_snapshot()
         modified = []
         
-        try:
-            # Get git status for modified files
-            result = subprocess.run(
-                ["git", "status", "--porcelain"],
-                capture_output=True, text=True, cwd=self.project_root
-            )
+        for status, filepath, _ in snapshot.get("entries", []):
+            file_info = {
+                "path": filepath,
+                "status": "modified" if 'M' in status else "added" if 'A' in status else "other",
+                "git_status": status
+            }
             
-            if result.stdout:
-                for line in result.stdout.strip().split('\n'):
-                    if line:
-                        status = line[:2]
-                        filepath = line[3:]
-                        
-                        file_info = {
-                            "path": filepath,
-                            "status": "modified" if 'M' in status else "added" if 'A' in status else "other",
-                            "git_status": status
-                        }
-                        
-                        # Check if it's a Python file that might need testing
-                        if filepath.endswith('.py'):
-                            file_info["needs_testing"] = True
-                        
-                        # Check if it's a command file
-                        if '.claude/commands' in filepath:
-                            file_info["type"] = "command"
-                        
-                        modified.append(file_info)
+            # Check if it's a Python file that might need testing
+            if filepath.endswith('.py'):
+                file_info["needs_testing"] = True
             
-        except Exception:
-            pass
+            # Check if it's a command file
+            if '.claude/commands' in filepath:
+                file_info["type"] = "command"
+            
+            modified.append(file_info)
         
         return modified
     
-    def _check_database_state(self) -> Dict[str, Any]:
-        """Check database state and contents"""
+    def _check_database_state(self, deep: bool = False) -> Dict[str, Any]:
+        """Check database state and contents
+        
+        Row counts come from the trigger-maintained table_stats counters
+        (installed on first use), so no table is scanned.
+        
+        Args:
+            deep: Also run exact COUNT(*)s and PRAGMA integrity_check, and
+                repair counters that drifted
+        """
         db_info = {
             "exists": self.db_path.exists(),
             "tables": [],
@@ -364,11 +689,11 @@ class HandoverManager:
             return db_info
         
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._get_connection()
             cursor = conn.cursor()
             
             # Get tables
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name != 'table_stats'")
             tables = cursor.fetchall()
             db_info["tables"] = [t[0] for t in tables]
             
@@ -379,15 +704,27 @@ class HandoverManager:
                 db_info["warnings"].append(f"Missing expected tables: {', '.join(missing)}")
             
             # Get row counts for existing tables
-            for table in db_info["tables"]:
+            if deep:
+                check = deep_check(conn)
+                counts = check["counts"]
+                db_info["integrity"] = check["integrity"]
+                if check["integrity"] != ["ok"]:
+                    db_info["warnings"].append(f"Integrity check failed: {'; '.join(check['integrity'][:5])}")
+                if check["drift"]:
+                    db_info["counter_drift"] = check["drift"]
+                    db_info["warnings"].append(f"Row counters drifted (repaired): {', '.join(check['drift'])}")
+            else:
                 try:
-                    cursor.execute(f"SELECT COUNT(*) FROM {table}")
-                    count = cursor.fetchone()[0]
-                    db_info[f"{table}_count"] = count
-                except:
-                    pass
+                    ensure_row_counters(conn)
+                    counts = read_row_counts(conn)
+                except sqlite3.Error as e:
+                    # e.g. a read-only database without counters
+                    db_info["warnings"].append(f"Row counters unavailable: {e}")
+                    counts = {}
             
-            conn.close()
+            for table in db_info["tables"]:
+                if table in counts:
+                    db_info[f"{table}_count"] = counts[table]
             
         except Exception as e:
             db_info["warnings"].append(f"Database error: {str(e)}")
@@ -402,38 +739,39 @@ class HandoverManager:
             "in_progress": []
         }
         
-        if not self.todo_path.exists():
+        index = self.get_todo_index()
+        if index is None:
             return priorities
         
-        try:
-            with open(self.todo_path, 'r') as f:
-                lines = f.readlines()
-            
-            section = None
-            for line in lines:
-                # Detect sections
-                if "IMMEDIATE PRIORITY" in line:
-                    section = "immediate"
-                elif "SHORT TERM" in line:
-                    section = "short_term"
-                elif "MEDIUM TERM" in line or "LONG TERM" in line:
-                    section = None
-                # Extract items
-                elif section and line.strip().startswith("- [ ]"):
-                    item = line.strip()[6:]  # Remove "- [ ] "
-                    if len(priorities[section]) < 5:  # Limit to 5 items per section
-                        priorities[section].append(item)
-                elif section and line.strip().startswith("- [x]"):
-                    # Recently completed item
-                    item = line.strip()[6:] + " (recently completed)"
-                    if section == "immediate" and len(priorities["in_progress"]) < 3:
-                        priorities["in_progress"].append(item)
+        # Limit to 5 items per section
+        priorities["immediate"] = [item.text for item in
+                                   index.query(section="IMMEDIATE PRIORITY", state="open", limit=5)]
+        priorities["short_term"] = [item.text for item in
+                                    index.query(section="SHORT TERM", state="open", limit=5)]
         
-        except Exception:
-            pass
+        # Items marked in progress, then recently completed immediate items
+        in_progress = [item.text for item in index.query(state="in_progress", limit=3)]
+        in_progress += [f"{item.text} (recently completed)" for item in
+                        index.query(section="IMMEDIATE PRIORITY", state="done", limit=3 - len(in_progress))]
+        priorities["in_progress"] = in_progress
+        priorities["counts"] = index.counts()
         
         return priorities
     
+    def get_file_index(self):
+        """File metadata index shared with the other brain modules"""
+        from file_index import get_file_index
+        return get_file_index(self.project_root)
+    
+    def get_todo_index(self):
+        """Parsed TODO list (cached by mtime, re-parsed per changed section)
+        
+        Returns:
+            TodoIndex or None if there is no TODO file
+        """
+        from todo_index import load_todo_index
+        return load_todo_index(self.todo_path)
+    
     def _get_relevant_structure(self) -> Dict[str, List[str]]:
         """Get relevant project structure for context"""
         structure = {
@@ -444,27 +782,30 @@ class HandoverManager:
         }
         
         try:
+            # One incremental refresh of just these folders, then index queries
+            index = self.get_file_index()
+            folders = [".claude/commands", "claude-orchestrator/brain",
+                       "claude-orchestrator/workflows", "docs/status"]
+            index.refresh(folders, recursive=False)
+            
             # List command files
-            commands_dir = self.project_root / ".claude" / "commands"
-            if commands_dir.exists():
-                structure["commands"] = [f.name for f in commands_dir.glob("*.md")]
+            structure["commands"] = [f["path"].rsplit("/", 1)[-1]
+                                     for f in index.list_dir(".claude/commands", suffix=".md")]
             
             # List brain modules
-            brain_dir = self.project_root / "claude-orchestrator" / "brain"
-            if brain_dir.exists():
-                structure["brain_modules"] = [f.name for f in brain_dir.glob("*.py")]
+            structure["brain_modules"] = [f["path"].rsplit("/", 1)[-1]
+                                          for f in index.list_dir("claude-orchestrator/brain", suffix=".py")]
             
-            # List active workflows
-            workflows_dir = self.project_root / "claude-orchestrator" / "workflows"
-            if workflows_dir.exists():
-                structure["workflows"] = [d.name for d in workflows_dir.iterdir() if d.is_dir()]
+            # List active workflows (symlinks such as 'active' included, as before)
+            workflows = index.list_dir("claude-orchestrator/workflows")
+            structure["workflows"] = [
+                entry["path"].rsplit("/", 1)[-1] for entry in workflows
+                if entry["kind"] == "dir"
+                or (entry["kind"] == "link" and (self.project_root / entry["path"]).is_dir())]
             
             # Recent documentation
-            docs_status = self.project_root / "docs" / "status"
-            if docs_status.exists():
-                # Get recently modified docs
-                docs = sorted(docs_status.glob("*.md"), key=lambda x: x.stat().st_mtime, reverse=True)
-                structure["recent_docs"] = [d.name for d in docs[:5]]
+            structure["recent_docs"] = [d["path"].rsplit("/", 1)[-1] for d in
+                                        index.recent(5, under="docs/status", suffix=".md", recursive=False)]
         
         except Exception:
             pass
@@ -480,50 +821,40 @@ class HandoverManager:
             "incomplete_tasks": []
         }
         
-        handover_path = self.handover_dir / "handover-next.md"
-        if handover_path.exists():
+        index = self.get_handover_index()
+        if index is not None:
             summary["exists"] = True
-            try:
-                with open(handover_path, 'r') as f:
-                    content = f.read()
-                    lines = content.split('\n')
-                    
-                    # Extract session goals
-                    in_goals = False
-                    for line in lines:
-                        if "Session Goal" in line or "Next Session Goals" in line:
-                            in_goals = True
-                        elif in_goals and line.startswith("#"):
-                            in_goals = False
-                        elif in_goals and line.strip().startswith("-"):
-                            summary["session_goals"].append(line.strip())
-                    
-                    # Extract warnings
-                    if "Critical Warnings" in content or "Known Issues" in content:
-                        in_warnings = False
-                        for line in lines:
-                            if "Warning" in line or "Issues" in line:
-                                in_warnings = True
-                            elif in_warnings and line.startswith("#"):
-                                in_warnings = False
-                            elif in_warnings and "⚠️" in line:
-                                summary["warnings"].append(line.strip())
-            except Exception as e:
-                summary["error"] = str(e)
+            summary["session_goals"] = self._goals_from_index(index)
+            
+            # Extract warnings
+            for section in index.sections:
+                if "Warning" in section.title or "Issues" in section.title:
+                    summary["warnings"].extend(
+                        line.strip() for line in index.section_lines(section) if "⚠️" in line)
         
         return summary
     
+    @staticmethod
+    def _goals_from_index(index: MarkdownIndex) -> List[str]:
+        """Bullet items of the session goal sections, including their subsections"""
+        goals = []
+        for section in index.sections:
+            if "Session Goal" in section.title:
+                goals.extend(item for item in index.bullets(section, subtree=True)
+                             if item.startswith("-"))
+        return goals
+    
     def _extract_session_goals(self) -> List[str]:
         """Extract session goals from previous handover"""
-        prev = self._get_previous_handover_summary()
-        return prev.get("session_goals", [])
+        index = self.get_handover_index()
+        return self._goals_from_index(index) if index is not None else []
     
-    def get_info_summary(self) -> str:
+    def get_info_summary(self, use_cache: bool = True, deep: bool = False) -> str:
         """Get a formatted summary of session info for display
         
         This provides a human-readable summary that the LLM can show to the user.
         """
-        info = self.gather_session_info()
+        info = self.gather_session_info(use_cache=use_cache, deep=deep)
         
         summary = []
         summary.append(f"📊 Session Information Summary")
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Handover Archive - Compressed, content-addressed store for past handovers
+
+Every saved handover used to be copied twice into docs/status/archive/ as
+plain Markdown. The archive store instead keeps:
+- one gzip-compressed blob per distinct handover content, named by its
+  SHA-256 (objects/ab/abcdef....md.gz), so identical handovers are stored once
+- index.json with one entry per archived handover (timestamp, title, hash,
+  sizes, source), so listing, reading and diffing never scan the folder
+
+Entries are only added when the content differs from the most recent entry,
+so archiving the previous handover right after it was saved costs nothing.
+Plain handover-*.md files from before the store existed can be imported with
+import_legacy().
+
+Each entry also records a digest per '##' section and the section-level
+changes (added, modified, removed) against the entry before it, so "what
+changed since the last session" is answered from the index without
+decompressing or diffing whole documents.
+"""
+
+import os
+import re
+import gzip
+import json
+import difflib
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from markdown_index import index_text
+
+INDEX_VERSION = 1
+LEGACY_NAME_PATTERN = re.compile(r'^handover-(?:archived-)?(\d{8}-\d{4})\.md$')
+
+
+def section_digests(content: str) -> List[List[str]]:
+    """[title, digest] per '##' section (with its subsections), in order
+
+    Repeated titles get a ' (2)', ' (3)', ... suffix so every key is unique.
+    """
+    index = index_text(content)
+    digests, seen = [], {}
+    for section in index.sections:
+        if section.level != 2:
+            continue
+        seen[section.title] = seen.get(section.title, 0) + 1
+        title = section.title if seen[section.title] == 1 else f"{section.title} ({seen[section.title]})"
+        text = '\n'.join(index.lines[section.line:section.subtree_end_line]).rstrip()
+        digests.append([title, hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]])
+    return digests
+
+
+def compare_sections(old: List[List[str]], new: List[List[str]]) -> Dict[str, List[str]]:
+    """Section-level changes between two section_digests() results
+
+    Returns:
+        {"added", "modified", "removed", "unchanged"} section titles
+    """
+    old_map = dict(old)
+    new_titles = {title for title, _ in new}
+    changes = {"added": [], "modified": [], "removed": [], "unchanged": []}
+    for title, digest in new:
+        if title not in old_map:
+            changes["added"].append(title)
+        elif old_map[title] != digest:
+            changes["modified"].append(title)
+        else:
+            changes["unchanged"].append(title)
+    changes["removed"] = [title for title, _ in old if title not in new_titles]
+    return changes
+
+
+class HandoverArchive:
+    """Content-addressed handover archive in one folder"""
+
+    def __init__(self, archive_dir: Path):
+        self.archive_dir = Path(archive_dir)
+        self.objects_dir = self.archive_dir / "objects"
+        self.index_path = self.archive_dir / "index.json"
+        self._entries: Optional[List[Dict[str, Any]]] = None
+        self._index_signature = None
+
+    def _stat_index(self) -> Optional[tuple]:
+        try:
+            stat = os.stat(self.index_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _load_entries(self) -> List[Dict[str, Any]]:
+        """Cached entries, re-read when index.json changed since it was read
+
+        Long-lived processes (the daemon) keep one archive while other
+        processes (--no-daemon saves, archive import) add to the same index.
+        """
+        signature = self._stat_index()
+        if self._entries is None or signature != self._index_signature:
+            self._entries = []
+            self._index_signature = signature
+            try:
+                with open(self.index_path, 'r') as f:
+                    index = json.load(f)
+                if index.get("version") == INDEX_VERSION:
+                    self._entries = index.get("entries", [])
+            except (OSError, ValueError):
+                pass
+        return self._entries
+
+    @property
+    def entries(self) -> List[Dict[str, Any]]:
+        """Index entries, oldest first"""
+        return self._load_entries()
+
+    def _save_index(self):
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump({"version": INDEX_VERSION, "entries": self._entries}, f, indent=2)
+        os.replace(tmp_path, self.index_path)
+        self._index_signature = self._stat_index()
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / f"{digest}.md.gz"
+
+    def add(self, content: str, timestamp: Optional[str] = None,
+            source: str = "saved") -> Dict[str, Any]:
+        """Archive a handover
+
+        Args:
+            content: Handover Markdown
+            timestamp: YYYYmmdd-HHMM (defaults to now)
+            source: Why it was archived ("saved", "previous", "legacy")
+
+        Returns:
+            The index entry (the existing latest one if content is unchanged)
+        """
+        data = content.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+
+        # Start from the index as it is on disk, not as this process last saw it
+        entries = self._load_entries()
+        if entries and entries[-1]["hash"] == digest:
+            return entries[-1]
+
+        blob_path = self._blob_path(digest)
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = blob_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(gzip.compress(data, mtime=0))
+            os.replace(tmp_path, blob_path)
+
+        timestamp = timestamp or datetime.now().strftime("%Y%m%d-%H%M")
+        sections = section_digests(content)
+        entry = {
+            "id": self._unique_id(f"handover-{timestamp}"),
+            "timestamp": timestamp,
+            "title": self._title(content),
+            "hash": digest,
+            "size": len(data),
+            "stored_size": blob_path.stat().st_size,
+            "source": source,
+            "sections": sections
+        }
+        if entries:
+            entry["changes"] = self._changes_only(compare_sections(self.sections(entries[-1]), sections))
+        entries.append(entry)
+        self._save_index()
+        return entry
+    
+    @staticmethod
+    def _changes_only(changes: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """Stored form of a comparison (unchanged titles follow from "sections")"""
+        return {key: changes[key] for key in ("added", "modified", "removed")}
+    
+    def sections(self, entry: Dict[str, Any]) -> List[List[str]]:
+        """Section digests of an entry (computed once for entries that predate them)"""
+        if "sections" not in entry:
+            with open(self._blob_path(entry["hash"]), 'rb') as f:
+                entry["sections"] = section_digests(gzip.decompress(f.read()).decode('utf-8'))
+        return entry["sections"]
+    
+    def section_changes(self, ref: str = "-1") -> Optional[Dict[str, Any]]:
+        """Section-level changes of an entry against the entry before it
+        
+        Returns:
+            {"id", "base", "added", "modified", "removed", "unchanged"}
+            ("base" is None for the first entry), or None if ref is unknown
+        """
+        entry = self.find(ref)
+        if entry is None:
+            return None
+        entries = self.entries
+        position = next(i for i, candidate in enumerate(entries) if candidate["id"] == entry["id"])
+        base = entries[position - 1] if position else None
+        changes = compare_sections(self.sections(base) if base else [], self.sections(entry))
+        return {"id": entry["id"], "base": base["id"] if base else None, **changes}
+    
+    def changes_since_previous(self, content: str) -> Optional[Dict[str, Any]]:
+        """Section-level changes of a handover against the archived one before it
+        
+        The previous handover is the most recent entry with different
+        content (the current handover is usually archived as well).
+        
+        Returns:
+            {"base", "added", "modified", "removed", "unchanged"}, or None
+            if the archive holds no earlier handover
+        """
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        for entry in reversed(self.entries):
+            if entry["hash"] != digest:
+                return {"base": entry["id"], **compare_sections(self.sections(entry), section_digests(content))}
+        return None
+
+    def _unique_id(self, base: str) -> str:
+        existing = {entry["id"] for entry in self._entries or []}
+        candidate, suffix = base, 2
+        while candidate in existing:
+            candidate = f"{base}-{suffix}"
+            suffix += 1
+        return candidate
+
+    @staticmethod
+    def _title(content: str) -> str:
+        index = index_text(content)
+        title = index.frontmatter.get("title")
+        if isinstance(title, str) and title:
+            return title
+        top = index.headings(level=1)
+        return top[0].title if top else ""
+
+    def find(self, ref: str) -> Optional[Dict[str, Any]]:
+        """Resolve an entry by id, hash prefix or position ("-1" = latest)
+
+        Returns:
+            The index entry or None
+        """
+        # Negative numbers are positions; other numbers only when they are in
+        # range (and not zero-padded), so all-digit hash prefixes still resolve
+        if re.fullmatch(r'-\d+', ref):
+            try:
+                return self.entries[int(ref)]
+            except IndexError:
+                return None
+        if re.fullmatch(r'0|[1-9]\d*', ref) and int(ref) < len(self.entries):
+            return self.entries[int(ref)]
+        for entry in reversed(self.entries):
+            if entry["id"] == ref or entry["id"] == f"handover-{ref}":
+                return entry
+        matches = [entry for entry in self.entries if entry["hash"].startswith(ref)]
+        return matches[-1] if len(ref) >= 4 and matches else None
+
+    def read(self, ref: str) -> Optional[str]:
+        """Return the content of an archived handover"""
+        entry = self.find(ref)
+        if entry is None:
+            return None
+        with open(self._blob_path(entry["hash"]), 'rb') as f:
+            return gzip.decompress(f.read()).decode('utf-8')
+
+    def diff(self, old_ref: str, new_ref: str, context: int = 3) -> Optional[str]:
+        """Unified diff between two archived handovers"""
+        old_entry, new_entry = self.find(old_ref), self.find(new_ref)
+        if old_entry is None or new_entry is None:
+            return None
+        old_lines = self.read(old_entry["id"]).splitlines(keepends=True)
+        new_lines = self.read(new_entry["id"]).splitlines(keepends=True)
+        return ''.join(difflib.unified_diff(old_lines, new_lines, old_entry["id"],
+                                            new_entry["id"], n=context))
+
+    def import_legacy(self, remove: bool = False) -> Dict[str, int]:
+        """Import plain handover-*.md copies from the archive folder
+
+        Args:
+            remove: Delete each plain copy once its content is in the store
+
+        Returns:
+            {"imported", "duplicates", "removed"} counts
+        """
+        stats = {"imported": 0, "duplicates": 0, "removed": 0}
+        known = {entry["hash"] for entry in self._load_entries()}
+        legacy = sorted((match.group(1), path) for path in self.archive_dir.glob("handover-*.md")
+                        for match in [LEGACY_NAME_PATTERN.match(path.name)] if match)
+
+        for timestamp, path in legacy:
+            content = path.read_text(encoding='utf-8', errors='replace')
+            digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+            if digest in known:
+                stats["duplicates"] += 1
+            else:
+                self.add(content, timestamp, source="legacy")
+                known.add(digest)
+                stats["imported"] += 1
+            if remove:
+                path.unlink()
+                stats["removed"] += 1
+
+        # Imports are appended in file order; keep the index chronological and
+        # recompute each entry's changes against its new predecessor
+        entries = self._load_entries()
+        entries.sort(key=lambda entry: entry["timestamp"])
+        if entries:
+            entries[0].pop("changes", None)
+        for previous, entry in zip(entries, entries[1:]):
+            entry["changes"] = self._changes_only(compare_sections(self.sections(previous),
+                                                                   self.sections(entry)))
+        self._save_index()
+        return stats
+
+    def get_statistics(self) -> Dict[str, int]:
+        blobs = {entry["hash"]: entry["stored_size"] for entry in self.entries}
+        return {
+            "entries": len(self.entries),
+            "unique_blobs": len(blobs),
+            "original_bytes": sum(entry["size"] for entry in self.entries),
+            "stored_bytes": sum(blobs.values())
+        }
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Handover Context - Token-budgeted selection of handover sections
+
+session start used to print the handover up to a late goals section, so the
+whole document entered the new session's context. plan_context() splits the
+handover into its '##' sections, estimates each section's tokens and picks
+sections in priority order (mandatory reads, goals, warnings, LLM context,
+tasks, ...) while they fit the budget. Sections that are not loaded are
+returned as on-demand references (title, line range, token estimate), so a
+session starts with a small, predictable context footprint and reads the
+rest only when needed.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set
+
+from markdown_index import MarkdownIndex
+
+# (alias, title pattern) in loading priority; unmatched sections come after
+# these, in document order
+SECTION_PRIORITIES = [
+    ("mandatory", re.compile(r'^\W*MANDATORY READS')),
+    ("goals", re.compile(r'Session Goal')),
+    ("warnings", re.compile(r'Warning')),
+    ("context", re.compile(r'CRITICAL (?:CONTEXT|FOR)')),
+    ("tasks", re.compile(r'Task Breakdown')),
+    ("state", re.compile(r'Development State')),
+    ("decisions", re.compile(r'Context & Decisions')),
+    ("references", re.compile(r'Additional References')),
+    ("quick", re.compile(r'Quick Reference')),
+    ("checklist", re.compile(r'Session End')),
+]
+SECTION_ALIASES = [alias for alias, _ in SECTION_PRIORITIES]
+
+
+def split_sections(index: MarkdownIndex) -> List[Dict[str, Any]]:
+    """The handover as loadable units: the preamble and each '##' section
+
+    Returns:
+        [{"title", "alias", "priority", "start_line", "end_line", "text"}]
+        in document order; lines are 1-based and inclusive
+    """
+    top = [section for section in index.sections if section.level == 2]
+    units = []
+    preamble_end = top[0].line if top else len(index.lines)
+    if preamble_end:
+        units.append({"title": "(title and summary)", "alias": "preamble", "priority": -1,
+                      "start_line": 1, "end_line": preamble_end,
+                      "text": '\n'.join(index.lines[:preamble_end])})
+
+    seen: Dict[str, int] = {}
+    for position, section in enumerate(top):
+        # Repeated titles are numbered like handover_archive.section_digests
+        seen[section.title] = seen.get(section.title, 0) + 1
+        title = section.title if seen[section.title] == 1 else f"{section.title} ({seen[section.title]})"
+        alias, priority = None, len(SECTION_PRIORITIES) + position
+        for rank, (name, pattern) in enumerate(SECTION_PRIORITIES):
+            if pattern.search(section.title):
+                alias, priority = name, rank
+                break
+        units.append({"title": title, "alias": alias, "priority": priority,
+                      "start_line": section.line + 1, "end_line": section.subtree_end_line,
+                      "text": '\n'.join(index.lines[section.line:section.subtree_end_line])})
+    return units
+
+
+def _matches(unit: Dict[str, Any], wanted: str) -> bool:
+    wanted = wanted.strip().lower()
+    return unit["alias"] == wanted or bool(wanted and wanted in unit["title"].lower())
+
+
+def plan_context(index: MarkdownIndex, estimate: Callable[[str], int],
+                 budget: Optional[int] = None,
+                 sections: Optional[Sequence[str]] = None,
+                 changed: Optional[Set[str]] = None) -> Dict[str, Any]:
+    """Choose which handover sections to load
+
+    Args:
+        index: Section index of the handover
+        estimate: Token estimator (context_guardian.estimate_tokens)
+        budget: Token budget (None = unlimited)
+        sections: Only load these sections, in this order: aliases from
+            SECTION_ALIASES or text contained in a section title. The
+            preamble is always loaded.
+        changed: Only load sections with these titles (e.g. the sections
+            added or modified since the previous handover)
+
+    Returns:
+        {"load": [units in loading order], "deferred": [units in document
+        order], "used": tokens loaded, "budget": budget}; units carry their
+        "tokens" estimate
+    """
+    units = split_sections(index)
+    for unit in units:
+        unit["tokens"] = estimate(unit["text"])
+
+    if sections:
+        order = {}
+        for unit in units:
+            for rank, wanted in enumerate(sections):
+                if _matches(unit, wanted):
+                    order[id(unit)] = rank
+                    break
+        candidates = sorted((unit for unit in units if id(unit) in order),
+                            key=lambda unit: order[id(unit)])
+    else:
+        candidates = sorted(units, key=lambda unit: unit["priority"])
+    if changed is not None:
+        candidates = [unit for unit in candidates if unit["title"] in changed]
+
+    load, used = [], 0
+    preamble = [unit for unit in units if unit["alias"] == "preamble"]
+    for unit in preamble:
+        load.append(unit)
+        used += unit["tokens"]
+
+    # Greedy by priority: a section that does not fit is deferred, smaller
+    # lower-priority ones may still fit
+    for unit in candidates:
+        if unit in preamble:
+            continue
+        if budget is not None and used + unit["tokens"] > budget:
+            continue
+        load.append(unit)
+        used += unit["tokens"]
+
+    loaded = {id(unit) for unit in load}
+    deferred = [unit for unit in units if id(unit) not in loaded]
+    return {"load": load, "deferred": deferred, "used": used, "budget": budget}
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Handover Draft - Pre-render the factual parts of the handover template
+
+The LLM used to receive the raw gather JSON and copy git status, modified
+files, database state and TODO counts into Session_Handover_Template.md by
+hand. render_draft() fills in everything that follows from session data
+(frontmatter, mandatory reads, previous handover, changed files, recorded
+decisions and issues, git state, quick reference, working directory) and
+leaves the narrative sections (summary, goals, tasks, lessons) with their
+template placeholders. A comment under the title lists the sections that
+are still open, so the LLM only writes those.
+
+Rendering is deterministic: the same facts always give the same draft.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from markdown_index import index_text
+
+# Template text that does not match the validator ("# Session Handover:")
+TITLE_LINE = "# Session Handover: [Brief Session Focus]"
+
+# Bracketed template placeholders (checkboxes excluded)
+PLACEHOLDER = re.compile(r'\[(?![ xX~-]\])[^\]\n]+\]')
+
+QUICK_REFERENCE = [
+    ("python orchestrate.py session start", "Start a session from this handover"),
+    ("python orchestrate.py todo --state open --top-level", "Open TODO items"),
+    ("python orchestrate.py search \"<terms>\"", "Search past handovers, decisions and issues"),
+    ("python orchestrate.py archive diff -2 -1", "What changed between the last two handovers"),
+    ("python orchestrate.py files changed --since 24", "Files changed in the last 24 hours"),
+    ("python orchestrate.py handover --summary draft", "Pre-rendered draft of the next handover"),
+]
+
+MAX_FILES = 15
+
+
+def _core_rules(facts: Dict[str, Any]) -> Optional[List[str]]:
+    descriptions = {"CLAUDE.md": "Core interaction rules and project standards"}
+    lines = [f"- [ ] `{path}` - {descriptions.get(path.lstrip('/'), 'must be read in full!')}"
+             for path in facts.get("read_first", [])]
+    return lines or None
+
+
+def _task_context(facts: Dict[str, Any]) -> List[str]:
+    lines = ["- [ ] This entire handover document"]
+    previous = facts.get("previous_handover")
+    if previous:
+        title = f" \"{previous['title']}\"" if previous.get("title") else ""
+        lines.append(f"- [ ] Previous session handover{title}: "
+                     f"`python orchestrate.py archive show {previous['hash'][:12]}`")
+    else:
+        lines.append("- [ ] Previous session handover: none (first handover)")
+    counts = facts.get("todo", {}).get("counts")
+    if counts:
+        lines.append(f"- [ ] `/docs/status/todo.md` - {counts['open']} open, "
+                     f"{counts['in_progress']} in progress")
+    return lines
+
+
+def _relevant_code(facts: Dict[str, Any]) -> Optional[List[str]]:
+    files = facts.get("modified_files", [])
+    if not files:
+        return None
+    lines = []
+    for file_info in files[:MAX_FILES]:
+        status = file_info["git_status"].strip()
+        notes = ["untracked" if status == "??" else
+                 file_info["status"] if file_info["status"] != "other" else status]
+        if file_info.get("needs_testing"):
+            notes.append("needs testing")
+        lines.append(f"- `{file_info['path']}` - uncommitted ({', '.join(notes)})")
+    if len(files) > MAX_FILES:
+        lines.append(f"- ... and {len(files) - MAX_FILES} more uncommitted file(s)")
+    return lines
+
+
+def _decisions(facts: Dict[str, Any]) -> Optional[List[str]]:
+    decisions = facts.get("decisions", [])
+    if not decisions:
+        return None
+    lines = []
+    for decision in decisions:
+        reason = f": {decision['reason']}" if decision.get("reason") else ""
+        approved = ", approved" if decision.get("approved") else ""
+        lines.append(f"- **{decision['what']}**{reason} ({decision['timestamp']}{approved})")
+    return lines
+
+
+def _quick_reference(facts: Dict[str, Any]) -> List[str]:
+    lines = ["```bash"]
+    width = max(len(command) for command, _ in QUICK_REFERENCE)
+    lines.extend(f"{command:<{width}}  # {description}" for command, description in QUICK_REFERENCE)
+    lines.append("```")
+    commands = facts.get("commands", [])
+    if commands:
+        lines.append(f"Slash commands: {', '.join('/' + name[:-3] for name in commands)}")
+    return lines
+
+
+def _warnings(facts: Dict[str, Any]) -> List[str]:
+    return ([f"- Carried over: {warning.lstrip('-* ').strip()}" for warning in facts.get("carried_warnings", [])]
+            + [f"- ⚠️ Session database: {warning}" for warning in facts.get("database", {}).get("warnings", [])])
+
+
+def _blockers(facts: Dict[str, Any]) -> List[str]:
+    lines = []
+    for issue in facts.get("open_issues", []):
+        attempted = f" → tried: {issue['attempted']}" if issue.get("attempted") else ""
+        lines.append(f"- **Open issue** ({issue['timestamp']}): {issue['description']}{attempted}")
+    return lines
+
+
+def _git_state(facts: Dict[str, Any]) -> List[str]:
+    git = facts.get("git", {})
+    if "error" in git:
+        return [f"- Git status unavailable: {git['error']}"]
+    lines = [f"- Branch `{git.get('branch', 'unknown')}`: {git.get('uncommitted_count', 0)} uncommitted change(s)"]
+    if git.get("upstream"):
+        lines.append(f"- {git['ahead']} commit(s) ahead, {git['behind']} behind `{git['upstream']}`")
+    if git.get("last_commit"):
+        lines.append(f"- Last commit: {git['last_commit']}")
+    in_progress = facts.get("todo", {}).get("in_progress", [])
+    lines.extend(f"- [ ] TODO in progress: {item}" for item in in_progress)
+    return lines
+
+
+# Heading title (substring) -> (renderer, mode). "replace" swaps the section
+# body when the renderer returns lines; "prepend" puts them above the
+# template body, which stays open for the narrative part.
+SECTION_RENDERERS: Dict[str, tuple] = {
+    "1. Core Project Rules": (_core_rules, "replace"),
+    "2. Current Task Context": (_task_context, "replace"),
+    "Relevant Code": (_relevant_code, "replace"),
+    "Recent Technical Decisions": (_decisions, "replace"),
+    "Quick Reference": (_quick_reference, "replace"),
+    "Architecture Warnings": (_warnings, "prepend"),
+    "Active Blockers": (_blockers, "prepend"),
+}
+
+# Template line (prefix) -> renderer returning the lines that replace it
+LINE_RENDERERS: Dict[str, Callable[[str, Dict[str, Any]], List[str]]] = {
+    "# Session Handover - ": lambda line, facts: [TITLE_LINE],
+    "**Overall Progress**:": lambda line, facts: [line] + (
+        [f"**TODO List**: {facts['todo']['counts']['open']} open, "
+         f"{facts['todo']['counts']['in_progress']} in progress, "
+         f"{facts['todo']['counts']['done']} done"] if facts.get("todo", {}).get("counts") else []),
+    "[any workflow related tasks": lambda line, facts: _git_state(facts) + [line],
+    "**Working Directory**:": lambda line, facts: [f"**Working Directory**: `{facts['project_root']}`"],
+}
+
+
+def _render_frontmatter(lines: List[str], facts: Dict[str, Any]) -> List[str]:
+    project = facts.get("project", "")
+    rendered = []
+    for line in lines:
+        if line.startswith("project:"):
+            line = f"project: {project}"
+        elif line.startswith("title:"):
+            line = f"title: \"Session Handover {facts['timestamp']}\""
+        elif line.startswith("tags:"):
+            line = f"tags: [{project}, handover, session, workflow]"
+        rendered.append(line)
+    return rendered
+
+
+def _keep_comments(body: List[str]) -> List[str]:
+    """Leading '<!-- ... -->' marker lines of a section body"""
+    kept = []
+    for line in body:
+        if not line.strip().startswith("<!--"):
+            break
+        kept.append(line)
+    return kept
+
+
+def render_draft(template: str, facts: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill the factual sections of the handover template
+
+    Args:
+        template: Session_Handover_Template.md content
+        facts: Session facts ("timestamp", "project", "project_root",
+            "read_first", "previous_handover", "git", "modified_files",
+            "todo", "database", "carried_warnings", "decisions",
+            "open_issues", "commands"); missing keys leave their section open
+
+    Returns:
+        {"content": draft Markdown, "rendered": section titles filled in,
+        "open": section titles still containing placeholders}
+    """
+    index = index_text(template)
+    lines = list(index.lines)
+    replacements = []  # (start, end, new lines), applied bottom-up
+    rendered, done = [], set()
+
+    for section in index.sections:
+        for key, (renderer, mode) in SECTION_RENDERERS.items():
+            if key not in section.title:
+                continue
+            new_lines = renderer(facts)
+            if not new_lines:
+                break
+            body = index.section_lines(section)
+            start, end = section.line + 1, section.end_line
+            if mode == "replace":
+                kept = _keep_comments(body)
+                # Keep one blank line before the next heading, as in the template
+                trailing = [""] if body and not body[-1].strip() else []
+                replacements.append((start, end, kept + new_lines + trailing))
+                done.add(section.line)
+            else:
+                replacements.append((start, start, new_lines))
+            rendered.append(section.title)
+            break
+
+    for start, end, new_lines in sorted(replacements, key=lambda item: item[0], reverse=True):
+        lines[start:end] = new_lines
+
+    # Single template lines (title, progress, checklist, working directory)
+    output = []
+    for line in lines:
+        for prefix, renderer in LINE_RENDERERS.items():
+            if line.startswith(prefix):
+                output.extend(renderer(line, facts))
+                break
+        else:
+            output.append(line)
+
+    # Narrative sections: placeholders in the template body and not replaced
+    open_sections = ["title" if section.level == 1 else section.title for section in index.sections
+                     if section.line not in done
+                     and PLACEHOLDER.search('\n'.join([section.heading] + index.section_lines(section)))]
+
+    if index.has_frontmatter:
+        closing = output.index("---", 1)
+        output[1:closing] = _render_frontmatter(output[1:closing], facts)
+        insert_at = output.index("---", 1) + 1
+    else:
+        insert_at = 0
+    note = ("<!-- DRAFT pre-rendered from session data. Still to write: "
+            + "; ".join(["frontmatter summary"] + open_sections) + " -->")
+    output[insert_at:insert_at] = ["", note]
+
+    return {"content": '\n'.join(output), "rendered": rendered, "open": open_sections}
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Link Graph - Persisted reference graph between the project's Markdown files
+
+The unreferenced documents check used to be an agent reading the
+documentation index and searching for each file name. LinkGraph parses
+every Markdown document once and stores what it refers to:
+- links: inline [text](target), images and [id]: target definitions
+  (outside fenced code blocks)
+- mentions: paths ending in .md anywhere in the text, including code
+  blocks and commands (`cat docs/read-first.md`)
+
+References are stored unresolved in an SQLite database under
+.orchestrator/state/ and resolved against the current set of documents
+when a report is built, so a document that appears or disappears changes
+the graph without reparsing the documents that refer to it. update()
+reparses only documents whose mtime or size changed.
+
+report() turns the graph into findings: broken links, orphaned documents
+(no incoming reference), documents unreachable from the entry points
+(docs/documentation-index.md and docs/read-first.md) and dead ends (no
+outgoing reference to another document).
+"""
+
+import os
+import re
+import sqlite3
+import hashlib
+import posixpath
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+from urllib.parse import unquote
+
+GRAPH_VERSION = 1
+
+ENTRY_POINTS = ("docs/documentation-index.md", "docs/read-first.md")
+
+LINK_PATTERN = re.compile(r'!?\[[^\]]*\]\(\s*<?([^)\s>]+)>?(?:\s+"[^"]*")?\s*\)')
+DEFINITION_PATTERN = re.compile(r'^\s{0,3}\[[^\]]+\]:\s*<?(\S+?)>?(?:\s+"[^"]*")?\s*$')
+MENTION_PATTERN = re.compile(r'[\w./-]*[\w-]+\.md\b')
+URL_PATTERN = re.compile(r'\b[a-zA-Z][\w+.-]*://\S+')
+SCHEME_PATTERN = re.compile(r'^[a-zA-Z][\w+.-]*:')
+FENCE_PATTERN = re.compile(r'^\s{0,3}(```|~~~)')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS refs (
+    source TEXT NOT NULL,
+    line INTEGER NOT NULL,        -- 1-based
+    kind TEXT NOT NULL,           -- link or mention
+    target TEXT NOT NULL          -- as written
+);
+CREATE INDEX IF NOT EXISTS idx_refs_source ON refs(source);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def extract_references(text: str) -> List[tuple]:
+    """(line, kind, target) for every link and .md path mention in a document"""
+    refs = []
+    in_fence = False
+    for number, line in enumerate(text.splitlines(), 1):
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+            continue
+        links = []
+        if not in_fence:
+            links = LINK_PATTERN.findall(line)
+            definition = DEFINITION_PATTERN.match(line)
+            if definition:
+                links.append(definition.group(1))
+        for target in links:
+            if not target.startswith('#') and not SCHEME_PATTERN.match(target):
+                refs.append((number, "link", target))
+        for target in MENTION_PATTERN.findall(URL_PATTERN.sub(' ', line)):
+            refs.append((number, "mention", target))
+    return refs
+
+
+class LinkGraph:
+    """Reference graph between the Markdown documents of one project root"""
+
+    def __init__(self, root: Path, db_path: Optional[Path] = None):
+        self.root = Path(root)
+        if db_path is None:
+            from utils import get_state_dir
+            digest = hashlib.sha1(str(self.root.resolve()).encode()).hexdigest()[:12]
+            db_path = get_state_dir() / f"link-graph-{digest}.db"
+        self.db_path = Path(db_path)
+        self._conn = None
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != str(GRAPH_VERSION):
+                with self._conn:
+                    self._conn.execute("DELETE FROM documents")
+                    self._conn.execute("DELETE FROM refs")
+                    self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                                       (str(GRAPH_VERSION),))
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def update(self, paths: Iterable[str]) -> Dict[str, int]:
+        """Bring the graph up to date for a set of documents
+
+        Args:
+            paths: Every Markdown document of the project, relative to the
+                root; stored documents not in this set are dropped
+
+        Returns:
+            {"parsed", "reused", "removed"} document counts
+        """
+        conn = self._get_connection()
+        known = {path: (mtime_ns, size) for path, mtime_ns, size in
+                 conn.execute("SELECT path, mtime_ns, size FROM documents")}
+        stats = {"parsed": 0, "reused": 0, "removed": 0}
+
+        with conn:
+            for path in paths:
+                try:
+                    stat = os.stat(self.root / path)
+                except OSError:
+                    continue
+                signature = known.pop(path, None)
+                if signature == (stat.st_mtime_ns, stat.st_size):
+                    stats["reused"] += 1
+                    continue
+                try:
+                    with open(self.root / path, 'r', encoding='utf-8', errors='replace') as f:
+                        refs = extract_references(f.read())
+                except OSError:
+                    continue
+                conn.execute("DELETE FROM refs WHERE source = ?", (path,))
+                conn.executemany("INSERT INTO refs (source, line, kind, target) VALUES (?, ?, ?, ?)",
+                                 [(path, line, kind, target) for line, kind, target in refs])
+                conn.execute("INSERT OR REPLACE INTO documents (path, mtime_ns, size) VALUES (?, ?, ?)",
+                             (path, stat.st_mtime_ns, stat.st_size))
+                stats["parsed"] += 1
+
+            if known:
+                conn.executemany("DELETE FROM refs WHERE source = ?", [(path,) for path in known])
+                conn.executemany("DELETE FROM documents WHERE path = ?", [(path,) for path in known])
+                stats["removed"] = len(known)
+        return stats
+
+    def documents(self) -> List[str]:
+        return [path for (path,) in self._get_connection().execute("SELECT path FROM documents ORDER BY path")]
+
+    def _resolve(self, source: str, kind: str, target: str, documents: Set[str],
+                 by_name: Dict[str, List[str]]) -> Optional[str]:
+        """Project-relative path a reference points to, or None if it points nowhere"""
+        target = unquote(target.split('#', 1)[0].split('?', 1)[0]).strip()
+        if not target:
+            return source
+        if target.startswith('/'):
+            candidates = [target.lstrip('/')]
+        else:
+            candidates = [posixpath.join(posixpath.dirname(source), target)]
+            if kind == "mention":
+                # Mentions are usually written from the project root or docs/
+                candidates += [target, posixpath.join("docs", target)]
+
+        for candidate in candidates:
+            candidate = posixpath.normpath(candidate)
+            if candidate.startswith('..'):
+                continue
+            if candidate in documents or (kind == "link" and (self.root / candidate).exists()):
+                return candidate
+        if kind == "mention" and '/' not in target:
+            matches = by_name.get(target, [])
+            if len(matches) == 1:
+                return matches[0]
+        return None
+
+    def edges(self, sources: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """The resolved graph
+
+        Args:
+            sources: Only count references made by these documents (all if None)
+
+        Returns:
+            {"outgoing": {source: {targets}}, "incoming": {target: {sources}},
+            "broken": [(source, line, target)]} over documents only; broken
+            lists links (not mentions) that resolve to nothing
+        """
+        documents = set(self.documents())
+        by_name: Dict[str, List[str]] = {}
+        for path in documents:
+            by_name.setdefault(path.rsplit('/', 1)[-1], []).append(path)
+
+        outgoing: Dict[str, Set[str]] = {path: set() for path in documents}
+        incoming: Dict[str, Set[str]] = {path: set() for path in documents}
+        broken = []
+        sources = None if sources is None else set(sources)
+        rows = self._get_connection().execute("SELECT source, line, kind, target FROM refs ORDER BY source, line")
+        for source, line, kind, target in rows:
+            if sources is not None and source not in sources:
+                continue
+            resolved = self._resolve(source, kind, target, documents, by_name)
+            if resolved is None:
+                if kind == "link":
+                    broken.append((source, line, target))
+            elif resolved != source and resolved in documents:
+                outgoing[source].add(resolved)
+                incoming[resolved].add(source)
+        return {"outgoing": outgoing, "incoming": incoming, "broken": broken}
+
+    def references(self, path: str) -> Dict[str, List[str]]:
+        """Documents a document refers to and documents referring to it"""
+        graph = self.edges()
+        return {"outgoing": sorted(graph["outgoing"].get(path, ())),
+                "incoming": sorted(graph["incoming"].get(path, ()))}
+
+    def report(self, scope: Optional[Iterable[str]] = None,
+               entry_points: Iterable[str] = ENTRY_POINTS,
+               sources: Optional[Iterable[str]] = None) -> List[Dict[str, str]]:
+        """Findings for the documents in scope
+
+        Args:
+            scope: Documents to report on (all documents if None); references
+                from documents outside the scope still count
+            entry_points: Documents every other document should be reachable from
+            sources: Only count references made by these documents, e.g. to
+                ignore what archived documents mention (all if None)
+
+        Returns:
+            [{"category", "path", "message"}] with the categories broken_link,
+            missing_entry_point, orphaned, unreachable and dead_end
+        """
+        graph = self.edges(sources)
+        outgoing, incoming = graph["outgoing"], graph["incoming"]
+        scope = sorted(outgoing) if scope is None else sorted(set(scope) & set(outgoing))
+        in_scope = set(scope)
+        entry_points = list(entry_points)
+
+        items = [{"category": "broken_link", "path": source, "message": f"Line {line}: {target}"}
+                 for source, line, target in graph["broken"] if source in in_scope]
+
+        reachable: Set[str] = set()
+        queue = deque()
+        for entry in entry_points:
+            if entry in outgoing:
+                reachable.add(entry)
+                queue.append(entry)
+            else:
+                items.append({"category": "missing_entry_point", "path": entry,
+                              "message": "Entry point document not found"})
+        while queue:
+            for target in outgoing[queue.popleft()]:
+                if target not in reachable:
+                    reachable.add(target)
+                    queue.append(target)
+
+        for path in scope:
+            if path in entry_points:
+                continue
+            if not incoming[path]:
+                items.append({"category": "orphaned", "path": path,
+                              "message": "No other document links to or mentions it"})
+            elif path not in reachable:
+                items.append({"category": "unreachable", "path": path,
+                              "message": f"Not reachable from {' or '.join(entry_points)} "
+                                         f"(referenced by {', '.join(sorted(incoming[path]))})"})
+            if not outgoing[path]:
+                items.append({"category": "dead_end", "path": path,
+                              "message": "Does not refer to any other document"})
+        return items
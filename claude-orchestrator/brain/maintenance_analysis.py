@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Maintenance Analysis - Deterministic pre-analysis of the session-end tasks
+
+The maintenance tasks in resource-library/documents/documentation-tasks/
+are reviewed with the user one at a time through sub-agents. Much of each
+task is mechanical (which documents lack a header, which index entries
+point nowhere, which headings skip a level), so those parts run here, for
+every task at once, in a process pool before the review starts. The agent
+and the user then start from precomputed findings.
+
+Each task with a native analyzer declares its input files; findings are
+cached in .orchestrator/state/maintenance/<task>.json keyed by the content
+hashes of those inputs (taken from the shared file index), so unchanged
+documentation is never analyzed twice. Tasks without an analyzer are
+reported as agent-only.
+
+Findings have the shape {"task", "key", "generated", "counts": {category: n},
+"items": [{"category", "path", "message"}]}.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from markdown_index import index_text
+
+# Folders whose documents are excluded from every check (generated reports included)
+EXCLUDED_PARTS = frozenset({"archive", "old", "session-reports"})
+CODE_SUFFIXES = (".py", ".lua", ".js", ".ts", ".sh")
+MARKER_PATTERN = re.compile(r'\b(TODO|FIXME|XXX)\b')
+MD_PATH_PATTERN = re.compile(r'[\w./-]*[\w-]+\.md\b')
+
+# version: bump to invalidate cached findings when an analyzer changes
+# inputs(file_index) -> [file index entries]
+# run(project_root, [relative paths]) -> [finding items]
+Analyzer = namedtuple("Analyzer", ["version", "inputs", "run"])
+
+
+def _excluded(path: str) -> bool:
+    return any(part.lower() in EXCLUDED_PARTS for part in path.split('/')[:-1])
+
+
+def _read(root: Path, path: str) -> str:
+    try:
+        with open(root / path, 'r', encoding='utf-8', errors='replace') as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+def _item(category: str, path: str, message: str) -> Dict[str, str]:
+    return {"category": category, "path": path, "message": message}
+
+
+# -- inputs --------------------------------------------------------------------
+
+def _doc_inputs(index) -> List[Dict[str, Any]]:
+    """Markdown documents under docs/ outside archive, old and report folders"""
+    return [entry for entry in index.files("docs", suffix=".md") if not _excluded(entry["path"])]
+
+
+def _markdown_inputs(index) -> List[Dict[str, Any]]:
+    """Every Markdown document of the project (the whole link graph)"""
+    return index.files(suffix=".md")
+
+
+def _progress_inputs(index) -> List[Dict[str, Any]]:
+    code = [entry for entry in index.files() if entry["path"].endswith(CODE_SUFFIXES)
+            and not _excluded(entry["path"])]
+    todo = [entry for entry in [index.get("docs/status/todo.md")] if entry]
+    return todo + code
+
+
+def _handover_inputs(index) -> List[Dict[str, Any]]:
+    return [entry for entry in [index.get("docs/status/handover-next.md")] if entry]
+
+
+# -- analyzers (run in worker processes) ---------------------------------------
+
+def _unreferenced_documents(root: Path, paths: List[str]) -> List[Dict[str, str]]:
+    from link_graph import LinkGraph
+    graph = LinkGraph(root)
+    graph.update(paths)
+    # Archived documents neither need references nor count as referring;
+    # handovers are use-once documents
+    live = [path for path in paths if not _excluded(path)]
+    scope = [path for path in live if path.startswith("docs/")
+             and not path.rsplit('/', 1)[-1].lower().startswith("handover")]
+    return graph.report(scope, sources=live)
+
+
+def _yaml_headers(root: Path, paths: List[str]) -> List[Dict[str, str]]:
+    from frontmatter_validator import validate_files
+    categories = {"missing": "missing_header", "unterminated": "unterminated_header",
+                  "unreadable": "unreadable", "invalid": "invalid_fields"}
+    items = []
+    for result in validate_files(root, paths)["files"]:
+        items.extend(_item(categories.get(result["status"], "invalid_fields"), result["path"], error)
+                     for error in result["errors"])
+        items.extend(_item("summary_length", result["path"], warning) for warning in result["warnings"])
+    return items
+
+
+def _documentation_index(root: Path, paths: List[str]) -> List[Dict[str, str]]:
+    index_path = "docs/documentation-index.md"
+    text = _read(root, index_path)
+    if not text:
+        return [_item("missing_index", index_path, "documentation-index.md not found")]
+
+    items = []
+    listed = set(MD_PATH_PATTERN.findall(text))
+    listed_names = {entry.rsplit('/', 1)[-1] for entry in listed}
+    for path in paths:
+        if path != index_path and path.rsplit('/', 1)[-1] not in listed_names:
+            items.append(_item("not_indexed", path, "Document is not listed in the index"))
+    for entry in sorted(listed):
+        candidates = [root / entry.lstrip('/'), root / "docs" / entry.lstrip('/'),
+                      (root / index_path).parent / entry]
+        if '/' in entry and not any(candidate.exists() for candidate in candidates):
+            items.append(_item("broken_path", index_path, f"Indexed path does not exist: {entry}"))
+    return items
+
+
+def _document_structure(root: Path, paths: List[str]) -> List[Dict[str, str]]:
+    items = []
+    for path in paths:
+        document = index_text(_read(root, path))
+        titles = [section for section in document.sections if section.level == 1]
+        if not titles:
+            items.append(_item("missing_title", path, "No '# ' title heading"))
+        elif len(titles) > 1:
+            items.append(_item("multiple_titles", path, f"{len(titles)} '# ' headings"))
+        previous = 0
+        for section in document.sections:
+            if previous and section.level > previous + 1:
+                items.append(_item("skipped_level", path,
+                                   f"Line {section.line + 1}: h{previous} followed by h{section.level} "
+                                   f"('{section.title}')"))
+            previous = section.level
+    return items
+
+
+def _content_consistency(root: Path, paths: List[str]) -> List[Dict[str, str]]:
+    projects: Dict[str, List[str]] = {}
+    for path in paths:
+        project = index_text(_read(root, path)).frontmatter.get("project")
+        if isinstance(project, str) and project and not project.startswith("["):
+            projects.setdefault(project, []).append(path)
+    if len(projects) <= 1:
+        return []
+    majority = max(projects, key=lambda name: len(projects[name]))
+    return [_item("project_name", path, f"project: {name!r} (most documents use {majority!r})")
+            for name, files in sorted(projects.items()) if name != majority for path in files]
+
+
+def _project_progress(root: Path, paths: List[str]) -> List[Dict[str, str]]:
+    items = []
+    for path in paths:
+        if path.endswith(".md"):
+            from todo_index import TodoIndex
+            todo = TodoIndex.parse(root / path, _read(root, path))
+            counts = todo.counts()
+            items.append(_item("todo_counts", path, f"{counts['open']} open, {counts['in_progress']} "
+                                                    f"in progress, {counts['done']} done"))
+            continue
+        markers = MARKER_PATTERN.findall(_read(root, path))
+        if markers:
+            items.append(_item("code_markers", path, f"{len(markers)} TODO/FIXME marker(s)"))
+    return items
+
+
+def _handover_validation(root: Path, paths: List[str]) -> List[Dict[str, str]]:
+    from utils import install_module_aliases
+    install_module_aliases()
+    from handover_manager import HandoverManager
+
+    items = []
+    for path in paths:
+        validation = HandoverManager(root).validate_handover_structure(_read(root, path))
+        items.extend(_item("error", path, error) for error in validation["errors"])
+        items.extend(_item("warning", path, warning) for warning in validation["warnings"])
+    return items
+
+
+ANALYZERS: Dict[str, Analyzer] = {
+    "unreferenced_documents_check": Analyzer(2, _markdown_inputs, _unreferenced_documents),
+    "YAML_Headers_Check": Analyzer(2, _doc_inputs, _yaml_headers),
+    "documentation_index_check": Analyzer(1, _doc_inputs, _documentation_index),
+    "Document_Structure_Check": Analyzer(1, _doc_inputs, _document_structure),
+    "Content_Consistency_Check": Analyzer(1, _doc_inputs, _content_consistency),
+    "Project_Progress_Check": Analyzer(1, _progress_inputs, _project_progress),
+    "handover_validation_check": Analyzer(1, _handover_inputs, _handover_validation),
+}
+
+
+def _run_analyzer(task: str, root: str, paths: List[str]) -> tuple:
+    """Worker entry point: (items, elapsed ms, error message or None)
+
+    A failing analyzer must not take the other tasks down with it, so its
+    exception is returned instead of raised.
+    """
+    start = time.perf_counter()
+    try:
+        items, error = ANALYZERS[task].run(Path(root), paths), None
+    except Exception as e:
+        items, error = [], f"{type(e).__name__}: {e}"
+    return items, round((time.perf_counter() - start) * 1000, 1), error
+
+
+# -- engine --------------------------------------------------------------------
+
+def list_tasks(tasks_dir: Path) -> List[str]:
+    """Maintenance task names (task documents, without the migration checklist)"""
+    return sorted(path.stem for path in Path(tasks_dir).glob("*.md")
+                  if not path.stem.startswith("DOCUMENT_TYPE"))
+
+
+def _cache_dir() -> Path:
+    from utils import get_state_dir
+    return get_state_dir() / "maintenance"
+
+
+def findings_path(task: str) -> Path:
+    """Where the precomputed findings of a task are kept"""
+    return _cache_dir() / f"{task}.json"
+
+
+def _input_key(task: str, entries: List[Dict[str, Any]]) -> str:
+    digest = hashlib.sha1(f"{task}:{ANALYZERS[task].version}".encode())
+    for entry in entries:
+        digest.update(f"\0{entry['path']}\0{entry['hash'] or (entry['mtime'], entry['size'])}".encode())
+    return digest.hexdigest()
+
+
+def load_findings(task: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(findings_path(task), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_findings(findings: Dict[str, Any]):
+    path = findings_path(findings["task"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(findings, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def run_preanalysis(project_root: Path, tasks: List[str], use_cache: bool = True,
+                    workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+    """Precompute findings for maintenance tasks concurrently
+
+    Args:
+        project_root: Project to analyze
+        tasks: Task names; tasks without an analyzer are reported as agent-only
+        use_cache: Reuse findings whose input hashes are unchanged
+        workers: Worker processes (defaults to one per task to run; 1 runs inline)
+
+    Returns:
+        {task: {"status": "cached" | "analyzed" | "agent-only" | "error",
+        "findings", "path", "ms"}}; a task whose analyzer failed has status
+        "error", an "error" message and no findings, and is left to the agent
+    """
+    from file_index import get_file_index
+
+    index = get_file_index(project_root)
+    index.refresh()
+
+    results, pending = {}, {}
+
+    def store_error(task, error, elapsed_ms):
+        results[task] = {"status": "error", "error": error, "findings": None, "path": None, "ms": elapsed_ms}
+
+    for task in tasks:
+        if task not in ANALYZERS:
+            results[task] = {"status": "agent-only", "findings": None, "path": None, "ms": 0}
+            continue
+        try:
+            entries = ANALYZERS[task].inputs(index)
+        except Exception as e:
+            store_error(task, f"{type(e).__name__}: {e}", 0)
+            continue
+        key = _input_key(task, entries)
+        cached = load_findings(task) if use_cache else None
+        if cached is not None and cached.get("key") == key:
+            results[task] = {"status": "cached", "findings": cached,
+                             "path": str(findings_path(task)), "ms": 0}
+        else:
+            pending[task] = (key, [entry["path"] for entry in entries])
+
+    def store(task, key, items, elapsed_ms, error=None):
+        if error is not None:
+            store_error(task, error, elapsed_ms)
+            return
+        counts: Dict[str, int] = {}
+        for item in items:
+            counts[item["category"]] = counts.get(item["category"], 0) + 1
+        findings = {"task": task, "key": key, "generated": datetime.now().isoformat(timespec="seconds"),
+                    "counts": counts, "items": items}
+        _save_findings(findings)
+        results[task] = {"status": "analyzed", "findings": findings,
+                         "path": str(findings_path(task)), "ms": elapsed_ms}
+
+    if workers is None:
+        workers = min(len(pending), os.cpu_count() or 1)
+    if workers <= 1:
+        for task, (key, paths) in pending.items():
+            store(task, key, *_run_analyzer(task, str(project_root), paths))
+    elif pending:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {task: pool.submit(_run_analyzer, task, str(project_root), paths)
+                       for task, (key, paths) in pending.items()}
+            for task, future in futures.items():
+                try:
+                    store(task, pending[task][0], *future.result())
+                except Exception as e:
+                    # e.g. a worker process that died (BrokenProcessPool)
+                    store_error(task, f"{type(e).__name__}: {e}", 0)
+
+    return {task: results[task] for task in tasks}
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Markdown Index - Single-pass section index for handovers and docs
+
+Parses a Markdown document once into:
+- the YAML frontmatter (top-level keys; list items collected per key)
+- a heading tree with line numbers and byte offsets for every section
+- the bullet items of every section
+
+Consumers (handover validation, previous handover summaries, session start)
+then look sections up instead of rescanning the text, and the byte offsets
+allow reading a single section from disk without loading the document.
+Indexes of files are cached per process by (mtime_ns, size).
+
+Headings inside fenced code blocks are ignored. Handovers are often edited
+by hand, so a fence that is never closed (the next fence line opens a new
+block with an info string, or the document ends) is treated as stray text
+rather than swallowing the rest of the document. The frontmatter parser only
+understands the flat 'key: value' / '- item' shape our documents use; it is
+not a general YAML parser.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+FRONTMATTER_KEY_PATTERN = re.compile(r'^([A-Za-z_][\w-]*):\s*(.*)$')
+BULLET_PREFIXES = ('- ', '* ', '+ ')
+
+_file_cache: Dict[str, Tuple[Tuple[int, int], 'MarkdownIndex']] = {}
+
+
+class Section:
+    """One heading and the range of the document it covers
+
+    Line numbers are 0-based indexes into MarkdownIndex.lines. 'end' ranges
+    stop at the next heading of any level (the section's own body); 'subtree'
+    ranges stop at the next heading of the same or a higher level.
+    """
+
+    __slots__ = ('level', 'title', 'heading', 'line', 'end_line', 'subtree_end_line',
+                 'start', 'body_start', 'end', 'subtree_end', 'parent', 'children', 'bullets')
+
+    def __init__(self, level: int, title: str, heading: str, line: int, start: int, body_start: int):
+        self.level = level
+        self.title = title
+        self.heading = heading          # heading line as written, e.g. "## 🎯 Next Session Goal"
+        self.line = line
+        self.end_line = line + 1
+        self.subtree_end_line = line + 1
+        self.start = start              # byte offset of the heading line
+        self.body_start = body_start    # byte offset just after the heading line
+        self.end = body_start
+        self.subtree_end = body_start
+        self.parent: Optional['Section'] = None
+        self.children: List['Section'] = []
+        self.bullets: List[Tuple[int, str]] = []  # (line, stripped bullet line)
+
+    def __repr__(self):
+        return f"Section({self.heading!r}, line={self.line})"
+
+
+def parse_frontmatter(lines: List[str]) -> Optional[Tuple[Dict[str, Any], int]]:
+    """Parse a leading '---' block of 'key: value' / '- item' lines
+
+    Args:
+        lines: Document lines without line endings; only the lines up to the
+            closing '---' are looked at
+
+    Returns:
+        (fields, first line after the block), or None if the lines do not
+        start with a complete frontmatter block
+    """
+    if not lines or lines[0].strip() != '---':
+        return None
+
+    fields: Dict[str, Any] = {}
+    key = None
+    for number in range(1, len(lines)):
+        line = lines[number]
+        if line.strip() == '---':
+            return fields, number + 1
+        match = FRONTMATTER_KEY_PATTERN.match(line)
+        if match:
+            key, value = match.group(1), match.group(2).strip()
+            fields[key] = value.strip('"\'') if value else []
+        elif key and line.strip().startswith('- '):
+            if not isinstance(fields[key], list):
+                fields[key] = [fields[key]] if fields[key] else []
+            fields[key].append(line.strip()[2:].strip('"\''))
+    return None
+
+
+class MarkdownIndex:
+    """Parsed structure of one Markdown document"""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lines = text.split('\n')
+        self.frontmatter: Dict[str, Any] = {}
+        self.has_frontmatter = False
+        self.sections: List[Section] = []
+        self._parse()
+
+    def _parse(self):
+        offset = 0
+        line_offsets = []
+        for line in self.lines:
+            line_offsets.append(offset)
+            offset += len(line.encode('utf-8')) + 1
+        total = len(self.text.encode('utf-8'))
+        line_offsets.append(total)
+
+        first_body_line = self._parse_frontmatter()
+
+        code_lines = self._find_code_lines(first_body_line)
+
+        stack: List[Section] = []
+        current: Optional[Section] = None
+        for number in range(first_body_line, len(self.lines)):
+            if number in code_lines:
+                continue
+            line = self.lines[number]
+            stripped = line.strip()
+
+            match = HEADING_PATTERN.match(line) if line.startswith('#') else None
+            if match:
+                level = len(match.group(1))
+                section = Section(level, match.group(2), line.rstrip(), number,
+                                  line_offsets[number], line_offsets[number + 1])
+                if current is not None:
+                    current.end_line = number
+                    current.end = line_offsets[number]
+                while stack and stack[-1].level >= level:
+                    closed = stack.pop()
+                    closed.subtree_end_line = number
+                    closed.subtree_end = line_offsets[number]
+                if stack:
+                    section.parent = stack[-1]
+                    stack[-1].children.append(section)
+                stack.append(section)
+                self.sections.append(section)
+                current = section
+            elif current is not None and stripped.startswith(BULLET_PREFIXES):
+                current.bullets.append((number, stripped))
+
+        end_line = len(self.lines)
+        if current is not None:
+            current.end_line = end_line
+            current.end = total
+        for section in stack:
+            section.subtree_end_line = end_line
+            section.subtree_end = total
+
+    def _find_code_lines(self, first_line: int) -> set:
+        """Line numbers inside properly closed fenced code blocks (fences included)"""
+        fences = []  # (line, marker, has info string)
+        for number in range(first_line, len(self.lines)):
+            stripped = self.lines[number].strip()
+            if stripped.startswith('```') or stripped.startswith('~~~'):
+                fences.append((number, stripped[:3], bool(stripped[3:].strip())))
+
+        code_lines = set()
+        i = 0
+        while i < len(fences):
+            start, marker, _ = fences[i]
+            # The closing fence is the next bare fence with the same marker,
+            # unless another block (fence with an info string) opens first
+            close = None
+            for j in range(i + 1, len(fences)):
+                number, other_marker, has_info = fences[j]
+                if has_info:
+                    break
+                if other_marker == marker:
+                    close = j
+                    break
+            if close is None:
+                i += 1
+                continue
+            code_lines.update(range(start, fences[close][0] + 1))
+            i = close + 1
+        return code_lines
+
+    def _parse_frontmatter(self) -> int:
+        """Parse the leading '---' block; return the first line after it"""
+        parsed = parse_frontmatter(self.lines)
+        if parsed is None:
+            # No or unterminated frontmatter: treat the document as having none
+            return 0
+        self.frontmatter, first_body_line = parsed
+        self.has_frontmatter = True
+        return first_body_line
+
+    def headings(self, level: Optional[int] = None) -> List[Section]:
+        """All sections, optionally only those of one heading level"""
+        if level is None:
+            return list(self.sections)
+        return [section for section in self.sections if section.level == level]
+
+    def find(self, text: str, level: Optional[int] = None) -> List[Section]:
+        """Sections whose title contains text"""
+        return [section for section in self.sections
+                if text in section.title and (level is None or section.level == level)]
+
+    def find_heading(self, prefix: str) -> Optional[Section]:
+        """First section whose heading line starts with prefix (e.g. '## 🎯 Next')"""
+        for section in self.sections:
+            if section.heading.startswith(prefix):
+                return section
+        return None
+
+    def section_lines(self, section: Section, subtree: bool = False) -> List[str]:
+        """Body lines of a section (without its heading line)"""
+        end = section.subtree_end_line if subtree else section.end_line
+        return self.lines[section.line + 1:end]
+
+    def section_text(self, section: Section, subtree: bool = False) -> str:
+        return '\n'.join(self.section_lines(section, subtree))
+
+    def bullets(self, section: Section, subtree: bool = False) -> List[str]:
+        """Stripped bullet lines of a section (and optionally its subsections)"""
+        if not subtree:
+            return [text for _, text in section.bullets]
+        items = []
+        for candidate in self.sections:
+            if section.line <= candidate.line < section.subtree_end_line:
+                items.extend(text for _, text in candidate.bullets)
+        return items
+
+
+def index_text(text: str) -> MarkdownIndex:
+    """Index a document held in memory"""
+    return MarkdownIndex(text)
+
+
+def index_file(path: Path) -> Optional[MarkdownIndex]:
+    """Index a file, reusing the cached index while its mtime and size are unchanged
+
+    Returns:
+        The index, or None if the file cannot be read
+    """
+    path = str(path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _file_cache.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            index = MarkdownIndex(f.read())
+    except OSError:
+        return None
+    _file_cache[path] = (key, index)
+    return index
+
+
+def read_section(path: Path, section: Section, subtree: bool = False) -> str:
+    """Read one section's body straight from disk using its byte offsets"""
+    end = section.subtree_end if subtree else section.end
+    with open(path, 'rb') as f:
+        f.seek(section.body_start)
+        return f.read(max(0, end - section.body_start)).decode('utf-8', errors='replace')
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Orchestrator Daemon - Keeps orchestrator state warm between invocations
+
+Hooks and slash commands call orchestrate.py dozens of times per session.
+Each call normally pays for interpreter start, module loading, YAML parsing
+and fresh SQLite connections. The daemon is an opt-in long-lived process
+that keeps all of that loaded and answers requests over a Unix socket.
+
+PROTOCOL:
+- One request per connection, encoded as a single JSON line
+- Command request:  {"argv": [...], "stdin": "...", "cwd": "..."}
+- Control request:  {"control": "ping" | "shutdown"}
+- Response:         {"exit_code": 0, "stdout": "...", "stderr": "..."}
+
+The client side (forward_command) only needs the standard socket and json
+modules so that forwarding stays cheap; the server machinery is imported
+only when the daemon is actually started.
+"""
+
+import os
+import sys
+import json
+import socket
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+from utils import get_state_dir
+
+SOCKET_NAME = "orchestrator.sock"
+CONNECT_TIMEOUT = 0.2  # seconds - a dead daemon must not slow down the fallback
+DISABLE_ENV = "CLAUDE_ORCHESTRATOR_NO_DAEMON"
+
+
+def get_socket_path() -> Path:
+    """Return the Unix socket path used by the daemon"""
+    return get_state_dir() / SOCKET_NAME
+
+
+def _request(payload: Dict[str, Any], socket_path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Send one request to the daemon and return its decoded response
+
+    Returns None if the daemon is not running or the connection fails.
+    """
+    socket_path = Path(socket_path) if socket_path else get_socket_path()
+    if not socket_path.exists():
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(socket_path))
+            sock.settimeout(None)
+            sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        return None
+
+    if not chunks:
+        return None
+    try:
+        return json.loads(b"".join(chunks).decode("utf-8"))
+    except ValueError:
+        return None
+
+
+def forward_command(argv: List[str], stdin_text: Optional[str] = None,
+                    socket_path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Forward an orchestrate.py command line to the daemon
+
+    Args:
+        argv: Command line arguments (without the program name)
+        stdin_text: Content to provide as stdin to the command
+        socket_path: Override the socket location
+
+    Returns:
+        Response dictionary, or None if the command should run in-process
+    """
+    if os.environ.get(DISABLE_ENV):
+        return None
+
+    return _request({
+        "argv": list(argv),
+        "stdin": stdin_text or "",
+        "cwd": os.getcwd()
+    }, socket_path)
+
+
+def ping(socket_path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+    """Return daemon status information, or None if it is not running"""
+    return _request({"control": "ping"}, socket_path)
+
+
+def shutdown(socket_path: Optional[Path] = None) -> bool:
+    """Ask a running daemon to exit"""
+    return _request({"control": "shutdown"}, socket_path) is not None
+
+
+def start_background(orchestrate_path: Path, wait: float = 5.0) -> Optional[Dict[str, Any]]:
+    """Launch the daemon as a detached background process
+
+    Args:
+        orchestrate_path: Path to orchestrate.py (runs 'daemon run')
+        wait: Seconds to wait for the socket to come up
+
+    Returns:
+        Ping response of the started daemon, or None if it did not start
+    """
+    import subprocess
+
+    log_path = get_state_dir() / "orchestrator-daemon.log"
+    with open(log_path, 'a') as log:
+        subprocess.Popen(
+            [sys.executable, str(orchestrate_path), "daemon", "run"],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+            env={**os.environ, DISABLE_ENV: "1"}
+        )
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        info = ping()
+        if info:
+            return info
+        time.sleep(0.05)
+    return None
+
+
+def serve(handler: Callable[[List[str], str], Dict[str, Any]],
+          socket_path: Optional[Path] = None):
+    """Run the daemon loop in the foreground until shutdown is requested
+
+    Requests are handled one at a time because command handlers redirect
+    the process-wide stdout/stderr and change the working directory.
+
+    Args:
+        handler: Callable taking (argv, stdin_text) and returning a response dict
+        socket_path: Override the socket location
+    """
+    import socketserver
+
+    socket_path = Path(socket_path) if socket_path else get_socket_path()
+
+    if socket_path.exists():
+        if ping(socket_path):
+            raise RuntimeError(f"Daemon already running on {socket_path}")
+        # Stale socket left behind by a crashed daemon
+        socket_path.unlink()
+
+    stats = {"pid": os.getpid(), "started": time.time(), "requests": 0}
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            try:
+                request = json.loads(line.decode("utf-8"))
+            except ValueError:
+                return
+
+            control = request.get("control")
+            if control == "ping":
+                response = {**stats, "uptime": round(time.time() - stats["started"], 1)}
+            elif control == "shutdown":
+                response = {"stopping": True}
+                self.server.stopping = True
+            else:
+                stats["requests"] += 1
+                previous_cwd = os.getcwd()
+                try:
+                    os.chdir(request.get("cwd") or previous_cwd)
+                    response = handler(request.get("argv", []), request.get("stdin", ""))
+                finally:
+                    os.chdir(previous_cwd)
+
+            self.wfile.write(json.dumps(response, default=str).encode("utf-8"))
+
+    class Server(socketserver.UnixStreamServer):
+        stopping = False
+
+    server = Server(str(socket_path), RequestHandler)
+    print(f"🛰️ Orchestrator daemon listening on {socket_path} (pid {os.getpid()})", flush=True)
+    try:
+        while not server.stopping:
+            server.handle_request()
+    finally:
+        server.server_close()
+        if socket_path.exists():
+            socket_path.unlink()
+        print("👋 Orchestrator daemon stopped", flush=True)
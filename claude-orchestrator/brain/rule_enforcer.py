@@ -15,50 +15,359 @@ YAML RULE FILES:
 - naming.yaml: File and folder naming conventions
 - documentation.yaml: Where different types of docs should go
 - core.yaml: Core project rules (context, TODOs, etc.)
+
+RULE SNAPSHOTS:
+Parsing YAML is the slowest part of starting the enforcer, and hooks start
+it on every call. The parsed rules are therefore compiled into a pickled
+snapshot in .orchestrator/state/rule-snapshots/, together with the derived
+lookups (critical rules, naming exceptions, extension map). The snapshot is
+rebuilt whenever a rule file's mtime or size changes, so loading is a single
+file read in the steady state and the YAML parser is only imported on rebuild.
 """
 
 import os
 import sys
-import yaml
 import re
+import time
+import pickle
+import hashlib
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent))
+from utils import find_project_root, get_state_dir
+from enforcer_metrics import EnforcerMetrics, DEFAULT_VIOLATION_BUFFER
+
+SNAPSHOT_VERSION = 1
+
+# Document types that are transient regardless of their content
+TRANSIENT_DOC_TYPES = ("report", "feedback", "status-update")
+
+# Python conventions always accepted by the naming check
+PYTHON_NAMING_EXCEPTIONS = ['__init__', '__pycache__', '__main__']
+
+
+def get_rules_signature(rules_dir: Path) -> List[Tuple[str, int, int]]:
+    """Return (file name, mtime_ns, size) for every rule file, sorted by name"""
+    signature = []
+    try:
+        with os.scandir(rules_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith('.yaml') and entry.is_file():
+                    stat = entry.stat()
+                    signature.append((entry.name, stat.st_mtime_ns, stat.st_size))
+    except OSError:
+        return []
+    return sorted(signature)
+
+
+def compile_rules(rules_dir: Path, verbose: bool = False) -> Dict[str, Any]:
+    """Parse all rule files and precompute the lookups the enforcer needs
+    
+    Returns:
+        Snapshot dictionary (rules plus derived lookups)
+    """
+    import yaml
+    
+    rules = {}
+    for rule_file in sorted(rules_dir.glob("*.yaml")):
+        try:
+            with open(rule_file, 'r') as f:
+                rule_set = yaml.safe_load(f)
+                if rule_set:
+                    rules[rule_file.stem] = rule_set
+                    if verbose:
+                        print(f"✅ Loaded rules: {rule_file.stem}")
+        except Exception as e:
+            print(f"❌ Failed to load {rule_file}: {e}")
+    
+    critical_rules = []
+    for rule_set in rules.values():
+        if rule_set.get('priority') == 'critical':
+            critical_rules.extend(rule_set.get('rules', []))
+    
+    exceptions = rules.get('naming', {}).get('exceptions', []) or []
+    
+    return {
+        "version": SNAPSHOT_VERSION,
+        "rules_dir": str(rules_dir),
+        "rules": rules,
+        "critical_rules": tuple(critical_rules),
+        "naming_exceptions": frozenset(list(exceptions) + PYTHON_NAMING_EXCEPTIONS),
+        "extension_map": dict(rules.get('organization', {}).get('extensions', {}) or {})
+    }
+
+
+def find_naming_violation(path: str, naming_exceptions: frozenset) -> Optional[Dict[str, str]]:
+    """Return the first naming violation of a path, or None
+    
+    Names listed as exceptions (by full name or by stem, e.g. README.md or
+    __init__) are accepted as they are.
+    """
+    base_name = os.path.basename(path.rstrip('/'))
+    name = os.path.splitext(base_name)[0]  # filename without extension
+    
+    # Skip hidden files and specific allowed exceptions
+    if name.startswith('.') or base_name in naming_exceptions:
+        return None
+    
+    if name != name.lower():
+        if name in naming_exceptions:
+            return None
+        return {"rule": "naming", "check": "uppercase",
+                "message": f"Naming violation: '{name}' contains uppercase letters"}
+    
+    if '_' in name and name not in naming_exceptions:
+        return {"rule": "naming", "check": "underscore",
+                "message": f"Naming violation: '{name}' contains underscores (use hyphens)"}
+    
+    if ' ' in name:
+        return {"rule": "naming", "check": "space",
+                "message": f"Naming violation: '{name}' contains spaces"}
+    
+    return None
+
+
+def find_organization_violation(path: str, extension_map: Dict[str, str]) -> Optional[Dict[str, str]]:
+    """Return an organization violation if the file's extension belongs elsewhere"""
+    suffix = os.path.splitext(path)[1]
+    if suffix:
+        expected_dir = extension_map.get(suffix)
+        if expected_dir and expected_dir not in path:
+            return {"rule": "organization", "check": "extension",
+                    "message": f"Organization violation: {suffix} files should be in {expected_dir}"}
+    return None
+
+
+def _validate_chunk(paths: List[Tuple[str, bool]], naming_exceptions: frozenset,
+                    extension_map: Dict[str, str]) -> Tuple[List[Dict[str, Any]], float]:
+    """Run naming and organization checks on a batch of paths (worker entry point)
+    
+    Returns:
+        (violation records, elapsed microseconds)
+    """
+    start = time.perf_counter_ns()
+    records = []
+    for path, is_dir in paths:
+        violation = find_naming_violation(path, naming_exceptions)
+        if violation:
+            records.append({"path": path, "is_dir": is_dir, **violation})
+        if not is_dir and extension_map:
+            violation = find_organization_violation(path, extension_map)
+            if violation:
+                records.append({"path": path, "is_dir": is_dir, **violation})
+    return records, (time.perf_counter_ns() - start) / 1000
+
+
+def get_snapshot_path(rules_dir: Path) -> Path:
+    """Snapshot file for a rules directory (one per directory)"""
+    digest = hashlib.sha1(str(Path(rules_dir).resolve()).encode('utf-8')).hexdigest()[:16]
+    return get_state_dir() / "rule-snapshots" / f"{digest}.pickle"
+
+
+def _git(root: Path, *args: str) -> Optional[str]:
+    """Run a git command in root and return its stdout, or None on failure"""
+    import subprocess
+    try:
+        result = subprocess.run(["git", *args], capture_output=True, text=True, cwd=root)
+    except OSError:
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+def _git_changed_paths(root: Path, base: str, head: str) -> Optional[set]:
+    """Paths changed, added or renamed between two commits (None if base is unknown)"""
+    output = _git(root, "diff", "--name-status", "-z", "-M", base, head)
+    if output is None:
+        return None
+    
+    paths = set()
+    tokens = output.split('\0')
+    i = 0
+    while i < len(tokens) and tokens[i]:
+        status = tokens[i]
+        if status[0] in "RC":
+            # Old path disappears (dropped from the index), new path is checked
+            paths.update(tokens[i + 1:i + 3])
+            i += 3
+        else:
+            paths.add(tokens[i + 1])
+            i += 2
+    return paths
+
+
+def _git_dirty_paths(root: Path) -> Optional[set]:
+    """Modified, staged and untracked paths in the working tree"""
+    output = _git(root, "status", "--porcelain", "-z", "--untracked-files=all")
+    if output is None:
+        return None
+    
+    paths = set()
+    tokens = output.split('\0')
+    i = 0
+    while i < len(tokens) and tokens[i]:
+        entry = tokens[i]
+        paths.add(entry[3:])
+        if entry[0] in "RC":
+            # Rename source follows as its own token
+            paths.add(tokens[i + 1])
+            i += 1
+        i += 1
+    return paths
+
+
+def _git_toplevel(root: Path) -> Optional[Path]:
+    """Top level of the git work tree containing root"""
+    output = _git(root, "rev-parse", "--show-toplevel")
+    return Path(output.strip()).resolve() if output else None
+
+
+def _rebase_paths(paths: set, prefix: str) -> set:
+    """Turn top-level-relative git paths into paths relative to the audited folder
+    
+    Args:
+        paths: Paths as git prints them (relative to the work tree top level)
+        prefix: The audited folder relative to the top level ('' for the top level)
+    
+    Returns:
+        The paths inside that folder, relative to it
+    """
+    if not prefix:
+        return set(paths)
+    prefix += '/'
+    return {path[len(prefix):] for path in paths if path.startswith(prefix) and len(path) > len(prefix)}
+
+
+def get_violation_index_path(root: Path, toplevel: Optional[Path] = None) -> Path:
+    """Persisted violation index for an audited folder of a work tree"""
+    key = f"{toplevel or ''}\0{root}"
+    digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    return get_state_dir() / f"violation-index-{digest}.json"
+
+
+def _load_violation_index(index_path: Path, root: Path, toplevel: Optional[Path] = None) -> Dict[str, Any]:
+    import json
+    scope = {"root": str(root), "toplevel": str(toplevel) if toplevel else None}
+    try:
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+        if index.get("root") == scope["root"] and index.get("toplevel") == scope["toplevel"]:
+            return index
+    except (OSError, ValueError):
+        pass
+    return {**scope, "base_commit": None, "dirty": [], "violations": {}}
+
+
+def _save_violation_index(index_path: Path, index: Dict[str, Any]):
+    import json
+    tmp_path = index_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(index, f)
+    os.replace(tmp_path, index_path)
+
+
 class RuleEnforcer:
     """Enforces project rules and conventions"""
     
-    def __init__(self, rules_dir: Optional[Path] = None):
-        """Initialize with rules directory"""
+    def __init__(self, rules_dir: Optional[Path] = None, use_snapshot: bool = True,
+                 verbose: bool = False, violation_buffer: int = DEFAULT_VIOLATION_BUFFER):
+        """Initialize with rules directory
+        
+        Args:
+            rules_dir: Directory with rule YAML files (defaults to brain/rules/)
+            use_snapshot: Load from / write to the compiled rule snapshot
+            verbose: Print a line for every rule set parsed from YAML
+            violation_buffer: Number of recent violations kept in memory
+        """
         if rules_dir is None:
             # Default to brain/rules/ directory
             self.rules_dir = Path(__file__).parent / "rules"
         else:
             self.rules_dir = Path(rules_dir)
         
+        self.use_snapshot = use_snapshot
+        self.verbose = verbose
         self.rules = {}
-        self.violations = []
+        self.critical_rules = ()
+        self.naming_exceptions = frozenset(PYTHON_NAMING_EXCEPTIONS)
+        self.extension_map = {}
+        self.signature = []
+        self.loaded_from_snapshot = False
+        self._classifier = None
+        self.metrics = EnforcerMetrics(violation_buffer)
         self.load_rules()
     
+    @property
+    def violations(self) -> List[str]:
+        """Messages of the most recent violations (bounded ring buffer)"""
+        return [record["message"] for record in self.metrics.recent_violations]
+    
     def load_rules(self) -> Dict[str, Any]:
-        """Load all rules from YAML files"""
+        """Load all rules, from the compiled snapshot when it is current"""
         if not self.rules_dir.exists():
             print(f"⚠️ Rules directory not found: {self.rules_dir}")
             return {}
         
-        # Load each YAML file in rules directory
-        for rule_file in self.rules_dir.glob("*.yaml"):
-            try:
-                with open(rule_file, 'r') as f:
-                    rule_set = yaml.safe_load(f)
-                    if rule_set:
-                        self.rules[rule_file.stem] = rule_set
-                        print(f"✅ Loaded rules: {rule_file.stem}")
-            except Exception as e:
-                print(f"❌ Failed to load {rule_file}: {e}")
+        with self.metrics.timed("load_rules", runs=0):
+            signature = get_rules_signature(self.rules_dir)
+            snapshot = self._read_snapshot(signature) if self.use_snapshot else None
+            self.loaded_from_snapshot = snapshot is not None
+            if self.use_snapshot:
+                self.metrics.record_cache("snapshot", self.loaded_from_snapshot)
+            
+            if snapshot is None:
+                snapshot = compile_rules(self.rules_dir, verbose=self.verbose)
+                snapshot["signature"] = signature
+                if self.use_snapshot:
+                    self._write_snapshot(snapshot)
         
+        self.signature = signature
+        self._classifier = None
+        self.rules = snapshot["rules"]
+        self.critical_rules = snapshot["critical_rules"]
+        self.naming_exceptions = snapshot["naming_exceptions"]
+        self.extension_map = snapshot["extension_map"]
         return self.rules
     
+    def reload_if_changed(self) -> bool:
+        """Reload rules if any rule file changed since they were loaded
+        
+        Returns:
+            True if the rules were reloaded
+        """
+        unchanged = get_rules_signature(self.rules_dir) == self.signature
+        self.metrics.record_cache("rules_current", unchanged)
+        if unchanged:
+            return False
+        self.load_rules()
+        return True
+    
+    def _read_snapshot(self, signature: List[Tuple[str, int, int]]) -> Optional[Dict[str, Any]]:
+        """Return the stored snapshot if it matches the current rule files"""
+        try:
+            with open(get_snapshot_path(self.rules_dir), 'rb') as f:
+                snapshot = pickle.load(f)
+        except Exception:
+            return None
+        
+        if (snapshot.get("version") != SNAPSHOT_VERSION
+                or snapshot.get("signature") != signature):
+            return None
+        return snapshot
+    
+    def _write_snapshot(self, snapshot: Dict[str, Any]):
+        """Store a compiled snapshot atomically"""
+        snapshot_path = get_snapshot_path(self.rules_dir)
+        try:
+            snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = snapshot_path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, snapshot_path)
+        except OSError as e:
+            print(f"⚠️ Could not write rule snapshot: {e}")
+    
     def check_naming_convention(self, path: str) -> bool:
         """
         Check if path follows naming convention:
@@ -66,36 +375,20 @@ class RuleEnforcer:
         - hyphens as separators (kebab-case)
         - no underscores or spaces
         """
-        path_obj = Path(path)
-        name = path_obj.stem  # filename without extension
-        
-        # Skip hidden files and specific allowed exceptions
-        if name.startswith('.'):
-            return True
-        
-        # Check for uppercase letters
-        if name != name.lower():
-            self.violations.append(f"Naming violation: '{name}' contains uppercase letters")
-            return False
-        
-        # Check for underscores
-        if '_' in name and name not in self.get_naming_exceptions():
-            self.violations.append(f"Naming violation: '{name}' contains underscores (use hyphens)")
-            return False
-        
-        # Check for spaces
-        if ' ' in name:
-            self.violations.append(f"Naming violation: '{name}' contains spaces")
-            return False
-        
-        return True
+        return self._check_naming(path) is None
+    
+    def _check_naming(self, path: str) -> Optional[Dict[str, Any]]:
+        """Run the naming check with instrumentation, returning the violation"""
+        with self.metrics.timed("naming"):
+            violation = find_naming_violation(path, self.naming_exceptions)
+        if violation:
+            violation = {"path": path, **violation}
+            self.metrics.record_violation(violation)
+        return violation
     
     def get_naming_exceptions(self) -> List[str]:
-        """Get list of allowed naming exceptions"""
-        exceptions = self.rules.get('naming', {}).get('exceptions', [])
-        # Add common Python conventions
-        exceptions.extend(['__init__', '__pycache__', '__main__'])
-        return exceptions
+        """Get list of allowed naming exceptions (including Python conventions)"""
+        return sorted(self.naming_exceptions)
     
     def check_documentation_placement(self, doc_type: str, content: str) -> str:
         """
@@ -114,30 +407,41 @@ class RuleEnforcer:
             placement_map = doc_rules.get('placement', {})
             return placement_map.get(doc_type, "Docs/")
     
+    @property
+    def classifier(self):
+        """Indicator classifier compiled from the defaults and documentation.yaml"""
+        self.metrics.record_cache("classifier", self._classifier is not None)
+        if self._classifier is None:
+            from content_classifier import build_classifier
+            self._classifier = build_classifier(self.rules.get('documentation', {}))
+        return self._classifier
+    
     def is_transient_content(self, content: str, doc_type: str) -> bool:
         """Determine if content is transient or permanent"""
-        transient_indicators = [
-            "report", "status", "findings", "analysis",
-            "reorganization", "cleanup", "temporary"
-        ]
-        
-        permanent_indicators = [
-            "architecture", "design", "api", "handbook",
-            "vision", "specification", "contract"
-        ]
-        
         # Check document type
-        if doc_type.lower() in ["report", "feedback", "status-update"]:
+        if doc_type.lower() in TRANSIENT_DOC_TYPES:
             return True
         
-        # Check content for indicators
-        content_lower = content.lower() if content else ""
-        
-        # Count indicators
-        transient_count = sum(1 for ind in transient_indicators if ind in content_lower)
-        permanent_count = sum(1 for ind in permanent_indicators if ind in content_lower)
+        # Count indicators in a single pass over the content
+        classifier = self.classifier
+        with self.metrics.timed("placement"):
+            return classifier.is_transient(classifier.count(content or ""))
+    
+    def is_transient_file(self, path: Path, doc_type: str = "") -> bool:
+        """Like is_transient_content, but streams the file instead of loading it"""
+        if doc_type.lower() in TRANSIENT_DOC_TYPES:
+            return True
+        classifier = self.classifier
+        with self.metrics.timed("placement_file"):
+            return classifier.is_transient(classifier.count_file(path))
+    
+    def classify_documents(self, paths: List[Path], workers: int = 1) -> Iterator[Dict[str, Any]]:
+        """Classify many documents as transient or permanent
         
-        return transient_count > permanent_count
+        Yields:
+            {"path", "transient", "counts"} per document
+        """
+        return self.classifier.classify_files(paths, workers=workers)
     
     def enforce_session_naming(self) -> str:
         """
@@ -154,44 +458,210 @@ class RuleEnforcer:
             "violations": []
         }
         
-        # Check naming convention
-        if not self.check_naming_convention(path):
-            result["valid"] = False
-            result["violations"].extend(self.violations[-1:])
-        
-        # Check file organization rules
-        org_rules = self.rules.get('organization', {})
-        if org_rules:
-            if not self.check_organization(path, org_rules):
+        with self.metrics.timed("validate_path", runs=0):
+            # Check naming convention
+            violation = self._check_naming(path)
+            if violation:
                 result["valid"] = False
-                result["violations"].append("Organization rule violation")
+                result["violations"].append(violation["message"])
+            
+            # Check file organization rules
+            if self.extension_map:
+                if not self.check_organization(path):
+                    result["valid"] = False
+                    result["violations"].append("Organization rule violation")
         
         return result
     
-    def check_organization(self, path: str, org_rules: Dict) -> bool:
+    def check_organization(self, path: str, org_rules: Optional[Dict] = None) -> bool:
         """Check if file is in correct location per organization rules"""
-        path_obj = Path(path)
-        
         # Check file extensions
-        extension_map = org_rules.get('extensions', {})
-        if path_obj.suffix:
-            expected_dir = extension_map.get(path_obj.suffix)
-            if expected_dir and expected_dir not in str(path_obj):
-                self.violations.append(
-                    f"Organization violation: {path_obj.suffix} files should be in {expected_dir}"
-                )
-                return False
+        extension_map = org_rules.get('extensions', {}) if org_rules else self.extension_map
+        with self.metrics.timed("organization"):
+            violation = find_organization_violation(str(Path(path)), extension_map)
+        if violation:
+            self.metrics.record_violation({"path": path, **violation})
+            return False
         
         return True
     
+    def validate_tree(self, root: Optional[Path] = None, workers: Optional[int] = None,
+                      chunk_size: int = 2000, include_dirs: bool = True,
+                      use_file_index: bool = False) -> Iterator[Dict[str, Any]]:
+        """Validate every file and folder of a project, streaming violations
+        
+        The tree is walked with os.scandir, skipping anything .gitignore
+        excludes. Paths are batched and checked across a process pool while
+        the walk continues; violation records are yielded as batches finish,
+        so memory stays flat on large trees. Violations are counted in
+        self.metrics like any other check.
+        
+        Args:
+            root: Folder to audit (defaults to the project root)
+            workers: Worker processes (defaults to CPU count; 1 runs inline)
+            chunk_size: Paths per worker batch
+            include_dirs: Also check folder names
+            use_file_index: Refresh the shared file index (only changed
+                entries are re-read) and take the paths from it instead
+                of walking the tree
+        
+        Yields:
+            Violation records: {"path", "is_dir", "rule", "check", "message"}
+        """
+        from tree_walker import walk_tree
+        
+        if root is None:
+            root = find_project_root() or Path.cwd()
+        if workers is None:
+            workers = os.cpu_count() or 1
+        
+        if use_file_index:
+            from file_index import get_file_index
+            index = get_file_index(Path(root))
+            index.refresh(hash_files=False)
+            paths = index.iter_paths(include_dirs=include_dirs)
+        else:
+            paths = walk_tree(Path(root), include_dirs=include_dirs)
+        check_args = (self.naming_exceptions, self.extension_map)
+        
+        def collect(chunk_size_done, result):
+            records, elapsed_us = result
+            self.metrics.record("tree_batch", elapsed_us, runs=chunk_size_done)
+            for record in records:
+                self.metrics.record_violation(record)
+            return records
+        
+        def chunks():
+            chunk = []
+            for item in paths:
+                chunk.append(item)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        
+        if workers <= 1:
+            for chunk in chunks():
+                yield from collect(len(chunk), _validate_chunk(chunk, *check_args))
+            return
+        
+        from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+        
+        pending = {}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk in chunks():
+                pending[pool.submit(_validate_chunk, chunk, *check_args)] = len(chunk)
+                # Bound the work in flight so results stream out during the walk
+                if len(pending) >= workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from collect(pending.pop(future), future.result())
+            for future, size in pending.items():
+                yield from collect(size, future.result())
+    
+    def validate_changed(self, root: Optional[Path] = None) -> Dict[str, Any]:
+        """Validate only what changed in git since the last run
+        
+        Asks git for paths changed, added or renamed between the stored base
+        commit and HEAD, plus the working-tree dirty set (and the dirty set of
+        the previous run, in case those edits were reverted). Only those paths
+        and their parent folders are checked. Results are merged into a
+        persisted violation index, so the cost is proportional to the diff.
+        The first run (or a run after history was rewritten) audits the whole
+        tree to build the index.
+        
+        Args:
+            root: Project root (defaults to the project root)
+        
+        Returns:
+            Dictionary with base/head commits, paths checked, the violations of
+            the checked paths and all violations currently in the index
+        """
+        if root is None:
+            root = find_project_root() or Path.cwd()
+        root = Path(root).resolve()
+        
+        # git prints paths relative to the work tree top level, which is not
+        # root when a subfolder is audited
+        toplevel = _git_toplevel(root)
+        prefix = root.relative_to(toplevel).as_posix() if toplevel and root != toplevel else ''
+        
+        index_path = get_violation_index_path(root, toplevel)
+        index = _load_violation_index(index_path, root, toplevel)
+        head = _git(root, "rev-parse", "HEAD")
+        head = head.strip() if head else None
+        
+        base = index.get("base_commit")
+        changed = None
+        if base and head:
+            changed = _git_changed_paths(root, base, head)
+            if changed is not None:
+                changed = _rebase_paths(changed, prefix)
+        
+        if changed is None:
+            # No usable base: full audit builds the index
+            mode = "full"
+            violations = {}
+            for record in self.validate_tree(root):
+                violations.setdefault(record["path"], []).append(record)
+            dirty = _rebase_paths(_git_dirty_paths(root) or set(), prefix)
+            checked = None
+            index["violations"] = violations
+        else:
+            mode = "incremental"
+            dirty = _rebase_paths(_git_dirty_paths(root) or set(), prefix)
+            paths = changed | dirty | set(index.get("dirty", []))
+            
+            # Parent folders may be new as well
+            folders = set()
+            for path in paths:
+                parts = path.split('/')[:-1]
+                for depth in range(1, len(parts) + 1):
+                    folders.add('/'.join(parts[:depth]))
+            
+            violations = index.get("violations", {})
+            to_check = []
+            for path in sorted(paths | folders):
+                violations.pop(path, None)
+                full_path = root / path
+                if full_path.exists():
+                    to_check.append((path, full_path.is_dir()))
+            
+            records, elapsed_us = _validate_chunk(to_check, self.naming_exceptions, self.extension_map)
+            self.metrics.record("changed_batch", elapsed_us, runs=len(to_check))
+            for record in records:
+                self.metrics.record_violation(record)
+                violations.setdefault(record["path"], []).append(record)
+            checked = [path for path, _ in to_check]
+            index["violations"] = violations
+        
+        index["base_commit"] = head
+        index["dirty"] = sorted(dirty)
+        index["updated"] = datetime.now().isoformat()
+        _save_violation_index(index_path, index)
+        
+        all_violations = [record for records in index["violations"].values() for record in records]
+        if checked is None:
+            changed_violations = all_violations
+        else:
+            changed_violations = [record for path in checked
+                                  for record in index["violations"].get(path, [])]
+        
+        return {
+            "mode": mode,
+            "base_commit": base,
+            "head_commit": head,
+            "checked": checked,
+            "violations": changed_violations,
+            "total_violations": len(all_violations),
+            "index_path": str(index_path)
+        }
+    
     def inject_rules_reminder(self) -> str:
         """Generate a rules reminder to inject into conversation"""
-        active_rules = []
-        
-        # Collect critical rules
-        for rule_set_name, rule_set in self.rules.items():
-            if rule_set.get('priority') == 'critical':
-                active_rules.extend(rule_set.get('rules', []))
+        # Critical rules are collected when the rules are compiled
+        active_rules = self.critical_rules
         
         if not active_rules:
             return ""
@@ -202,20 +672,39 @@ class RuleEnforcer:
         
         return reminder
     
-    def get_statistics(self) -> Dict[str, int]:
-        """Get enforcement statistics"""
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get enforcement statistics
+        
+        Returns:
+            Real counters (checks by type, violations by rule, cache hits),
+            per-check latency histograms and the recent violations buffer
+        """
         return {
             "rules_loaded": len(self.rules),
-            "total_violations": len(self.violations),
-            "checks_performed": len(self.violations) + 100  # Approximate
+            **self.metrics.to_dict()
         }
+    
+    def export_statistics(self, path: Optional[Path] = None) -> Path:
+        """Write statistics as JSON for dashboards
+        
+        Args:
+            path: Output file (defaults to .orchestrator/state/enforcer-stats.json)
+        """
+        import json
+        path = Path(path) if path else get_state_dir() / "enforcer-stats.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.get_statistics(), f, indent=2, default=str)
+        return path
 
 
 def main():
     """Test the rule enforcer"""
-    enforcer = RuleEnforcer()
+    enforcer = RuleEnforcer(verbose=True)
     
     print("🛡️ Rule Enforcer Initialized")
+    if enforcer.loaded_from_snapshot:
+        print("⚡ Rules loaded from compiled snapshot")
     print(f"Rules loaded: {len(enforcer.rules)}")
     
     # Test naming conventions
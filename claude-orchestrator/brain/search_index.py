@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Search Index - Full-text search over handovers, decisions and issues
+
+Keeps an SQLite FTS5 index in .orchestrator/state/search-index.db over:
+- archived handovers (the content-addressed archive plus any plain
+  handover-*.md copies not imported yet) and the current handover-next.md,
+  indexed per '##' section so results point at the relevant part
+- decisions.what_was_decided / reason from the session database
+- issues.issue_description / resolution_attempted
+
+The index is refreshed incrementally before every search: archived
+handovers are immutable and added once, plain files are re-indexed when
+their mtime or size changes, and database rows are appended by id. Each
+table's signature holds a digest of its indexed columns, so a table is
+re-indexed in full when earlier rows were edited or deleted. Results are
+ranked with bm25 (titles weigh more than bodies) and include a snippet.
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from markdown_index import index_text
+from handover_archive import HandoverArchive, LEGACY_NAME_PATTERN
+
+INDEX_VERSION = 3
+SEARCH_KINDS = ("handover", "decision", "issue")
+
+# Column weights for bm25: kind, ref, source, timestamp are unindexed
+TITLE_WEIGHT = 5.0
+BODY_WEIGHT = 1.0
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS documents USING fts5(
+    title, body,
+    kind UNINDEXED, ref UNINDEXED, source UNINDEXED, timestamp UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS sources (
+    source TEXT PRIMARY KEY,
+    signature TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SearchIndex:
+    """Incrementally maintained FTS5 index for one project"""
+
+    def __init__(self, index_path: Path, handover_dir: Path, session_db_path: Path,
+                 archive: Optional[HandoverArchive] = None):
+        """Initialize the search index (the database is opened on first use)
+
+        Args:
+            index_path: FTS5 database file
+            handover_dir: docs/status folder with handover-next.md and archive/
+            session_db_path: Session database with decisions and issues
+            archive: The archive handovers are saved to (shared so new entries
+                are seen; opened from handover_dir/archive if None)
+        """
+        self.index_path = Path(index_path)
+        self.handover_dir = Path(handover_dir)
+        self.archive = archive or HandoverArchive(self.handover_dir / "archive")
+        self.session_db_path = Path(session_db_path)
+        self._conn = None
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.index_path, check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+            if row is None or row[0] != str(INDEX_VERSION):
+                self._reset(self._conn)
+        return self._conn
+
+    @staticmethod
+    def _reset(conn: sqlite3.Connection):
+        with conn:
+            conn.execute("DELETE FROM documents")
+            conn.execute("DELETE FROM sources")
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                         (str(INDEX_VERSION),))
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def rebuild(self) -> Dict[str, int]:
+        """Drop everything and index from scratch"""
+        self._reset(self._get_connection())
+        return self.refresh()
+
+    # -- incremental refresh -------------------------------------------------
+
+    def refresh(self) -> Dict[str, int]:
+        """Bring the index up to date with its sources
+
+        Returns:
+            Number of rows added per kind
+        """
+        conn = self._get_connection()
+        signatures = dict(conn.execute("SELECT source, signature FROM sources"))
+        added = {kind: 0 for kind in SEARCH_KINDS}
+
+        with conn:
+            added["handover"] = self._refresh_handovers(conn, signatures)
+            added["decision"] = self._refresh_table(
+                conn, signatures, "decision",
+                "SELECT decision_id, session_id, timestamp, what_was_decided, reason "
+                "FROM decisions ORDER BY decision_id")
+            added["issue"] = self._refresh_table(
+                conn, signatures, "issue",
+                "SELECT issue_id, session_id, timestamp, issue_description, resolution_attempted "
+                "FROM issues ORDER BY issue_id")
+        return added
+
+    def _set_source(self, conn: sqlite3.Connection, source: str, signature: Any):
+        conn.execute("INSERT OR REPLACE INTO sources (source, signature) VALUES (?, ?)",
+                     (source, json.dumps(signature)))
+
+    def _drop_source(self, conn: sqlite3.Connection, source: str):
+        conn.execute("DELETE FROM documents WHERE source = ?", (source,))
+        conn.execute("DELETE FROM sources WHERE source = ?", (source,))
+
+    def _index_handover(self, conn: sqlite3.Connection, source: str, ref: str,
+                        timestamp: str, content: str) -> int:
+        """Index one handover as one row per top-level section"""
+        index = index_text(content)
+        title = index.frontmatter.get("title") or ref
+        if not isinstance(title, str):
+            title = ref
+
+        rows = []
+        sections = [section for section in index.sections if section.level <= 2]
+        if not sections:
+            rows.append((title, content))
+        else:
+            preamble = '\n'.join(index.lines[:sections[0].line])
+            if preamble.strip():
+                rows.append((title, preamble))
+            for section in sections:
+                # A title heading only covers its own text; '##' sections their subsections
+                body = index.section_text(section, subtree=section.level == 2)
+                rows.append((title if section.title == title else f"{title} › {section.title}", body))
+
+        conn.executemany(
+            "INSERT INTO documents (title, body, kind, ref, source, timestamp) "
+            "VALUES (?, ?, 'handover', ?, ?, ?)",
+            [(row_title, body, ref, source, timestamp) for row_title, body in rows])
+        return len(rows)
+
+    def _refresh_handovers(self, conn: sqlite3.Connection, signatures: Dict[str, str]) -> int:
+        added = 0
+        seen = set()
+
+        # Archive entries are immutable: index each id once
+        for entry in self.archive.entries:
+            source = f"archive:{entry['id']}"
+            seen.add(source)
+            signature = json.dumps(entry["hash"])
+            if signatures.get(source) == signature:
+                continue
+            if source in signatures:
+                self._drop_source(conn, source)
+            content = self.archive.read(entry["id"])
+            if content is not None:
+                added += self._index_handover(conn, source, entry["id"], entry["timestamp"], content)
+                self._set_source(conn, source, entry["hash"])
+
+        # Plain files: handover-next.md and not yet imported archive copies
+        files = [self.handover_dir / "handover-next.md"]
+        archive_dir = self.handover_dir / "archive"
+        if archive_dir.exists():
+            files.extend(sorted(archive_dir.glob("*.md")))
+        for path in files:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            source = f"file:{path.relative_to(self.handover_dir)}"
+            seen.add(source)
+            signature = [stat.st_mtime_ns, stat.st_size]
+            if signatures.get(source) == json.dumps(signature):
+                continue
+            if source in signatures:
+                self._drop_source(conn, source)
+            content = path.read_text(encoding='utf-8', errors='replace')
+            added += self._index_handover(conn, source, path.stem,
+                                          self._file_timestamp(path, stat), content)
+            self._set_source(conn, source, signature)
+
+        # Forget handovers that disappeared (e.g. plain copies after an import)
+        for source in signatures:
+            if (source.startswith("archive:") or source.startswith("file:")) and source not in seen:
+                self._drop_source(conn, source)
+        return added
+
+    @staticmethod
+    def _file_timestamp(path: Path, stat: os.stat_result) -> str:
+        """Timestamp from a handover-(archived-)YYYYmmdd-HHMM.md name, else the mtime
+
+        A checkout gives every file the same mtime, so the name wins.
+        """
+        match = LEGACY_NAME_PATTERN.match(path.name)
+        if match:
+            return match.group(1)
+        from datetime import datetime
+        return datetime.fromtimestamp(stat.st_mtime).strftime("%Y%m%d-%H%M")
+
+    @staticmethod
+    def _rows_digest(rows: List[tuple]) -> str:
+        digest = hashlib.sha1()
+        for row in rows:
+            digest.update(json.dumps(row).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _refresh_table(self, conn: sqlite3.Connection, signatures: Dict[str, str], kind: str,
+                       rows_query: str) -> int:
+        """Append new rows of decisions/issues, re-indexing if earlier rows changed
+
+        The signature is [row count, max id, digest of the indexed columns];
+        new rows are only appended when the rows up to the previous max id
+        still have the previous digest.
+        """
+        source = f"db:{kind}"
+        if not self.session_db_path.exists():
+            if source in signatures:
+                self._drop_source(conn, source)
+            return 0
+
+        try:
+            db = sqlite3.connect(f"file:{self.session_db_path}?mode=ro", uri=True)
+        except sqlite3.Error:
+            return 0
+        try:
+            rows = db.execute(rows_query).fetchall()
+        except sqlite3.Error:
+            # Table missing in an older database
+            return 0
+        finally:
+            db.close()
+
+        signature = [len(rows), rows[-1][0] if rows else 0, self._rows_digest(rows)]
+        previous = json.loads(signatures[source]) if source in signatures else None
+        if previous == signature:
+            return 0
+
+        if previous is not None:
+            previous_count, previous_max, previous_digest = previous
+            earlier = [row for row in rows if row[0] <= previous_max]
+            if len(earlier) == previous_count and self._rows_digest(earlier) == previous_digest:
+                rows = rows[len(earlier):]
+            else:
+                self._drop_source(conn, source)
+
+        conn.executemany(
+            "INSERT INTO documents (title, body, kind, ref, source, timestamp) VALUES (?, ?, ?, ?, ?, ?)",
+            [(text or "", reason or "", kind, f"{kind}-{row_id} ({session_id or 'no session'})",
+              source, str(timestamp or "")) for row_id, session_id, timestamp, text, reason in rows])
+        self._set_source(conn, source, signature)
+        return len(rows)
+
+    # -- queries ---------------------------------------------------------------
+
+    def search(self, query: str, kinds: Optional[Iterable[str]] = None, limit: int = 10,
+               refresh: bool = True) -> List[Dict[str, Any]]:
+        """Ranked full-text search
+
+        Args:
+            query: FTS5 query; plain words are matched as all-of, and queries
+                that are not valid FTS5 syntax are searched as quoted terms
+            kinds: Restrict to some of SEARCH_KINDS
+            limit: Maximum number of results
+            refresh: Update the index from its sources first
+
+        Returns:
+            [{"kind", "ref", "title", "timestamp", "snippet", "score"}]
+            best match first
+        """
+        if refresh:
+            self.refresh()
+        conn = self._get_connection()
+
+        sql = (f"SELECT kind, ref, title, timestamp, "
+               f"snippet(documents, -1, '[', ']', '…', 16), "
+               f"bm25(documents, {TITLE_WEIGHT}, {BODY_WEIGHT}) AS score "
+               f"FROM documents WHERE documents MATCH ?")
+        params: List[Any] = []
+        kinds = [kind for kind in (kinds or []) if kind in SEARCH_KINDS]
+        if kinds:
+            sql += f" AND kind IN ({','.join('?' * len(kinds))})"
+            params.extend(kinds)
+        sql += " ORDER BY score LIMIT ?"
+
+        try:
+            rows = conn.execute(sql, [query] + params + [limit]).fetchall()
+        except sqlite3.OperationalError:
+            rows = conn.execute(sql, [self._quote(query)] + params + [limit]).fetchall()
+
+        return [{"kind": kind, "ref": ref, "title": title, "timestamp": timestamp,
+                 "snippet": snippet, "score": round(score, 3)}
+                for kind, ref, title, timestamp, snippet, score in rows]
+
+    @staticmethod
+    def _quote(query: str) -> str:
+        """Turn arbitrary text into a query of quoted terms"""
+        terms = [term.replace('"', '""') for term in query.split()]
+        return ' '.join(f'"{term}"' for term in terms if term) or '""'
+
+    def get_statistics(self) -> Dict[str, Any]:
+        conn = self._get_connection()
+        counts = dict(conn.execute("SELECT kind, COUNT(*) FROM documents GROUP BY kind"))
+        return {"index_path": str(self.index_path), "rows": counts,
+                "sources": conn.execute("SELECT COUNT(*) FROM sources").fetchone()[0]}
@@ -18,6 +18,7 @@ from typing import Dict, List, Optional, Tuple, Any
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 from utils import find_project_root, find_orchestrate_py
+from decision_store import DecisionStore
 
 class SessionEndManager:
     """Session end coordinator with decision tracking for agent communication"""
@@ -33,6 +34,7 @@ class SessionEndManager:
         self.db_path = self.orchestrator_root / "short-term-memory" / "session_state.db"
         self.reports_dir = self.project_root / "docs" / "status" / "session-reports"
         self.reports_dir.mkdir(parents=True, exist_ok=True)
+        self.decision_store = DecisionStore(self.db_path)
         
     def get_task_documents_path(self) -> str:
         """Return path to task documents for agent execution"""
@@ -116,7 +118,10 @@ class SessionEndManager:
     
     def save_decisions(self, task_name: str, session_id: str, decisions: Dict) -> Tuple[bool, str]:
         """
-        Save user decisions for a task to a JSON file
+        Save user decisions for a task
+        
+        The decisions are stored in the session database; the JSON file is
+        exported from there for the fix-mode agent, which reads it.
         
         Args:
             task_name: Name of the task (e.g., 'unreferenced_documents_check')
@@ -138,25 +143,42 @@ class SessionEndManager:
                 **decisions
             }
             
+            self.decision_store.save(task_name, session_id, decisions_data)
             with open(decisions_file, 'w') as f:
-                json.dump(decisions_data, f, indent=2)
+                json.dump(self.decision_store.export(task_name, session_id), f, indent=2)
             
             return True, str(decisions_file)
         except Exception as e:
             return False, f"Failed to save decisions: {e}"
     
     def load_decisions(self, task_name: str, session_id: str) -> Optional[Dict]:
-        """Load decisions for a task"""
+        """Load decisions for a task (from the database, or an older JSON file)"""
         try:
+            decisions = self.decision_store.export(task_name, session_id)
+            if decisions is not None:
+                return decisions
+            
+            # Written before the decision store existed: store it on first read
             decisions_file = self.reports_dir / f"decisions_{task_name}_{session_id}.json"
             if decisions_file.exists():
                 with open(decisions_file, 'r') as f:
-                    return json.load(f)
+                    decisions = json.load(f)
+                self.decision_store.save(decisions.get("task") or task_name,
+                                         decisions.get("session_id") or session_id, decisions)
+                return decisions
             return None
         except Exception as e:
             print(f"Error loading decisions: {e}")
             return None
     
+    def query_decisions(self, **filters) -> List[Dict]:
+        """Decision items across sessions (see DecisionStore.query for filters)"""
+        return self.decision_store.query(**filters)
+    
+    def import_decision_files(self) -> Dict[str, int]:
+        """Store decisions_*.json files from the reports directory in the database"""
+        return self.decision_store.import_json_files(self.reports_dir)
+    
     def prompt_for_agent_execution(self) -> Dict:
         """Return information the orchestrator needs to launch agents"""
         return {
@@ -170,7 +192,7 @@ To execute maintenance tasks:
 1. Use Task tool to launch maintenance-agent with each task document
 2. Agents will analyze and create reports  
 3. Review reports and present findings to user
-4. Save decisions to JSON file in session-reports/
+4. Save decisions (stored in the session database, exported to session-reports/)
 5. Launch fix-mode agent with decisions file
 6. Report what was done
 
@@ -230,6 +252,13 @@ def save_task_decisions(task_name: str, session_id: str, decisions_json: str):
         print(f"❌ Invalid JSON: {e}")
         return False
 
+def query_task_decisions(task_name: str, action: Optional[str] = None, status: Optional[str] = None):
+    """Show decision items of a task across sessions"""
+    manager = SessionEndManager()
+    decisions = manager.query_decisions(task=task_name, action=action, status=status)
+    print(json.dumps(decisions, indent=2))
+    return decisions
+
 def load_task_decisions(task_name: str, session_id: str):
     """Load and display decisions for a task"""
     manager = SessionEndManager()
@@ -268,9 +297,18 @@ if __name__ == "__main__":
                 load_task_decisions(task_name, session_id)
             else:
                 print("Usage: load-decisions <task_name> <session_id>")
+        elif command == "query-decisions":
+            if len(sys.argv) >= 3:
+                query_task_decisions(sys.argv[2], *sys.argv[3:5])
+            else:
+                print("Usage: query-decisions <task_name> [action] [status]")
+        elif command == "import-decisions":
+            stats = SessionEndManager().import_decision_files()
+            print(f"✅ Imported {stats['imported']} decision files ({stats['skipped']} skipped)")
         else:
             print(f"Unknown command: {command}")
-            print("Available: context, savepoint, git-status, save-decisions, load-decisions")
+            print("Available: context, savepoint, git-status, save-decisions, load-decisions, "
+                  "query-decisions, import-decisions")
     else:
         print("Session End Manager")
         print("Usage: python session-end-manager.py [command]")
@@ -278,5 +316,7 @@ if __name__ == "__main__":
         print("  context         - Get session end context for agents")
         print("  savepoint       - Create database savepoint")
         print("  git-status      - Show git status")
-        print("  save-decisions  - Save task decisions to JSON file")
-        print("  load-decisions  - Load task decisions from JSON file")
\ No newline at end of file
+        print("  save-decisions  - Save task decisions (database + JSON export)")
+        print("  load-decisions  - Load task decisions")
+        print("  query-decisions - Decisions of a task across sessions")
+        print("  import-decisions - Store older decision JSON files in the database")
\ No newline at end of file
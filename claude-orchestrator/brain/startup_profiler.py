@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Startup Profiler - Per-import and per-phase timing for orchestrate.py
+
+Hooks call orchestrate.py constantly, so cold-start time is the biggest
+latency cost. Running any command with --profile-startup installs this
+profiler before the remaining imports and prints a timing table to stderr
+when the command finishes.
+
+Import timing is measured by wrapping the loaders returned by the other
+meta path finders, so only modules actually executed (not already cached
+in sys.modules) are reported. Times are reported both inclusive of nested
+imports and as self time.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+
+
+class _TimedLoader:
+    """Loader proxy that times exec_module of the wrapped loader"""
+
+    def __init__(self, loader, name, profiler):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        profiler = self._profiler
+        profiler._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = profiler._stack.pop()
+            if profiler._stack:
+                profiler._stack[-1] += elapsed
+            profiler.imports.append((self._name, elapsed, elapsed - nested))
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+
+class _TimingFinder:
+    """Meta path finder that delegates to the real finders and wraps their loaders"""
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, fullname, self._profiler)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    """Collects import and phase timings for one orchestrate.py run"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.imports = []  # (module, inclusive seconds, self seconds)
+        self.phases = []   # (phase, seconds)
+        self._stack = []
+        self._finder = _TimingFinder(self)
+
+    def install(self):
+        """Start timing imports"""
+        sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        """Stop timing imports"""
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a named startup phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def report(self, limit: int = 25) -> str:
+        """Format the timing table"""
+        total = time.perf_counter() - self.started
+        lines = []
+        lines.append("⏱️ Startup Profile")
+        lines.append("=" * 60)
+        lines.append(f"{'Phase':<40}{'ms':>10}")
+        lines.append("-" * 60)
+        for name, seconds in self.phases:
+            lines.append(f"{name:<40}{seconds * 1000:>10.2f}")
+        lines.append(f"{'total (since profiler start)':<40}{total * 1000:>10.2f}")
+
+        if self.imports:
+            lines.append("")
+            lines.append(f"{'Import':<40}{'self ms':>10}{'cum ms':>10}")
+            lines.append("-" * 60)
+            by_cost = sorted(self.imports, key=lambda item: item[1], reverse=True)
+            for name, inclusive, own in by_cost[:limit]:
+                lines.append(f"{name[:39]:<40}{own * 1000:>10.2f}{inclusive * 1000:>10.2f}")
+            if len(by_cost) > limit:
+                lines.append(f"... {len(by_cost) - limit} more modules")
+            lines.append(f"{len(self.imports)} modules imported, "
+                         f"{sum(own for _, _, own in self.imports) * 1000:.2f} ms total")
+
+        lines.append("=" * 60)
+        return "\n".join(lines)
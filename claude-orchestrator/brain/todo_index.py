@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+TODO Index - Parsed, cached view of docs/status/todo.md
+
+Parses the TODO list into checkbox items with their section (the heading
+path above them), state, nesting and line number, and answers queries
+(by section, by state, top-N) so handover generation, progress checks and
+dashboards all read the same structure instead of scanning lines.
+
+The index is cached per process and in .orchestrator/state/todo-index.json,
+keyed by the file's mtime and size. When the file changes it is updated
+section by section: sections whose text hash is unchanged keep their parsed
+items (only their line numbers are shifted), only edited sections are
+parsed again.
+
+Checkbox states: '[ ]' open, '[x]' done, '[~]' / '[-]' in progress.
+"""
+
+import os
+import re
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from markdown_index import index_text
+
+INDEX_VERSION = 1
+TODO_STATES = ("open", "in_progress", "done")
+
+ITEM_PATTERN = re.compile(r'^(\s*)[-*+]\s+\[([ xX~-])\]\s*(.*)$')
+STATE_BY_MARK = {' ': "open", 'x': "done", 'X': "done", '~': "in_progress", '-': "in_progress"}
+
+_memory_cache: Dict[str, "TodoIndex"] = {}
+
+
+class TodoItem:
+    """One checkbox item"""
+
+    __slots__ = ('text', 'state', 'line', 'depth', 'parent', 'section')
+
+    def __init__(self, text: str, state: str, line: int, depth: int,
+                 parent: Optional[int], section: List[str]):
+        self.text = text
+        self.state = state
+        self.line = line            # 1-based line number in the file
+        self.depth = depth          # 0 for top-level items, 1 for sub-items, ...
+        self.parent = parent        # line of the parent item, if nested
+        self.section = section      # heading titles from the top down
+
+    @property
+    def done(self) -> bool:
+        return self.state == "done"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], line_shift: int = 0) -> "TodoItem":
+        parent = data["parent"] + line_shift if data["parent"] is not None else None
+        return cls(data["text"], data["state"], data["line"] + line_shift,
+                   data["depth"], parent, list(data["section"]))
+
+    def __repr__(self):
+        return f"TodoItem({self.state}, {self.text[:40]!r}, line={self.line})"
+
+
+def _parse_block(lines: List[str], first_line: int, section: List[str]) -> List[TodoItem]:
+    """Parse the checkbox items of one section body
+
+    Args:
+        lines: Body lines of the section
+        first_line: 1-based file line number of lines[0]
+        section: Heading path of the section
+    """
+    items = []
+    stack: List[tuple] = []  # (indent, item)
+    for offset, line in enumerate(lines):
+        match = ITEM_PATTERN.match(line)
+        if not match:
+            continue
+        indent = len(match.group(1).expandtabs(4))
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+        parent = stack[-1][1] if stack else None
+        item = TodoItem(match.group(3).strip(), STATE_BY_MARK[match.group(2)], first_line + offset,
+                        len(stack), parent.line if parent else None, section)
+        stack.append((indent, item))
+        items.append(item)
+    return items
+
+
+class TodoIndex:
+    """All checkbox items of one TODO file"""
+
+    def __init__(self, path: Path, signature: Optional[List[int]], blocks: List[Dict[str, Any]],
+                 parsed_blocks: int = 0, reused_blocks: int = 0):
+        self.path = Path(path)
+        self.signature = signature
+        self.blocks = blocks  # [{"section", "hash", "first_line", "items": [TodoItem]}]
+        self.items: List[TodoItem] = [item for block in blocks for item in block["items"]]
+        self.parsed_blocks = parsed_blocks
+        self.reused_blocks = reused_blocks
+
+    @classmethod
+    def parse(cls, path: Path, text: str, signature: Optional[List[int]] = None,
+              previous: Optional["TodoIndex"] = None) -> "TodoIndex":
+        """Index text, reusing unchanged sections of a previous index"""
+        document = index_text(text)
+        reusable: Dict[tuple, List[Dict[str, Any]]] = {}
+        if previous is not None:
+            for block in previous.blocks:
+                reusable.setdefault((tuple(block["section"]), block["hash"]), []).append(block)
+
+        # (heading path, body line range) per section, plus text before the first heading
+        ranges = []
+        first_heading = document.sections[0].line if document.sections else len(document.lines)
+        ranges.append(([], 0, first_heading))
+        for section in document.sections:
+            path_titles = []
+            node = section
+            while node is not None:
+                path_titles.insert(0, node.title)
+                node = node.parent
+            ranges.append((path_titles, section.line + 1, section.end_line))
+
+        blocks, parsed, reused = [], 0, 0
+        for titles, start, end in ranges:
+            lines = document.lines[start:end]
+            digest = hashlib.sha1('\n'.join(lines).encode('utf-8')).hexdigest()
+            candidates = reusable.get((tuple(titles), digest))
+            if candidates:
+                old = candidates.pop(0)
+                shift = start + 1 - old["first_line"]
+                items = [TodoItem.from_dict(item.to_dict(), shift) for item in old["items"]]
+                reused += 1
+            else:
+                items = _parse_block(lines, start + 1, titles)
+                parsed += 1
+            blocks.append({"section": titles, "hash": digest, "first_line": start + 1, "items": items})
+
+        return cls(path, signature, blocks, parsed, reused)
+
+    def query(self, section: Optional[str] = None, state: Optional[str] = None,
+              limit: Optional[int] = None, max_depth: Optional[int] = None) -> List[TodoItem]:
+        """Items in file order
+
+        Args:
+            section: Only items below a heading whose title contains this text
+            state: "open", "in_progress" or "done"
+            limit: Return at most this many items (top-N)
+            max_depth: Skip items nested deeper (0 = top-level items only)
+        """
+        results = []
+        for item in self.items:
+            if state is not None and item.state != state:
+                continue
+            if max_depth is not None and item.depth > max_depth:
+                continue
+            if section is not None and not any(section in title for title in item.section):
+                continue
+            results.append(item)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def sections(self) -> List[List[str]]:
+        """Heading paths of sections that contain items"""
+        return [block["section"] for block in self.blocks if block["items"]]
+
+    def counts(self, section: Optional[str] = None) -> Dict[str, int]:
+        """Number of items per state (and in total)"""
+        counts = dict.fromkeys(TODO_STATES, 0)
+        for item in self.query(section=section):
+            counts[item.state] += 1
+        counts["total"] = sum(counts.values())
+        return counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "path": str(self.path),
+            "signature": self.signature,
+            "blocks": [{**block, "items": [item.to_dict() for item in block["items"]]}
+                       for block in self.blocks]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TodoIndex":
+        blocks = [{**block, "items": [TodoItem.from_dict(item) for item in block["items"]]}
+                  for block in data["blocks"]]
+        return cls(Path(data["path"]), data["signature"], blocks)
+
+
+def _cache_path(path: Path) -> Path:
+    from utils import get_state_dir
+    digest = hashlib.sha1(str(Path(path).resolve()).encode()).hexdigest()[:12]
+    return get_state_dir() / f"todo-index-{digest}.json"
+
+
+def _load_persisted(path: Path) -> Optional[TodoIndex]:
+    try:
+        with open(_cache_path(path), 'r') as f:
+            data = json.load(f)
+        if data.get("version") == INDEX_VERSION:
+            return TodoIndex.from_dict(data)
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    return None
+
+
+def _save_persisted(index: TodoIndex):
+    cache_path = _cache_path(index.path)
+    try:
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(index.to_dict(), f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def load_todo_index(path: Path, persist: bool = True) -> Optional[TodoIndex]:
+    """Return the index of a TODO file, parsing only what changed
+
+    Args:
+        path: TODO Markdown file
+        persist: Use the on-disk cache in .orchestrator/state/ as well
+
+    Returns:
+        TodoIndex, or None if the file does not exist
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    signature = [stat.st_mtime_ns, stat.st_size]
+
+    key = str(path)
+    cached = _memory_cache.get(key)
+    if cached is None and persist:
+        cached = _load_persisted(path)
+    if cached is not None and cached.signature == signature:
+        _memory_cache[key] = cached
+        return cached
+
+    try:
+        text = path.read_text(encoding='utf-8', errors='replace')
+    except OSError:
+        return None
+    index = TodoIndex.parse(path, text, signature, previous=cached)
+    _memory_cache[key] = index
+    if persist:
+        _save_persisted(index)
+    return index
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Tree Walker - Fast project traversal that honours .gitignore
+
+Walks a project with os.scandir (one directory read per folder, no extra
+stat calls for type checks) and skips everything git would ignore. Nested
+.gitignore files are picked up as the walk descends, and ignored folders
+are pruned without being read.
+
+Supported .gitignore syntax: comments, blank lines, negation (!), folder-only
+patterns (trailing /), anchored patterns (leading or inner /), *, ?, [...]
+and ** wildcards. This covers what projects in practice use; it is not a
+byte-for-byte reimplementation of git's matcher.
+"""
+
+import os
+import re
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+# Never descend into these, whatever .gitignore says
+ALWAYS_SKIP = frozenset({'.git'})
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob (without anchors/flags) into a regex body"""
+    regex = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '*':
+            if pattern[i:i + 2] == '**':
+                # '**/' matches zero or more folders, a trailing '**' everything
+                if pattern[i + 2:i + 3] == '/':
+                    regex.append('(?:.*/)?')
+                    i += 3
+                    continue
+                regex.append('.*')
+                i += 2
+                continue
+            regex.append('[^/]*')
+        elif char == '?':
+            regex.append('[^/]')
+        elif char == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                regex.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                regex.append(f'[{body}]')
+                i = end
+        elif char == '\\' and i + 1 < len(pattern):
+            i += 1
+            regex.append(re.escape(pattern[i]))
+        else:
+            regex.append(re.escape(char))
+        i += 1
+    return ''.join(regex)
+
+
+class GitIgnore:
+    """Compiled rules from one .gitignore file
+
+    Paths are matched relative to the folder holding the .gitignore file.
+    """
+
+    def __init__(self, base: str, lines: List[str]):
+        self.base = base  # relative folder of the .gitignore ('' for root)
+        self.rules: List[Tuple[re.Pattern, bool, bool]] = []  # (regex, negated, dir_only)
+
+        for line in lines:
+            line = line.rstrip('\n')
+            if not line.strip() or line.startswith('#'):
+                continue
+            line = line.rstrip()
+            negated = line.startswith('!')
+            if negated:
+                line = line[1:]
+            dir_only = line.endswith('/')
+            line = line.rstrip('/')
+            if not line:
+                continue
+
+            anchored = '/' in line
+            line = line.lstrip('/')
+            body = _translate(line)
+            if anchored:
+                regex = re.compile(f'^{body}$')
+            else:
+                regex = re.compile(f'^(?:.*/)?{body}$')
+            self.rules.append((regex, negated, dir_only))
+
+    @classmethod
+    def from_file(cls, path: Path, base: str = '') -> Optional['GitIgnore']:
+        try:
+            with open(path, 'r', errors='replace') as f:
+                return cls(base, f.readlines())
+        except OSError:
+            return None
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """Return True (ignored), False (re-included) or None (no rule applies)
+
+        Args:
+            rel_path: Path relative to the project root, using '/'
+            is_dir: Whether the path is a folder
+        """
+        if self.base:
+            if not rel_path.startswith(self.base + '/'):
+                return None
+            rel_path = rel_path[len(self.base) + 1:]
+
+        result = None
+        for regex, negated, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negated
+        return result
+
+
+def is_ignored(rel_path: str, is_dir: bool, ignores: List[GitIgnore]) -> bool:
+    """Apply a stack of .gitignore files, deeper files taking precedence"""
+    ignored = False
+    for gitignore in ignores:
+        result = gitignore.match(rel_path, is_dir)
+        if result is not None:
+            ignored = result
+    return ignored
+
+
+def _ancestor_ignores(root: Path, start: str) -> Optional[List[GitIgnore]]:
+    """Load the .gitignore files above start (root included)
+
+    Returns:
+        The ignore stack for start, or None if start itself is ignored
+    """
+    ignores = []
+    rel_dir = ''
+    for part in start.split('/'):
+        gitignore = GitIgnore.from_file(root / rel_dir / '.gitignore', rel_dir)
+        if gitignore and gitignore.rules:
+            ignores.append(gitignore)
+        rel_dir = f'{rel_dir}/{part}' if rel_dir else part
+        if part in ALWAYS_SKIP or is_ignored(rel_dir, True, ignores):
+            return None
+    return ignores
+
+
+def walk_tree(root: Path, include_dirs: bool = True, honour_gitignore: bool = True,
+              start: str = '', recursive: bool = True) -> Iterator[Tuple[str, bool]]:
+    """Yield (relative path, is_dir) for everything git would not ignore
+
+    Args:
+        root: Folder to walk
+        include_dirs: Also yield folders (not only files)
+        honour_gitignore: Apply .gitignore files found during the walk
+        start: Only walk this folder (relative to root); .gitignore files
+            above it still apply and paths stay relative to root
+        recursive: Descend into subfolders (False lists start only)
+    """
+    root = Path(root)
+    start = start.strip('/')
+    ignores = []
+    if start and honour_gitignore:
+        ignores = _ancestor_ignores(root, start)
+        if ignores is None:
+            return
+    stack = [(start, ignores)]
+
+    while stack:
+        rel_dir, ignores = stack.pop()
+        abs_dir = os.path.join(root, rel_dir) if rel_dir else str(root)
+
+        if honour_gitignore:
+            gitignore = GitIgnore.from_file(Path(abs_dir) / '.gitignore', rel_dir)
+            if gitignore and gitignore.rules:
+                ignores = ignores + [gitignore]
+
+        try:
+            with os.scandir(abs_dir) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            if entry.name in ALWAYS_SKIP:
+                continue
+            rel_path = f'{rel_dir}/{entry.name}' if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+
+            if honour_gitignore and is_ignored(rel_path, is_dir, ignores):
+                continue
+
+            if is_dir:
+                subdirs.append(rel_path)
+                if include_dirs:
+                    yield rel_path, True
+            else:
+                yield rel_path, False
+
+        if not recursive:
+            break
+
+        # Reverse so folders are visited in name order
+        for rel_path in reversed(subdirs):
+            stack.append((rel_path, ignores))
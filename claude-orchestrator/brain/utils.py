@@ -4,18 +4,142 @@ Utility functions for the Claude Orchestrator
 """
 
 import os
+import sys
 from pathlib import Path
 from typing import Optional
 
-def find_project_root(start_path: Optional[Path] = None) -> Optional[Path]:
+# Modules whose file names are not valid Python identifiers, mapped to their
+# location relative to the claude-orchestrator directory
+ALIASED_MODULES = {
+    'handover_manager': 'brain/handover-manager.py',
+    'session_end_manager': 'brain/session-end-manager.py',
+    'rule_injection_hook': 'resource-library/hooks/rule-injection.py',
+}
+
+
+class AliasedModuleFinder:
+    """
+    Import hook that makes hyphenated modules importable under an alias.
+    
+    'import handover_manager' then goes through the normal import system:
+    the module is cached in sys.modules and its bytecode in __pycache__.
+    """
+    
+    def find_spec(self, fullname, path=None, target=None):
+        relative_path = ALIASED_MODULES.get(fullname)
+        if relative_path is None:
+            return None
+        import importlib.util
+        orchestrator_dir = Path(__file__).resolve().parent.parent
+        return importlib.util.spec_from_file_location(fullname, orchestrator_dir / relative_path)
+
+
+def install_module_aliases():
+    """Register the AliasedModuleFinder once per process"""
+    if not any(isinstance(finder, AliasedModuleFinder) for finder in sys.meta_path):
+        sys.meta_path.append(AliasedModuleFinder())
+
+
+# Entries whose presence marks a project root. CLAUDE.md alone is not enough:
+# a directory holding only CLAUDE.md is skipped and the search continues upward.
+ROOT_MARKERS = frozenset({'.gitignore', '.git', 'claude-orchestrator'})
+
+ROOT_CACHE_FILE = 'project-roots.json'
+ROOT_CACHE_LIMIT = 64  # entries kept in the on-disk cache
+
+# Per-process memo: start directory -> project root (or None)
+_root_memo = {}
+
+# Resolution counters, see get_root_resolution_stats()
+_root_stats = {
+    'calls': 0,
+    'memory_hits': 0,
+    'disk_hits': 0,
+    'scans': 0,
+    'fs_calls': 0,
+    'last': None,
+}
+
+
+def _scan_for_root(start_path: Path, counter: dict) -> tuple:
+    """
+    Walk upward from start_path with one scandir per level.
+    
+    Returns:
+        (root or None, [(directory, mtime_ns), ...] for every directory read)
+    """
+    visited = []
+    current = start_path
+    
+    while current != current.parent:
+        try:
+            counter['fs_calls'] += 1
+            with os.scandir(current) as entries:
+                names = {entry.name for entry in entries}
+            counter['fs_calls'] += 1
+            visited.append((str(current), os.stat(current).st_mtime_ns))
+        except OSError:
+            names = set()
+        
+        if names & ROOT_MARKERS:
+            return current, visited
+        current = current.parent
+    
+    return None, visited
+
+
+def _load_root_cache() -> dict:
+    import json
+    try:
+        with open(get_state_dir() / ROOT_CACHE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_root_cache(cache: dict):
+    import json
+    # Keep the most recently written entries only
+    if len(cache) > ROOT_CACHE_LIMIT:
+        for key in list(cache)[:len(cache) - ROOT_CACHE_LIMIT]:
+            del cache[key]
+    try:
+        cache_path = get_state_dir() / ROOT_CACHE_FILE
+        tmp_path = cache_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def _disk_cache_entry_valid(entry: dict, counter: dict) -> bool:
+    """A cached root is valid while none of the scanned directories changed"""
+    for directory, mtime_ns in entry.get('visited', []):
+        try:
+            counter['fs_calls'] += 1
+            if os.stat(directory).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def find_project_root(start_path: Optional[Path] = None, use_disk_cache: bool = True) -> Optional[Path]:
     """
     Find the project root by looking for .gitignore or other project markers.
     
     This function searches upward from the start path to find the project root,
     which is identified by the presence of certain marker files.
     
+    Results are memoized per process. Across processes, results are kept in
+    .orchestrator/state/project-roots.json keyed by start directory and are
+    reused while the mtimes of all directories that were scanned are unchanged
+    (adding or removing a marker changes its directory's mtime).
+    
     Args:
         start_path: Starting directory to search from (defaults to current working directory)
+        use_disk_cache: Consult and update the on-disk cache
     
     Returns:
         Path to project root if found, None otherwise
@@ -25,41 +149,71 @@ def find_project_root(start_path: Optional[Path] = None) -> Optional[Path]:
     else:
         start_path = Path(start_path).resolve()
     
-    # Marker files that indicate project root
-    markers = [
-        '.gitignore',
-        '.git',
-        'claude-orchestrator',  # Our tool folder
-        'CLAUDE.md'  # Project-specific Claude rules
-    ]
+    key = str(start_path)
+    counter = {'fs_calls': 0}
+    _root_stats['calls'] += 1
     
-    current = start_path
+    if key in _root_memo:
+        _root_stats['memory_hits'] += 1
+        _root_stats['last'] = {'start': key, 'source': 'memory', 'fs_calls': 0}
+        return _root_memo[key]
     
-    # Search upward for project root
-    while current != current.parent:
-        for marker in markers:
-            if (current / marker).exists():
-                # Verify this is the right project by checking for claude-orchestrator
-                if (current / 'claude-orchestrator').exists():
-                    return current
-                # If we found .git or .gitignore but no orchestrator, keep looking
-                elif marker in ['.gitignore', '.git']:
-                    # This might be the project root even without orchestrator
-                    return current
-        current = current.parent
+    source = 'scan'
+    root = None
+    cache = _load_root_cache() if use_disk_cache else {}
+    entry = cache.get(key)
     
-    # If we couldn't find it by searching up, try some common locations
-    # This helps when running from inside nested directories
-    common_paths = [
-        Path.home() / 'game-projects' / 'claude-orchestrate',
-        Path('/home/klaus/game-projects/claude-orchestrate'),
-    ]
+    if entry and _disk_cache_entry_valid(entry, counter):
+        source = 'disk'
+        root = Path(entry['root']) if entry['root'] else None
+    else:
+        root, visited = _scan_for_root(start_path, counter)
+        
+        if root is None:
+            # If we couldn't find it by searching up, try some common locations
+            # This helps when running from inside nested directories
+            common_paths = [
+                Path.home() / 'game-projects' / 'claude-orchestrate',
+                Path('/home/klaus/game-projects/claude-orchestrate'),
+            ]
+            
+            for path in common_paths:
+                counter['fs_calls'] += 1
+                if (path / 'claude-orchestrator').exists():
+                    root = path
+                    break
+        
+        if use_disk_cache:
+            cache.pop(key, None)
+            cache[key] = {'root': str(root) if root else None, 'visited': visited}
+            _save_root_cache(cache)
     
-    for path in common_paths:
-        if path.exists() and (path / 'claude-orchestrator').exists():
-            return path
+    _root_memo[key] = root
+    _root_stats['disk_hits' if source == 'disk' else 'scans'] += 1
+    _root_stats['fs_calls'] += counter['fs_calls']
+    _root_stats['last'] = {'start': key, 'source': source, 'fs_calls': counter['fs_calls']}
+    return root
+
+
+def clear_project_root_cache(disk: bool = False):
+    """Forget memoized project roots (and optionally the on-disk cache)"""
+    _root_memo.clear()
+    if disk:
+        try:
+            (get_state_dir() / ROOT_CACHE_FILE).unlink()
+        except OSError:
+            pass
+
+
+def get_root_resolution_stats() -> dict:
+    """
+    Get project root resolution counters for this process.
     
-    return None
+    Returns:
+        Dictionary with call/hit/scan counts, the total number of filesystem
+        calls (scandir and stat) spent, and the cost of the last resolution
+    """
+    return dict(_root_stats)
 
 
 def find_orchestrate_py() -> Optional[Path]:
@@ -139,6 +293,22 @@ def ensure_in_orchestrator_dir() -> Path:
     return orchestrator_dir
 
 
+def get_state_dir() -> Path:
+    """
+    Get the operational state directory for this orchestrator install.
+
+    This is the git-ignored .orchestrator/state/ folder next to the
+    claude-orchestrator directory (the same one setup.sh creates). It is
+    derived from this file's location so no filesystem search is needed.
+
+    Returns:
+        Path to the state directory (created if missing)
+    """
+    state_dir = Path(__file__).resolve().parent.parent.parent / '.orchestrator' / 'state'
+    state_dir.mkdir(parents=True, exist_ok=True)
+    return state_dir
+
+
 # Example usage in other modules:
 # from brain.utils import find_project_root, get_relative_path_command
 # 
@@ -3,446 +3,1316 @@
 Claude Orchestrator - Main Entry Point
 
 A portable orchestration system for managing LLM development.
+
+Commands are kept in a registry (COMMANDS). Each command's arguments are only
+added to the parser when that command is dispatched (or help is requested),
+and its implementation modules are only imported inside its handler, so
+hooks calling this entry point pay for nothing they do not use.
+Run any command with --profile-startup to see where startup time goes.
 """
 
 import os
 import sys
+
+# Add tools and brain directories to path
+_ORCHESTRATOR_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(_ORCHESTRATOR_DIR, "tools"))
+sys.path.insert(0, os.path.join(_ORCHESTRATOR_DIR, "brain"))
+
+# Install the profiler before anything else is imported so it sees every import
+if "--profile-startup" in sys.argv[1:]:
+    from startup_profiler import StartupProfiler
+    PROFILER = StartupProfiler()
+    PROFILER.install()
+else:
+    PROFILER = None
+
 import argparse
+from collections import namedtuple
+from contextlib import nullcontext
 from pathlib import Path
 
-# Add tools directory to path
-sys.path.insert(0, str(Path(__file__).parent / "tools"))
+from utils import install_module_aliases
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Claude Orchestrator - Manage LLM development context and workflows"
-    )
+# Makes hyphenated modules importable, e.g. 'import handover_manager'
+install_module_aliases()
+
+# Long-lived objects reused across commands when running inside the daemon,
+# keyed by (kind, working directory)
+_instances = {}
+
+
+def _get_instance(kind, factory, refresh=None):
+    """Return a cached instance for the current working directory
     
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+    Args:
+        kind: Name of the cached object
+        factory: Callable creating the object on first use
+        refresh: Optional callable run on the object when it is reused
+    """
+    key = (kind, os.getcwd())
+    if key in _instances:
+        instance = _instances[key]
+        if refresh:
+            refresh(instance)
+        return instance
+    instance = _instances[key] = factory()
+    return instance
+
+
+def _get_handover_manager():
+    import handover_manager
+    return _get_instance("handover_manager", handover_manager.HandoverManager)
+
+
+def _phase(name):
+    """Time a startup phase when --profile-startup is active"""
+    return PROFILER.phase(name) if PROFILER else nullcontext()
+
+
+# ---------------------------------------------------------------------------
+# Command implementations
+# ---------------------------------------------------------------------------
+
+def cmd_start(args):
+    print("🚀 Starting Claude Orchestrator monitoring...")
+    from context_guardian import interactive_mode
+    interactive_mode()
+
+
+def cmd_status(args):
+    print("📊 Claude Orchestrator Status")
+    print("=" * 40)
+    from context_guardian import ContextMonitor
+    monitor = _get_instance("context_monitor", ContextMonitor,
+                            refresh=lambda m: m.load_state())
+    status = monitor.get_status()
+    print(f"Context: {status['status']}")
+    print(f"Tokens: {status['current_tokens']:,} / {status['max_tokens']:,} ({status['percentage']}%)")
+    print(f"Session: {status['session_duration']}")
+    
+    # Check active workflow
+    active_workflow = Path("workflows/active")
+    if active_workflow.exists():
+        workflow = active_workflow.resolve().name
+        print(f"Workflow: {workflow}")
+    else:
+        print("Workflow: none")
+    
+    # Session database row counts (trigger-maintained, no table scans)
+    db = _get_handover_manager()._check_database_state(deep=args.deep)
+    if db["exists"]:
+        counts = ", ".join(f"{table} {db[f'{table}_count']}" for table in db["tables"]
+                           if f"{table}_count" in db)
+        print(f"Database: {counts or 'no tables'}")
+        if args.deep:
+            print(f"Integrity: {'; '.join(db.get('integrity', []))}")
+        for warning in db["warnings"]:
+            print(f"⚠️ {warning}")
+    else:
+        print("Database: not initialized")
+
+
+def cmd_enable(args):
+    print(f"✅ Enabling {args.type}: {args.name}")
+    # TODO: Implement component enabling
+    print("   (Feature coming soon)")
+
+
+def cmd_disable(args):
+    print(f"❌ Disabling {args.type}: {args.name}")
+    # TODO: Implement component disabling
+    print("   (Feature coming soon)")
+
+
+def cmd_list(args):
+    if args.type in ["hooks", "all"]:
+        print("\n📎 Available Hooks:")
+        hooks_dir = Path("resource-library/hooks")
+        if hooks_dir.exists():
+            for category in hooks_dir.iterdir():
+                if category.is_dir():
+                    print(f"  {category.name}/")
+                    # TODO: List individual hooks
+    
+    if args.type in ["agents", "all"]:
+        print("\n🤖 Available Agents:")
+        agents_dir = Path("resource-library/agents")
+        if agents_dir.exists():
+            for agent in agents_dir.iterdir():
+                if agent.is_dir():
+                    print(f"  - {agent.name}")
+    
+    if args.type in ["workflows", "all"]:
+        print("\n🔄 Available Workflows:")
+        workflows_dir = Path("workflows")
+        if workflows_dir.exists():
+            for workflow in workflows_dir.iterdir():
+                if workflow.is_dir() and workflow.name != "active":
+                    print(f"  - {workflow.name}")
+
+
+def cmd_workflow(args):
+    if args.action == "activate" and args.name:
+        print(f"🔄 Activating workflow: {args.name}")
+        workflow_path = Path(f"workflows/{args.name}")
+        if workflow_path.exists():
+            active_link = Path("workflows/active")
+            if active_link.exists():
+                active_link.unlink()
+            active_link.symlink_to(args.name)
+            print(f"✅ Workflow '{args.name}' activated")
+        else:
+            print(f"❌ Workflow '{args.name}' not found")
+    
+    elif args.action == "status":
+        active_workflow = Path("workflows/active")
+        if active_workflow.exists():
+            workflow = active_workflow.resolve().name
+            print(f"Active workflow: {workflow}")
+        else:
+            print("No active workflow")
+
+
+def cmd_handover(args):
+    # Simple command that just shows session info
+    # The LLM will handle the actual handover creation
+    manager = _get_handover_manager()
     
-    # Start command
-    start_parser = subparsers.add_parser("start", help="Start orchestrator monitoring")
+    if args.summary == "info":
+        # Just show session information
+        print(manager.get_info_summary(use_cache=not args.no_cache, deep=args.deep))
+    elif args.summary == "gather":
+        # Get raw data for LLM analysis
+        import json
+        info = manager.gather_session_info(use_cache=not args.no_cache, deep=args.deep)
+        print(json.dumps(info, indent=2, default=str))
+    elif args.summary == "draft":
+        # Template with the factual sections filled in; LLM writes the rest
+        draft = manager.render_handover_draft(use_cache=not args.no_cache)
+        print(draft["content"])
+    elif args.summary == "validate":
+        # Validate handover content (reading from stdin)
+        import sys
+        content = sys.stdin.read()
+        validation = manager.validate_handover_structure(content)
+        
+        if validation["valid"]:
+            print("✅ Handover structure validation PASSED")
+            print(f"   Found {validation['section_count']} required sections")
+        else:
+            print("❌ Handover structure validation FAILED")
+            if validation["errors"]:
+                print("\n🔴 Errors (must fix):")
+                for error in validation["errors"]:
+                    print(f"   - {error}")
+            if validation["warnings"]:
+                print("\n⚠️ Warnings:")
+                for warning in validation["warnings"]:
+                    print(f"   - {warning}")
+        
+        # Exit with error code if validation failed
+        if not validation["valid"]:
+            sys.exit(1)
+            
+    elif args.summary == "save":
+        # Save handover content (reading from stdin)
+        import sys
+        content = sys.stdin.read()
+        path = manager.archive_and_save_handover(content)
+        print(f"✅ Handover saved to: {path}")
+    else:
+        # Default: show info and instructions
+        print("📝 Handover Helper Tool")
+        print("=" * 60)
+        print("\nThis tool helps gather session information for handover creation.")
+        print("\nUsage:")
+        print("  python orchestrate.py handover info     - Show session summary")
+        print("  python orchestrate.py handover gather   - Get JSON data for analysis")
+        print("  python orchestrate.py handover draft    - Template with factual sections pre-rendered")
+        print("  python orchestrate.py handover validate - Validate handover structure (from stdin)")
+        print("  python orchestrate.py handover save     - Save handover (from stdin)")
+        print("\nThe LLM should use these commands to create comprehensive handovers.")
+
+
+def cmd_archive(args):
+    manager = _get_handover_manager()
+    archive = manager.archive
     
-    # Status command
-    status_parser = subparsers.add_parser("status", help="Show current status")
+    if args.action == "list":
+        entries = archive.entries[-args.limit:] if args.limit else archive.entries
+        if not entries:
+            print("ℹ️ Handover archive is empty")
+            return
+        print(f"{'Id':<28}{'Hash':<14}{'Size':>9}  Title")
+        print("-" * 80)
+        for entry in entries:
+            print(f"{entry['id']:<28}{entry['hash'][:12]:<14}{entry['size']:>9}  {entry['title'][:40]}")
+        stats = archive.get_statistics()
+        print(f"\n📦 {stats['entries']} entries, {stats['unique_blobs']} unique, "
+              f"{stats['original_bytes']:,} bytes stored as {stats['stored_bytes']:,}")
     
-    # Enable command
-    enable_parser = subparsers.add_parser("enable", help="Enable a component")
-    enable_parser.add_argument("type", choices=["hook", "agent", "workflow"])
-    enable_parser.add_argument("name", help="Name of component to enable")
+    elif args.action == "show":
+        content = archive.read(args.refs[0] if args.refs else "-1")
+        if content is None:
+            print(f"❌ No archived handover matches: {args.refs[0] if args.refs else '-1'}")
+            sys.exit(1)
+        print(content, end="")
     
-    # Disable command
-    disable_parser = subparsers.add_parser("disable", help="Disable a component")
-    disable_parser.add_argument("type", choices=["hook", "agent", "workflow"])
-    disable_parser.add_argument("name", help="Name of component to disable")
+    elif args.action == "diff":
+        old_ref, new_ref = (args.refs + ["-2", "-1"][len(args.refs):])[:2]
+        diff = archive.diff(old_ref, new_ref)
+        if diff is None:
+            print(f"❌ No archived handover matches: {old_ref} / {new_ref}")
+            sys.exit(1)
+        print(diff or "ℹ️ No differences", end="" if diff else "\n")
     
-    # List command
-    list_parser = subparsers.add_parser("list", help="List available components")
-    list_parser.add_argument("type", choices=["hooks", "agents", "workflows", "all"])
+    elif args.action == "changes":
+        changes = archive.section_changes(args.refs[0] if args.refs else "-1")
+        if changes is None:
+            print(f"❌ No archived handover matches: {args.refs[0] if args.refs else '-1'}")
+            sys.exit(1)
+        print(f"🔄 {changes['id']} vs {changes['base'] or '(first handover)'}")
+        for kind, mark in (("added", "+"), ("modified", "~"), ("removed", "-"), ("unchanged", "=")):
+            for title in changes[kind]:
+                print(f"   {mark} {title}")
+    
+    elif args.action == "import":
+        stats = archive.import_legacy(remove=args.remove_originals)
+        print(f"✅ Imported {stats['imported']} handovers "
+              f"({stats['duplicates']} duplicates, {stats['removed']} plain copies removed)")
+
+
+def cmd_search(args):
+    import time
+    index = _get_handover_manager().get_search_index()
     
-    # Workflow command
-    workflow_parser = subparsers.add_parser("workflow", help="Manage workflows")
-    workflow_parser.add_argument("action", choices=["activate", "deactivate", "status"])
-    workflow_parser.add_argument("name", nargs="?", help="Workflow name")
+    start = time.perf_counter()
+    if args.rebuild:
+        index.rebuild()
+    results = index.search(" ".join(args.query), kinds=args.kind, limit=args.limit)
+    elapsed_ms = (time.perf_counter() - start) * 1000
     
-    # Handover command
-    handover_parser = subparsers.add_parser("handover", help="Create session handover document")
-    handover_parser.add_argument("--summary", help="Session summary", default="")
+    if args.json:
+        import json
+        print(json.dumps({"results": results, "elapsed_ms": round(elapsed_ms, 2)}, indent=2))
+        return
     
-    # Session command
-    session_parser = subparsers.add_parser("session", help="Manage session state")
-    session_parser.add_argument("action", choices=["start", "status", "end"], help="Session action")
-    session_parser.add_argument("--no-cleanup", action="store_true", help="Skip maintenance analysis")
-    session_parser.add_argument("--no-git", action="store_true", help="Skip git operations")
-    session_parser.add_argument("--emergency", action="store_true", help="Emergency mode - handover only")
+    if not results:
+        print(f"🔍 No matches ({elapsed_ms:.1f} ms)")
+        return
     
-    args = parser.parse_args()
+    print(f"🔍 {len(results)} matches ({elapsed_ms:.1f} ms)")
+    for result in results:
+        print(f"\n[{result['kind']}] {result['ref']}  {result['timestamp']}")
+        print(f"  {result['title']}")
+        print(f"  {' '.join(result['snippet'].split())}")
+
+
+def cmd_todo(args):
+    index = _get_handover_manager().get_todo_index()
+    if index is None:
+        print("ℹ️ No TODO file found (docs/status/todo.md)")
+        return
     
-    if not args.command:
-        parser.print_help()
+    items = index.query(section=args.section, state=args.state, limit=args.limit,
+                        max_depth=0 if args.top_level else None)
+    if args.json:
+        import json
+        print(json.dumps({"counts": index.counts(args.section),
+                          "items": [item.to_dict() for item in items]}, indent=2))
         return
     
-    # Handle commands
-    if args.command == "start":
-        print("🚀 Starting Claude Orchestrator monitoring...")
-        from context_guardian import interactive_mode
-        interactive_mode()
-    
-    elif args.command == "status":
-        print("📊 Claude Orchestrator Status")
-        print("=" * 40)
-        from context_guardian import ContextMonitor
-        monitor = ContextMonitor()
-        status = monitor.get_status()
-        print(f"Context: {status['status']}")
-        print(f"Tokens: {status['current_tokens']:,} / {status['max_tokens']:,} ({status['percentage']}%)")
-        print(f"Session: {status['session_duration']}")
-        
-        # Check active workflow
-        active_workflow = Path("workflows/active")
-        if active_workflow.exists():
-            workflow = active_workflow.resolve().name
-            print(f"Workflow: {workflow}")
+    marks = {"open": "[ ]", "in_progress": "[~]", "done": "[x]"}
+    current_section = None
+    for item in items:
+        section = " › ".join(item.section)
+        if section != current_section:
+            print(f"\n## {section or '(no section)'}")
+            current_section = section
+        print(f"{'  ' * item.depth}- {marks[item.state]} {item.text}  (line {item.line})")
+    
+    counts = index.counts(args.section)
+    print(f"\n📋 {counts['open']} open, {counts['in_progress']} in progress, "
+          f"{counts['done']} done ({counts['total']} total)")
+
+
+def cmd_files(args):
+    """Query the shared file metadata index"""
+    import json
+    from datetime import datetime
+    from file_index import get_file_index
+    
+    index = get_file_index()
+    folder = (args.path or '').strip('/')
+    if not args.no_refresh:
+        index.refresh([folder] if folder else None, recursive=args.action != "ls")
+    
+    if args.action == "recent":
+        entries = index.recent(args.limit, under=folder, suffix=args.suffix)
+    elif args.action == "ls":
+        entries = index.list_dir(folder, suffix=args.suffix)
+    else:
+        if args.since is None:
+            print("❌ 'files changed' needs --since (hours, e.g. 24, or YYYY-mm-dd[THH:MM])")
+            sys.exit(1)
+        try:
+            since = datetime.now().timestamp() - float(args.since) * 3600
+        except ValueError:
+            try:
+                since = datetime.fromisoformat(args.since).timestamp()
+            except ValueError:
+                print("❌ 'files changed' needs --since (hours, e.g. 24, or YYYY-mm-dd[THH:MM])")
+                sys.exit(1)
+        entries = index.changed_since(since, under=folder)
+        if args.suffix:
+            entries = [entry for entry in entries if entry["path"].endswith(args.suffix)]
+        entries = entries[-args.limit:] if args.limit else entries
+    
+    if args.json:
+        print(json.dumps(entries, indent=2))
+        return
+    for entry in entries:
+        modified = datetime.fromtimestamp(entry["mtime"]).strftime("%Y-%m-%d %H:%M")
+        name = entry["path"] + ("/" if entry["kind"] == "dir" else "")
+        print(f"{modified}  {entry['size']:>9}  {name}")
+    if not entries:
+        print("ℹ️ No matching files")
+
+
+def cmd_decisions(args):
+    """Maintenance task decisions stored in the session database"""
+    import json
+    import session_end_manager
+    manager = _get_instance("session_end_manager", session_end_manager.SessionEndManager)
+    
+    if args.action == "list":
+        approved = {"yes": True, "no": False}.get(args.approved)
+        items = manager.query_decisions(task=args.task, session_id=args.session, action=args.decision_action,
+                                        status=args.status, approved=approved, limit=args.limit)
+        if args.json:
+            print(json.dumps(items, indent=2))
+            return
+        for item in items:
+            print(f"#{item['id']:<5} {item['status']:<8} {item['task']} / {item['session_id']}")
+            print(f"       {item['action']}: {item['item']}")
+        if not items:
+            print("ℹ️ No matching decisions")
+    
+    elif args.action in ("save", "export"):
+        if not args.task or not args.session:
+            print(f"❌ 'decisions {args.action}' needs --task and --session")
+            sys.exit(1)
+        if args.action == "save":
+            try:
+                decisions = json.loads(sys.stdin.read())
+            except ValueError as e:
+                print(f"❌ Invalid decisions JSON on stdin: {e}")
+                sys.exit(1)
+            success, result = manager.save_decisions(args.task, args.session, decisions)
+            print(f"✅ Decisions saved, exported to: {result}" if success else f"❌ {result}")
+            if not success:
+                sys.exit(1)
         else:
-            print("Workflow: none")
-    
-    elif args.command == "enable":
-        print(f"✅ Enabling {args.type}: {args.name}")
-        # TODO: Implement component enabling
-        print("   (Feature coming soon)")
-    
-    elif args.command == "disable":
-        print(f"❌ Disabling {args.type}: {args.name}")
-        # TODO: Implement component disabling
-        print("   (Feature coming soon)")
-    
-    elif args.command == "list":
-        if args.type in ["hooks", "all"]:
-            print("\n📎 Available Hooks:")
-            hooks_dir = Path("resource-library/hooks")
-            if hooks_dir.exists():
-                for category in hooks_dir.iterdir():
-                    if category.is_dir():
-                        print(f"  {category.name}/")
-                        # TODO: List individual hooks
+            decisions = manager.load_decisions(args.task, args.session)
+            if decisions is None:
+                print(f"❌ No decisions for {args.task} in {args.session}")
+                sys.exit(1)
+            print(json.dumps(decisions, indent=2))
+    
+    elif args.action == "mark":
+        if not args.ids or not args.status:
+            print("❌ 'decisions mark' needs decision ids and --status")
+            sys.exit(1)
+        count = manager.decision_store.set_status(args.ids, args.status)
+        print(f"✅ {count} decision(s) marked {args.status}")
+    
+    elif args.action == "import":
+        stats = manager.import_decision_files()
+        print(f"✅ Imported {stats['imported']} decision files ({stats['skipped']} skipped)")
+
+
+def cmd_headers(args):
+    """Check the YAML frontmatter of Markdown documents"""
+    import json
+    from file_index import get_file_index
+    from frontmatter_validator import validate_files
+    
+    index = get_file_index()
+    folder = (args.path or 'docs').strip('/')
+    folder = '' if folder == '.' else folder
+    if not args.no_refresh:
+        index.refresh([folder] if folder else None)
+    paths = [entry["path"] for entry in index.files(folder, suffix=".md")]
+    report = validate_files(index.root, paths, workers=args.workers)
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for result in report["files"]:
+            print(f"{'❌' if result['errors'] else '⚠️'} {result['path']}")
+            for message in result["errors"] + result["warnings"]:
+                print(f"   → {message}")
+        print(f"\n📊 {report['checked']} document(s) checked in {report['elapsed_ms']:.0f} ms: "
+              f"{report['valid']} valid, {report['invalid']} invalid")
+    if report["invalid"]:
+        sys.exit(1)
+
+
+def cmd_links(args):
+    """Reference graph between the project's Markdown documents"""
+    import json
+    from file_index import get_file_index
+    from link_graph import LinkGraph
+    
+    index = get_file_index()
+    if not args.no_refresh:
+        index.refresh()
+    graph = _get_instance("link_graph", lambda: LinkGraph(index.root))
+    stats = graph.update(entry["path"] for entry in index.files(suffix=".md"))
+    
+    if args.action == "check":
+        scope = [path for path in graph.documents() if path.startswith((args.path or '').strip('/'))]
+        items = graph.report(scope)
+        if args.json:
+            print(json.dumps({"stats": stats, "items": items}, indent=2))
+            return
+        print(f"🔗 {len(scope)} document(s) checked ({stats['parsed']} parsed, {stats['reused']} unchanged)")
+        for item in items:
+            print(f"   [{item['category']}] {item['path']}: {item['message']}")
+        if not items:
+            print("✅ No broken links, orphaned or unreachable documents")
+    
+    elif args.action == "refs":
+        if not args.path:
+            print("❌ 'links refs' needs a document path")
+            sys.exit(1)
+        refs = graph.references(args.path.strip('/'))
+        if args.json:
+            print(json.dumps(refs, indent=2))
+            return
+        print(f"🔗 {args.path}")
+        print(f"   → refers to ({len(refs['outgoing'])}): {', '.join(refs['outgoing']) or '-'}")
+        print(f"   ← referenced by ({len(refs['incoming'])}): {', '.join(refs['incoming']) or '-'}")
+
+
+def _print_preanalysis(results):
+    for task, result in results.items():
+        if result["status"] == "agent-only":
+            print(f"   ➖ {task}: no native analyzer (agent only)")
+            continue
+        if result["status"] == "error":
+            print(f"   ⚠️ {task}: pre-analysis failed, agent only ({result['error']})")
+            continue
+        findings = result["findings"]
+        counts = ", ".join(f"{count} {category}" for category, count in sorted(findings["counts"].items()))
+        timing = "cached" if result["status"] == "cached" else f"{result['ms']:.0f} ms"
+        print(f"   {'✅' if not findings['items'] else '🔎'} {task}: "
+              f"{len(findings['items'])} finding(s){' (' + counts + ')' if counts else ''} [{timing}]")
+
+
+def cmd_maintenance(args):
+    """Deterministic pre-analysis of the session-end maintenance tasks"""
+    import json
+    import session_end_manager
+    import maintenance_analysis
+    manager = _get_instance("session_end_manager", session_end_manager.SessionEndManager)
+    tasks = args.task or maintenance_analysis.list_tasks(Path(manager.get_task_documents_path()))
+
+    if args.action == "analyze":
+        results = maintenance_analysis.run_preanalysis(manager.project_root, tasks,
+                                                       use_cache=not args.no_cache, workers=args.workers)
+        if args.json:
+            print(json.dumps(results, indent=2))
+            return
+        print(f"🔬 Maintenance pre-analysis ({len(tasks)} task(s))")
+        _print_preanalysis(results)
+
+    elif args.action == "show":
+        findings = {task: maintenance_analysis.load_findings(task) for task in tasks}
+        if args.json:
+            print(json.dumps(findings, indent=2))
+            return
+        for task, result in findings.items():
+            if result is None:
+                print(f"ℹ️ {task}: no findings (run 'maintenance analyze')")
+                continue
+            print(f"📋 {task} ({result['generated']}): {len(result['items'])} finding(s)")
+            for item in result["items"]:
+                print(f"   [{item['category']}] {item['path']}: {item['message']}")
+
+
+def cmd_session(args):
+    if args.action == "start":
+        _session_start(args)
+    elif args.action == "status":
+        _session_status(args)
+    elif args.action == "end":
+        _session_end(args)
+
+
+def _session_start(args):
+    print("🚀 Starting new session...")
+    manager = _get_handover_manager()
+    
+    # Read the handover (section index, cached by mtime)
+    index = manager.get_handover_index()
+    
+    if index is not None and (args.budget is not None or args.sections or args.changes_only):
+        _session_start_budgeted(manager, index, args)
+    elif index is not None:
+        print("\n" + "="*60)
+        print("📋 Previous Session Handover:")
+        print("="*60)
+        # Show the handover up to the end of a late goals section
+        end_line = len(index.lines)
+        for section in index.find("Next Session Goals"):
+            if section.line > 50:
+                end_line = min(section.end_line, section.line + 20)
+                break
+        print('\n'.join(index.lines[:end_line]))
         
-        if args.type in ["agents", "all"]:
-            print("\n🤖 Available Agents:")
-            agents_dir = Path("resource-library/agents")
-            if agents_dir.exists():
-                for agent in agents_dir.iterdir():
-                    if agent.is_dir():
-                        print(f"  - {agent.name}")
+        print("\n" + "="*60)
+        print("✅ Session started. Review the full handover at: docs/status/handover-next.md")
+        print("📚 Don't forget to read the required documents listed in the handover!")
+    else:
+        print("ℹ️ No previous handover found. Starting fresh session.")
+        print("📚 Please read docs/read-first.md for required documentation.")
+
+
+def _session_start_budgeted(manager, index, args):
+    """Print the highest-priority handover sections that fit the budget"""
+    from context_guardian import estimate_tokens
+    from handover_context import plan_context
+    
+    changes = None
+    if args.changes_only:
+        changes = manager.archive.changes_since_previous(index.text)
+        if changes is None:
+            print("ℹ️ No earlier handover in the archive - loading all sections")
+    changed = set(changes["added"] + changes["modified"]) if changes else None
+    
+    plan = plan_context(index, estimate_tokens, budget=args.budget, sections=args.sections,
+                        changed=changed)
+    budget = f"{plan['budget']:,}" if plan["budget"] is not None else "unlimited"
+    print("\n" + "="*60)
+    print(f"📋 Previous Session Handover (~{plan['used']:,} tokens, budget {budget}):")
+    print("="*60)
+    for unit in plan["load"]:
+        print(unit["text"].rstrip("\n") + "\n")
+    
+    print("="*60)
+    unchanged = set(changes["unchanged"]) if changes else set()
+    deferred = [unit for unit in plan["deferred"] if unit["title"] not in unchanged]
+    if changes:
+        print(f"🔄 Changes since {changes['base']}: {len(changes['added'])} new, "
+              f"{len(changes['modified'])} modified, {len(changes['removed'])} removed section(s)")
+        for title in changes["removed"]:
+            print(f"   - removed: {title}")
+        if unchanged:
+            print("📎 Unchanged since the previous handover (docs/status/handover-next.md):")
+            for unit in plan["deferred"]:
+                if unit["title"] in unchanged:
+                    print(f"   - {unit['title']}: lines {unit['start_line']}-{unit['end_line']} "
+                          f"(~{unit['tokens']:,} tokens)")
+    if deferred:
+        print("📎 Not loaded - read on demand (docs/status/handover-next.md):")
+        for unit in deferred:
+            print(f"   - {unit['title']}: lines {unit['start_line']}-{unit['end_line']} "
+                  f"(~{unit['tokens']:,} tokens)")
+    print("✅ Session started. Review the full handover at: docs/status/handover-next.md")
+
+
+def _session_status(args):
+    print("📊 Current session status")
+    # Could add more session status info here
+    print("   Use 'python orchestrate.py handover' to create a handover")
+    print("   Use 'python orchestrate.py session start' to begin from handover")
+
+
+def _session_end(args):
+    import json
+    from datetime import datetime
+    
+    print("🏁 Session End Process")
+    print("=" * 60)
+    
+    if args.emergency:
+        print("⚠️ EMERGENCY MODE - Creating handover only")
+        print("\nPlease use the /handover command to create and save a handover.")
+        print("This will preserve critical session information.")
+        return
+    
+    # Load session end manager
+    import session_end_manager
+    manager = _get_instance("session_end_manager", session_end_manager.SessionEndManager)
+    
+    # Get available maintenance tasks
+    import maintenance_analysis
+    tasks_path = Path(manager.get_task_documents_path())
+    # Handover validation runs in Phase 1 (handover --summary validate)
+    task_files = [task for task in maintenance_analysis.list_tasks(tasks_path)
+                  if task != "handover_validation_check"]
+
+    # Use session-reports directory for decisions (same place as findings)
+    reports_dir = Path(manager.get_reports_directory())
+    reports_dir.mkdir(parents=True, exist_ok=True)
+    decisions_dir = reports_dir  # Keep decisions with findings
+    session_id = datetime.now().strftime("session-%Y%m%d-%H%M%S")
+    
+    # Provide orchestration instructions
+    print("\n" + "="*60)
+    print("🎯 ORCHESTRATION INSTRUCTIONS FOR CLAUDE")
+    print("="*60)
+    
+    orchestration_data = {
+        "workflow": "session-end",
+        "session_id": session_id,
+        "decisions_dir": str(decisions_dir),
+        "phases": [],
+        "maintenance_tasks": task_files if not args.no_cleanup else [],
+        "git_enabled": not args.no_git
+    }
+    
+    print("\n📋 PHASE 1: HANDOVER CREATION (SEQUENTIAL)")
+    print("Complete the handover FIRST before any other tasks:")
+    print("\n1. Get session information:")
+    print("   Command: python orchestrate.py handover --summary info")
+    print("2. Create comprehensive handover document")
+    print("3. Get user approval for handover")
+    print("4. Save handover using:")
+    print("   cat handover_content | python orchestrate.py handover --summary save")
+    orchestration_data["phases"].append("handover_creation")
+    
+    print("\n" + "="*60)
+    print("📋 PHASE 2: MAINTENANCE TASK SELECTION")
+    print("="*60)
+    
+    if not args.no_cleanup:
+        print("After handover is complete, present maintenance options:")
+        print("\nAvailable maintenance tasks:")
+        for i, task in enumerate(task_files, 1):
+            print(f"  {i}. {task.replace('_', ' ').title()}")
         
-        if args.type in ["workflows", "all"]:
-            print("\n🔄 Available Workflows:")
-            workflows_dir = Path("workflows")
-            if workflows_dir.exists():
-                for workflow in workflows_dir.iterdir():
-                    if workflow.is_dir() and workflow.name != "active":
-                        print(f"  - {workflow.name}")
-    
-    elif args.command == "workflow":
-        if args.action == "activate" and args.name:
-            print(f"🔄 Activating workflow: {args.name}")
-            workflow_path = Path(f"workflows/{args.name}")
-            if workflow_path.exists():
-                active_link = Path("workflows/active")
-                if active_link.exists():
-                    active_link.unlink()
-                active_link.symlink_to(args.name)
-                print(f"✅ Workflow '{args.name}' activated")
-            else:
-                print(f"❌ Workflow '{args.name}' not found")
+        print("\nAsk user: 'Would you like to run maintenance checks?'")
+        print("If yes, explain you'll go through them one at a time")
+        orchestration_data["phases"].append("task_selection")
         
-        elif args.action == "status":
-            active_workflow = Path("workflows/active")
-            if active_workflow.exists():
-                workflow = active_workflow.resolve().name
-                print(f"Active workflow: {workflow}")
-            else:
-                print("No active workflow")
-    
-    elif args.command == "handover":
-        # Simple command that just shows session info
-        # The LLM will handle the actual handover creation
-        import importlib.util
-        spec = importlib.util.spec_from_file_location("handover_manager", 
-                                                      Path(__file__).parent / "brain" / "handover-manager.py")
-        handover_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(handover_module)
-        manager = handover_module.HandoverManager()
+        # Deterministic parts of every task, concurrently and cached by input hashes
+        print("\n🔬 Pre-analysis (deterministic checks, cached by input hashes):")
+        try:
+            preanalysis = maintenance_analysis.run_preanalysis(manager.project_root, task_files)
+        except Exception as e:
+            # Session end must go on; the agents then analyze every task alone
+            print(f"   ⚠️ Pre-analysis failed ({type(e).__name__}: {e}) - agents analyze all tasks")
+            preanalysis = {task: {"status": "error", "error": str(e), "findings": None, "path": None, "ms": 0}
+                           for task in task_files}
+        _print_preanalysis(preanalysis)
         
-        if args.summary == "info":
-            # Just show session information
-            print(manager.get_info_summary())
-        elif args.summary == "gather":
-            # Get raw data for LLM analysis
-            import json
-            info = manager.gather_session_info()
-            print(json.dumps(info, indent=2, default=str))
-        elif args.summary == "validate":
-            # Validate handover content (reading from stdin)
-            import sys
-            content = sys.stdin.read()
-            validation = manager.validate_handover_structure(content)
+        print("\n" + "="*60)
+        print("📋 PHASE 3: MAINTENANCE ANALYSIS (ONE BY ONE)")
+        print("="*60)
+        print("⚠️ CRITICAL: Process tasks ONE AT A TIME with user review between each!")
+        print("\nFor EACH task (starting with first, then asking about next):")
+        print("1. Tell user: 'Running [task name] check...'")
+        print("2. Launch ONE sub-agent:")
+        print("   - Use description: 'Sub-Agent Assignment: (Maintenance) [task name]'")
+        print("   - Use Task tool with subagent_type='general-purpose'")
+        print("3. Wait for agent to complete and return results")
+        print("   (the agent starts from the task's precomputed_findings JSON and only")
+        print("   adds judgement; tasks without one are analyzed by the agent alone)")
+        print("4. Review findings with user")
+        print("5. Make recommendations (safe/risky/optional)")
+        print("6. Get user decisions")
+        print("7. Execute approved fixes if any")
+        print("8. Ask: 'Would you like to run the next check?'")
+        print("9. If yes, repeat from step 1 with next task")
+        print("\n⚠️ NEVER launch multiple agents before reviewing results!")
+        
+        for i, task in enumerate(task_files, 1):
+            task_instruction = {
+                "task_number": i,
+                "task_name": task,
+                "mode": "analyze",
+                "agent_template": manager.get_maintenance_agent_path(),
+                "task_document": f"{tasks_path}/{task}.md",
+                "report_path": f"{manager.get_reports_directory()}/findings-{task}-{session_id}.md",
+                "precomputed_findings": preanalysis[task]["path"]
+            }
             
-            if validation["valid"]:
-                print("✅ Handover structure validation PASSED")
-                print(f"   Found {validation['section_count']} required sections")
+            print(f"\n   Task {i}: {task}")
+            print(f"   When running this specific task:")
+            print(f"   Task tool description: 'Sub-Agent Assignment: (Maintenance) {task.replace('_', ' ')}'")
+            print(f"   AGENT_INSTRUCTION_ANALYZE:")
+            print(f"   {json.dumps(task_instruction, indent=6)}")
+            print(f"\n   Task tool prompt should be:")
+            print(f"   'Act as maintenance-agent. Read {task_instruction['agent_template']}")
+            print(f"   Execute task: {task_instruction['task_document']}")
+            print(f"   Mode: ANALYZE. Save findings to: {task_instruction['report_path']}'")
+            if task_instruction["precomputed_findings"]:
+                print(f"   Precomputed findings (start from these): {task_instruction['precomputed_findings']}")
+        orchestration_data["phases"].append("maintenance_analysis")
+    
+    if not args.no_cleanup:
+        print("\n" + "="*60)
+        print("📋 PHASE 4: REVIEW WITH RECOMMENDATIONS")
+        print("="*60)
+        print("\n🎯 This happens WITHIN Phase 3 for each task!")
+        print("\nWhen reviewing EACH task's findings:")
+        print("1. Analyze the findings and categorize:")
+        print("   - ✅ Safe to fix (won't break anything)")
+        print("   - ⚠️ Needs review (could affect functionality)")
+        print("   - 💡 Optional (nice to have)")
+        print("2. Present with YOUR recommendations:")
+        print("   'Found X issues. Here's my analysis:'")
+        print("   - Explain what each finding means")
+        print("   - Recommend which to fix")
+        print("   - Explain any risks")
+        print("3. Get user's specific decisions")
+        print("4. Save decisions if fixes approved (see Phase 5):")
+        print(f"   python orchestrate.py decisions save --task [task_name] --session {session_id}")
+        print("   with the decisions JSON on stdin; the fix agent reads the exported JSON file")
+        
+        print("\n⚠️ NEVER:")
+        print("  - Present all tasks at once")
+        print("  - Show lists of numbers without context")
+        print("  - Move to next task before current is complete")
+        
+        print("\n✅ ALWAYS:")
+        print("  - Explain what each finding means")
+        print("  - Give user control over each decision")
+        print("  - Show exactly what will be done")
+        print("  - Report what was actually executed")
+        
+        orchestration_data["phases"].append("conversational_review")
+        orchestration_data["phases"].append("execute_fixes")
+    
+    print("\n" + "="*60)
+    print("📋 PHASE 5: DECISION TRACKING")
+    print("="*60)
+    print("\nFor EACH task that needs fixes:")
+    print("1. Store the decisions in the session database (JSON on stdin):")
+    print(f"   cat decisions.json | python orchestrate.py decisions save --task [task_name] --session {session_id}")
+    print("   This also exports them for the fix agent to:")
+    print(f"   {decisions_dir}/decisions_[task_name]_{session_id}.json")
+    print("\n2. Decisions JSON format:")
+    decision_template = {
+        "session_id": session_id,
+        "task": "task_name",
+        "timestamp": "ISO-8601 timestamp",
+        "findings_count": "number",
+        "decisions": [
+            {
+                "item": "what was found",
+                "action": "user's decision",
+                "details": "specific instructions"
+            }
+        ],
+        "approved_by_user": True
+    }
+    print(json.dumps(decision_template, indent=3))
+    
+    print("\n3. Launch fix agent with:")
+    fix_instruction = {
+        "mode": "fix",
+        "decisions_file": f"{decisions_dir}/decisions_[task_name]_{session_id}.json",
+        "original_report": f"{decisions_dir}/findings-[task_name]-{session_id}.md"
+    }
+    print(f"   AGENT_INSTRUCTION_FIX:")
+    print(f"   {json.dumps(fix_instruction, indent=6)}")
+    print("   If the decisions file is missing, re-export it (never write it by hand):")
+    print(f"   python orchestrate.py decisions export --task [task_name] --session {session_id} \\")
+    print(f"       > {fix_instruction['decisions_file']}")
+    
+    print("\n4. Record what the fix agent executed:")
+    print(f"   python orchestrate.py decisions list --task [task_name] --session {session_id}")
+    print("   python orchestrate.py decisions mark <ids> --status done|failed|skipped")
+    
+    if not args.no_git:
+        print("\n" + "="*60)
+        print("📋 PHASE 6: GIT COMMIT")
+        print("="*60)
+        print("After all fixes are complete:")
+        print("1. Show git status")
+        print("2. Create meaningful commit message")
+        print("3. Get user approval")
+        print("4. Commit with approved message")
+        orchestration_data["phases"].append("git_commit")
+    
+    print("\n" + "="*60)
+    print("🚀 ORCHESTRATION DATA")
+    print("="*60)
+    print(json.dumps(orchestration_data, indent=2))
+    
+    print("\n" + "="*60)
+    print("🎬 START EXECUTION NOW")
+    print("="*60)
+    print("Launch the Task tool commands for Phase 1!")
+    print("Remember: User experience is conversational, not automated.")
+
+
+def cmd_rules(args):
+    if args.action == "remind":
+        from rule_enforcer import RuleEnforcer
+        import rule_injection_hook
+        enforcer = _get_instance("rule_enforcer", RuleEnforcer,
+                                 refresh=lambda e: e.reload_if_changed())
+        rule_injection_hook.inject_rules(enforcer)
+    
+    elif args.action == "stats":
+        import json
+        from rule_enforcer import RuleEnforcer
+        enforcer = _get_instance("rule_enforcer", RuleEnforcer,
+                                 refresh=lambda e: e.reload_if_changed())
+        if args.export:
+            print(f"✅ Statistics written to: {enforcer.export_statistics(Path(args.export))}")
+        else:
+            print(json.dumps(enforcer.get_statistics(), indent=2, default=str))
+
+
+def cmd_validate(args):
+    """Audit a project tree against the naming and organization rules"""
+    import json
+    from rule_enforcer import RuleEnforcer
+    
+    enforcer = _get_instance("rule_enforcer", RuleEnforcer,
+                             refresh=lambda e: e.reload_if_changed())
+    root = Path(args.root) if args.root else None
+    
+    if args.changed:
+        result = enforcer.validate_changed(root)
+        if args.json:
+            print(json.dumps(result))
+        else:
+            if result["mode"] == "full":
+                print("🛡️ No previous validation base - audited the whole tree")
             else:
-                print("❌ Handover structure validation FAILED")
-                if validation["errors"]:
-                    print("\n🔴 Errors (must fix):")
-                    for error in validation["errors"]:
-                        print(f"   - {error}")
-                if validation["warnings"]:
-                    print("\n⚠️ Warnings:")
-                    for warning in validation["warnings"]:
-                        print(f"   - {warning}")
-            
-            # Exit with error code if validation failed
-            if not validation["valid"]:
-                sys.exit(1)
-                
-        elif args.summary == "save":
-            # Save handover content (reading from stdin)
-            import sys
-            content = sys.stdin.read()
-            path = manager.archive_and_save_handover(content)
-            print(f"✅ Handover saved to: {path}")
+                print(f"🛡️ Validated {len(result['checked'])} changed path(s) "
+                      f"since {(result['base_commit'] or '')[:8]}")
+            for record in result["violations"]:
+                print(f"❌ {record['path']}")
+                print(f"   → {record['message']}")
+            if not result["violations"]:
+                print("✅ No violations in changed paths")
+            print(f"\n📊 Violations in index: {result['total_violations']}")
+        if result["violations"]:
+            sys.exit(1)
+        return
+    
+    count = 0
+    if not args.json:
+        print("🛡️ Validating project tree...")
+    for record in enforcer.validate_tree(root, workers=args.workers, use_file_index=args.use_index):
+        count += 1
+        if args.json:
+            print(json.dumps(record))
         else:
-            # Default: show info and instructions
-            print("📝 Handover Helper Tool")
-            print("=" * 60)
-            print("\nThis tool helps gather session information for handover creation.")
-            print("\nUsage:")
-            print("  python orchestrate.py handover info     - Show session summary")
-            print("  python orchestrate.py handover gather   - Get JSON data for analysis")
-            print("  python orchestrate.py handover validate - Validate handover structure (from stdin)")
-            print("  python orchestrate.py handover save     - Save handover (from stdin)")
-            print("\nThe LLM should use these commands to create comprehensive handovers.")
-    
-    elif args.command == "session":
-        if args.action == "start":
-            print("🚀 Starting new session...")
-            import importlib.util
-            spec = importlib.util.spec_from_file_location("handover_manager", 
-                                                          Path(__file__).parent / "brain" / "handover-manager.py")
-            handover_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(handover_module)
-            manager = handover_module.HandoverManager()
-            
-            # Read the handover
-            content = manager.read_handover()
-            
-            if content:
-                print("\n" + "="*60)
-                print("📋 Previous Session Handover:")
-                print("="*60)
-                # Show first part of handover (required reading and summary)
-                lines = content.split('\n')
-                for i, line in enumerate(lines):
-                    print(line)
-                    if i > 50 and "## Next Session Goals" in line:
-                        # Show goals section
-                        for j in range(i, min(i+20, len(lines))):
-                            if lines[j].startswith("##") and j > i:
-                                break
-                            print(lines[j])
-                        break
-                
-                print("\n" + "="*60)
-                print("✅ Session started. Review the full handover at: docs/status/handover-next.md")
-                print("📚 Don't forget to read the required documents listed in the handover!")
+            print(f"❌ {record['path']}")
+            print(f"   → {record['message']}")
+    
+    if not args.json:
+        if count:
+            print(f"\n{count} violation(s) found")
+        else:
+            print("✅ No violations found")
+    if count:
+        sys.exit(1)
+
+
+def cmd_batch(args):
+    """Run JSON-lines commands from stdin in this process
+    
+    Each input line is {"argv": [...], "stdin": "...", "id": ...} (or
+    {"cmd": "handover --summary info"}). Each result is written as one JSON
+    line as soon as the command finishes. Commands share the cached managers
+    and database connection, so N commands cost a single startup. Every
+    command except NOT_BATCHABLE runs, including ones the daemon does not
+    answer (validate).
+    """
+    import json
+    import shlex
+    import time
+    
+    for line_number, line in enumerate(sys.stdin, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        
+        try:
+            request = json.loads(line)
+            argv = request["argv"] if "argv" in request else shlex.split(request["cmd"])
+        except (ValueError, KeyError, TypeError) as e:
+            result = {"line": line_number, "exit_code": 2, "stdout": "",
+                      "stderr": f"Invalid batch request: {e}"}
+        else:
+            start = time.perf_counter()
+            if argv and argv[0] == "batch":
+                result = {"exit_code": 2, "stdout": "", "stderr": "Nested batch is not supported"}
             else:
-                print("ℹ️ No previous handover found. Starting fresh session.")
-                print("📚 Please read docs/read-first.md for required documentation.")
+                result = execute_captured(argv, request.get("stdin", ""), batch=True)
+            result = {"line": line_number, "id": request.get("id"), "argv": argv, **result,
+                      "duration_ms": round((time.perf_counter() - start) * 1000, 2)}
         
-        elif args.action == "status":
-            print("📊 Current session status")
-            # Could add more session status info here
-            print("   Use 'python orchestrate.py handover' to create a handover")
-            print("   Use 'python orchestrate.py session start' to begin from handover")
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
         
-        elif args.action == "end":
-            import json
-            import importlib.util
-            from datetime import datetime
-            
-            print("🏁 Session End Process")
-            print("=" * 60)
-            
-            if args.emergency:
-                print("⚠️ EMERGENCY MODE - Creating handover only")
-                print("\nPlease use the /handover command to create and save a handover.")
-                print("This will preserve critical session information.")
-                return
-            
-            # Load session end manager
-            spec = importlib.util.spec_from_file_location("session_end_manager", 
-                                                          Path(__file__).parent / "brain" / "session-end-manager.py")
-            session_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(session_module)
-            manager = session_module.SessionEndManager()
-            
-            # Get available maintenance tasks
-            tasks_path = Path(manager.get_task_documents_path())
-            # For testing: Start with just unreferenced_documents_check
-            # TODO: Re-enable all tasks after debugging
-            task_files = ["unreferenced_documents_check"]  # Simplified for testing
-            # Full list for later:
-            # task_files = [f.stem for f in tasks_path.glob("*.md") 
-            #              if not f.stem.startswith("DOCUMENT_TYPE") and f.stem != "handover_validation_check"]
-            
-            # Use session-reports directory for decisions (same place as findings)
-            reports_dir = Path(manager.get_reports_directory())
-            reports_dir.mkdir(parents=True, exist_ok=True)
-            decisions_dir = reports_dir  # Keep decisions with findings
-            session_id = datetime.now().strftime("session-%Y%m%d-%H%M%S")
-            
-            # Provide orchestration instructions
-            print("\n" + "="*60)
-            print("🎯 ORCHESTRATION INSTRUCTIONS FOR CLAUDE")
-            print("="*60)
-            
-            orchestration_data = {
-                "workflow": "session-end",
-                "session_id": session_id,
-                "decisions_dir": str(decisions_dir),
-                "phases": [],
-                "maintenance_tasks": task_files if not args.no_cleanup else [],
-                "git_enabled": not args.no_git
-            }
-            
-            print("\n📋 PHASE 1: HANDOVER CREATION (SEQUENTIAL)")
-            print("Complete the handover FIRST before any other tasks:")
-            print("\n1. Get session information:")
-            print("   Command: python orchestrate.py handover --summary info")
-            print("2. Create comprehensive handover document")
-            print("3. Get user approval for handover")
-            print("4. Save handover using:")
-            print("   cat handover_content | python orchestrate.py handover --summary save")
-            orchestration_data["phases"].append("handover_creation")
-            
-            print("\n" + "="*60)
-            print("📋 PHASE 2: MAINTENANCE TASK SELECTION")
-            print("="*60)
-            
-            if not args.no_cleanup:
-                print("After handover is complete, present maintenance options:")
-                print("\nAvailable maintenance tasks:")
-                for i, task in enumerate(task_files, 1):
-                    print(f"  {i}. {task.replace('_', ' ').title()}")
-                
-                print("\nAsk user: 'Would you like to run maintenance checks?'")
-                print("If yes, explain you'll go through them one at a time")
-                orchestration_data["phases"].append("task_selection")
-                
-                print("\n" + "="*60)
-                print("📋 PHASE 3: MAINTENANCE ANALYSIS (ONE BY ONE)")
-                print("="*60)
-                print("⚠️ CRITICAL: Process tasks ONE AT A TIME with user review between each!")
-                print("\nFor EACH task (starting with first, then asking about next):")
-                print("1. Tell user: 'Running [task name] check...'")
-                print("2. Launch ONE sub-agent:")
-                print("   - Use description: 'Sub-Agent Assignment: (Maintenance) [task name]'")
-                print("   - Use Task tool with subagent_type='general-purpose'")
-                print("3. Wait for agent to complete and return results")
-                print("4. Review findings with user")
-                print("5. Make recommendations (safe/risky/optional)")
-                print("6. Get user decisions")
-                print("7. Execute approved fixes if any")
-                print("8. Ask: 'Would you like to run the next check?'")
-                print("9. If yes, repeat from step 1 with next task")
-                print("\n⚠️ NEVER launch multiple agents before reviewing results!")
-                
-                for i, task in enumerate(task_files, 1):
-                    task_instruction = {
-                        "task_number": i,
-                        "task_name": task,
-                        "mode": "analyze",
-                        "agent_template": manager.get_maintenance_agent_path(),
-                        "task_document": f"{tasks_path}/{task}.md",
-                        "report_path": f"{manager.get_reports_directory()}/findings-{task}-{session_id}.md"
-                    }
-                    
-                    print(f"\n   Task {i}: {task}")
-                    print(f"   When running this specific task:")
-                    print(f"   Task tool description: 'Sub-Agent Assignment: (Maintenance) {task.replace('_', ' ')}'")
-                    print(f"   AGENT_INSTRUCTION_ANALYZE:")
-                    print(f"   {json.dumps(task_instruction, indent=6)}")
-                    print(f"\n   Task tool prompt should be:")
-                    print(f"   'Act as maintenance-agent. Read {task_instruction['agent_template']}")
-                    print(f"   Execute task: {task_instruction['task_document']}")
-                    print(f"   Mode: ANALYZE. Save findings to: {task_instruction['report_path']}'")
-                orchestration_data["phases"].append("maintenance_analysis")
-            
-            if not args.no_cleanup:
-                print("\n" + "="*60)
-                print("📋 PHASE 4: REVIEW WITH RECOMMENDATIONS")
-                print("="*60)
-                print("\n🎯 This happens WITHIN Phase 3 for each task!")
-                print("\nWhen reviewing EACH task's findings:")
-                print("1. Analyze the findings and categorize:")
-                print("   - ✅ Safe to fix (won't break anything)")
-                print("   - ⚠️ Needs review (could affect functionality)")
-                print("   - 💡 Optional (nice to have)")
-                print("2. Present with YOUR recommendations:")
-                print("   'Found X issues. Here's my analysis:'")
-                print("   - Explain what each finding means")
-                print("   - Recommend which to fix")
-                print("   - Explain any risks")
-                print("3. Get user's specific decisions")
-                print("4. Save decisions to JSON if fixes approved")
-                
-                print("\n⚠️ NEVER:")
-                print("  - Present all tasks at once")
-                print("  - Show lists of numbers without context")
-                print("  - Move to next task before current is complete")
-                
-                print("\n✅ ALWAYS:")
-                print("  - Explain what each finding means")
-                print("  - Give user control over each decision")
-                print("  - Show exactly what will be done")
-                print("  - Report what was actually executed")
-                
-                orchestration_data["phases"].append("conversational_review")
-                orchestration_data["phases"].append("execute_fixes")
-            
-            print("\n" + "="*60)
-            print("📋 PHASE 5: DECISION TRACKING")
-            print("="*60)
-            print("\nFor EACH task that needs fixes:")
-            print("1. Create decision file at:")
-            print(f"   {decisions_dir}/decisions_[task_name]_{session_id}.json")
-            print("\n2. Decision file format:")
-            decision_template = {
-                "session_id": session_id,
-                "task": "task_name",
-                "timestamp": "ISO-8601 timestamp",
-                "findings_count": "number",
-                "decisions": [
-                    {
-                        "item": "what was found",
-                        "action": "user's decision",
-                        "details": "specific instructions"
-                    }
-                ],
-                "approved_by_user": True
-            }
-            print(json.dumps(decision_template, indent=3))
-            
-            print("\n3. Launch fix agent with:")
-            fix_instruction = {
-                "mode": "fix",
-                "decisions_file": "path/to/decisions_file.json",
-                "original_report": "path/to/findings_report.md"
-            }
-            print(f"   AGENT_INSTRUCTION_FIX:")
-            print(f"   {json.dumps(fix_instruction, indent=6)}")
-            
-            if not args.no_git:
-                print("\n" + "="*60)
-                print("📋 PHASE 6: GIT COMMIT")
-                print("="*60)
-                print("After all fixes are complete:")
-                print("1. Show git status")
-                print("2. Create meaningful commit message")
-                print("3. Get user approval")
-                print("4. Commit with approved message")
-                orchestration_data["phases"].append("git_commit")
-            
-            print("\n" + "="*60)
-            print("🚀 ORCHESTRATION DATA")
-            print("="*60)
-            print(json.dumps(orchestration_data, indent=2))
-            
-            print("\n" + "="*60)
-            print("🎬 START EXECUTION NOW")
-            print("="*60)
-            print("Launch the Task tool commands for Phase 1!")
-            print("Remember: User experience is conversational, not automated.")
+        if args.stop_on_error and result["exit_code"] != 0:
+            sys.exit(result["exit_code"])
+
+
+def cmd_daemon(args):
+    """Start, stop or inspect the orchestrator daemon"""
+    import orchestrator_daemon
+    
+    if args.action == "run":
+        orchestrator_daemon.serve(execute_captured)
+    
+    elif args.action == "start":
+        info = orchestrator_daemon.ping()
+        if info:
+            print(f"ℹ️ Daemon already running (pid {info['pid']})")
+            return
+        info = orchestrator_daemon.start_background(Path(__file__).resolve())
+        if info:
+            print(f"✅ Daemon started (pid {info['pid']})")
+            print(f"   Socket: {orchestrator_daemon.get_socket_path()}")
+        else:
+            print("❌ Daemon did not start - see .orchestrator/state/orchestrator-daemon.log")
+            sys.exit(1)
+    
+    elif args.action == "stop":
+        if orchestrator_daemon.shutdown():
+            print("✅ Daemon stopped")
+        else:
+            print("ℹ️ Daemon is not running")
+    
+    elif args.action == "status":
+        info = orchestrator_daemon.ping()
+        if info:
+            print(f"🛰️ Daemon running (pid {info['pid']})")
+            print(f"   Uptime: {info['uptime']}s")
+            print(f"   Requests served: {info['requests']}")
+        else:
+            print("Daemon not running (commands run in-process)")
+
+
+# ---------------------------------------------------------------------------
+# Command arguments
+# ---------------------------------------------------------------------------
+
+def _args_status(parser):
+    parser.add_argument("--deep", action="store_true",
+                        help="Exact database row counts and integrity check")
+
+
+def _args_component(parser):
+    parser.add_argument("type", choices=["hook", "agent", "workflow"])
+    parser.add_argument("name", help="Name of component")
+
+
+def _args_list(parser):
+    parser.add_argument("type", choices=["hooks", "agents", "workflows", "all"])
+
+
+def _args_workflow(parser):
+    parser.add_argument("action", choices=["activate", "deactivate", "status"])
+    parser.add_argument("name", nargs="?", help="Workflow name")
+
+
+def _args_handover(parser):
+    parser.add_argument("--summary", help="Session summary", default="")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Recompute every gathered section (info/gather/draft)")
+    parser.add_argument("--deep", action="store_true",
+                        help="Exact database row counts and integrity check (info/gather)")
+
+
+def _args_archive(parser):
+    parser.add_argument("action", choices=["list", "show", "diff", "changes", "import"], help="Archive action")
+    parser.add_argument("refs", nargs="*",
+                        help="Entry id, hash prefix or position (-1 = latest); diff defaults to -2 -1")
+    parser.add_argument("--limit", type=int, default=0, help="Only list the most recent N entries")
+    parser.add_argument("--remove-originals", action="store_true",
+                        help="Delete plain handover-*.md copies once imported (import only)")
+
+
+def _args_search(parser):
+    parser.add_argument("query", nargs="+", help="Search terms (FTS5 syntax: AND, OR, NOT, \"phrase\", prefix*)")
+    parser.add_argument("--kind", action="append", choices=["handover", "decision", "issue"],
+                        help="Only search this kind (repeatable)")
+    parser.add_argument("--limit", type=int, default=10, help="Maximum number of results")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild the index from scratch first")
+
+
+def _args_todo(parser):
+    parser.add_argument("--section", help="Only items below a heading containing this text")
+    parser.add_argument("--state", choices=["open", "in_progress", "done"], help="Only items in this state")
+    parser.add_argument("--limit", type=int, help="Show at most N items")
+    parser.add_argument("--top-level", action="store_true", help="Skip nested items")
+    parser.add_argument("--json", action="store_true", help="Print items and counts as JSON")
+
+
+def _args_files(parser):
+    parser.add_argument("action", choices=["recent", "ls", "changed"],
+                        help="Most recently modified files, one folder's entries, or files changed since --since")
+    parser.add_argument("path", nargs="?", help="Folder relative to the project root (default: whole project)")
+    parser.add_argument("--limit", type=int, default=20, help="Show at most N files (recent/changed)")
+    parser.add_argument("--since", help="Hours ago (e.g. 24) or an ISO date/time (changed)")
+    parser.add_argument("--suffix", help="Only names ending in this suffix, e.g. .md")
+    parser.add_argument("--json", action="store_true", help="Print entries as JSON")
+    parser.add_argument("--no-refresh", action="store_true", help="Query the index without rescanning")
+
+
+def _args_decisions(parser):
+    parser.add_argument("action", choices=["list", "save", "export", "mark", "import"],
+                        help="Query, save (JSON on stdin), export as JSON, mark executed, or import JSON files")
+    parser.add_argument("ids", nargs="*", type=int, help="Decision ids (mark)")
+    parser.add_argument("--task", help="Maintenance task name")
+    parser.add_argument("--session", help="Session id")
+    parser.add_argument("--decision-action", help="Decided action, e.g. add, archive, skip (list)")
+    parser.add_argument("--status", choices=["pending", "done", "failed", "skipped"],
+                        help="Execution status (list filter / mark value)")
+    parser.add_argument("--approved", choices=["yes", "no"], help="Approval filter (list)")
+    parser.add_argument("--limit", type=int, default=None, help="Show at most N decisions (list)")
+    parser.add_argument("--json", action="store_true", help="Print decisions as JSON (list)")
+
+
+def _args_headers(parser):
+    parser.add_argument("path", nargs="?", help="Folder to check (default: docs)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker threads")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--no-refresh", action="store_true", help="Use the file index without rescanning")
+
+
+def _args_links(parser):
+    parser.add_argument("action", choices=["check", "refs"],
+                        help="Report broken links and orphaned/unreachable documents, or show one document's references")
+    parser.add_argument("path", nargs="?", help="Folder to check (check) or document (refs)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--no-refresh", action="store_true", help="Use the file index without rescanning")
+
+
+def _args_maintenance(parser):
+    parser.add_argument("action", choices=["analyze", "show"],
+                        help="Run the deterministic pre-analysis, or show cached findings")
+    parser.add_argument("--task", nargs="+", metavar="TASK",
+                        help="Only these maintenance tasks (default: all task documents)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-analyze even if the inputs are unchanged")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (1 runs inline)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+
+def _args_session(parser):
+    parser.add_argument("action", choices=["start", "status", "end"], help="Session action")
+    parser.add_argument("--no-cleanup", action="store_true", help="Skip maintenance analysis")
+    parser.add_argument("--no-git", action="store_true", help="Skip git operations")
+    parser.add_argument("--emergency", action="store_true", help="Emergency mode - handover only")
+    parser.add_argument("--budget", type=int, default=None,
+                        help="Token budget for the handover sections loaded at start")
+    parser.add_argument("--sections", nargs="+", metavar="SECTION",
+                        help="Only load these handover sections: mandatory, goals, warnings, context, "
+                             "tasks, state, decisions, references, quick, checklist or title text")
+    parser.add_argument("--changes-only", action="store_true",
+                        help="Only load handover sections that are new or changed since the previous handover")
+
+
+def _args_rules(parser):
+    parser.add_argument("action", choices=["remind", "stats"], help="Rules action")
+    parser.add_argument("--export", metavar="PATH", help="Write statistics JSON to a file (stats only)")
+
+
+def _args_validate(parser):
+    parser.add_argument("root", nargs="?", help="Folder to audit (defaults to the project root)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: CPU count, 1 = inline)")
+    parser.add_argument("--json", action="store_true", help="Print one JSON record per violation")
+    parser.add_argument("--changed", action="store_true",
+                        help="Only check paths changed in git since the last --changed run")
+    parser.add_argument("--use-index", action="store_true",
+                        help="Take paths from the shared file index instead of walking the tree")
+
+
+def _args_batch(parser):
+    parser.add_argument("--stop-on-error", action="store_true",
+                        help="Stop at the first command with a non-zero exit code")
+
+
+def _args_daemon(parser):
+    parser.add_argument("action", choices=["start", "stop", "status", "run"],
+                        help="start/stop in background, show status, or run in foreground")
+
+
+# ---------------------------------------------------------------------------
+# Registry
+# ---------------------------------------------------------------------------
+
+# help: shown in the command list
+# configure: adds the command's arguments (None if it takes none)
+# handler: implementation, imports its dependencies when called
+# forwardable: can be answered by the orchestrator daemon
+Command = namedtuple("Command", ["help", "configure", "handler", "forwardable"])
+
+COMMANDS = {
+    "start": Command("Start orchestrator monitoring", None, cmd_start, False),
+    "status": Command("Show current status", _args_status, cmd_status, True),
+    "enable": Command("Enable a component", _args_component, cmd_enable, True),
+    "disable": Command("Disable a component", _args_component, cmd_disable, True),
+    "list": Command("List available components", _args_list, cmd_list, True),
+    "workflow": Command("Manage workflows", _args_workflow, cmd_workflow, True),
+    "handover": Command("Create session handover document", _args_handover, cmd_handover, True),
+    "archive": Command("List, read and diff archived handovers", _args_archive, cmd_archive, True),
+    "search": Command("Full-text search across handovers, decisions and issues",
+                      _args_search, cmd_search, True),
+    "todo": Command("Query the TODO list by section and state", _args_todo, cmd_todo, True),
+    "files": Command("Query recent, listed or changed files from the file index",
+                     _args_files, cmd_files, True),
+    "decisions": Command("Query and record maintenance task decisions", _args_decisions, cmd_decisions, True),
+    "headers": Command("Check YAML frontmatter fields of Markdown documents", _args_headers, cmd_headers, True),
+    "links": Command("Check links and references between Markdown documents", _args_links, cmd_links, True),
+    "maintenance": Command("Pre-analyze maintenance tasks concurrently (cached findings)",
+                           _args_maintenance, cmd_maintenance, True),
+    "session": Command("Manage session state", _args_session, cmd_session, True),
+    "rules": Command("Show rule reminders and enforcement statistics", _args_rules, cmd_rules, True),
+    "validate": Command("Check project files against naming and organization rules",
+                        _args_validate, cmd_validate, False),
+    "batch": Command("Run JSON-lines commands from stdin in one process", _args_batch, cmd_batch, False),
+    "daemon": Command("Control the orchestrator daemon", _args_daemon, cmd_daemon, False),
+}
+
+# Commands batch refuses: they take over the process or read stdin as a stream
+NOT_BATCHABLE = ("start", "batch", "daemon")
+
+
+def _selected_command(argv):
+    """Return the command named on the command line (first positional argument)"""
+    for arg in argv:
+        if not arg.startswith("-"):
+            return arg if arg in COMMANDS else None
+    return None
+
+
+def build_parser(argv=None):
+    """Build the argument parser
+    
+    Args:
+        argv: Command line being parsed. Only the selected command gets its
+              arguments configured; None configures every command.
+    """
+    parser = argparse.ArgumentParser(
+        description="Claude Orchestrator - Manage LLM development context and workflows"
+    )
+    parser.add_argument("--no-daemon", action="store_true",
+                        help="Run in-process even if the orchestrator daemon is running")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Print per-import and per-phase startup timings to stderr")
+    
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+    
+    selected = _selected_command(argv) if argv is not None else None
+    for name, command in COMMANDS.items():
+        subparser = subparsers.add_parser(name, help=command.help)
+        if command.configure and (selected is None or name == selected):
+            command.configure(subparser)
+    
+    return parser
+
+
+def _reads_stdin(args):
+    """Check if a command consumes stdin (must be captured before forwarding)"""
+    return ((args.command == "handover" and args.summary in ("validate", "save"))
+            or (args.command == "decisions" and args.action == "save"))
+
+
+def run_command(args):
+    """Dispatch parsed arguments to the command implementation"""
+    COMMANDS[args.command].handler(args)
+
+
+def execute_captured(argv, stdin_text="", batch=False):
+    """Run a command line in this process and capture its output
+    
+    Used by the daemon to answer forwarded requests (forwardable commands
+    only) and by batch (every command except NOT_BATCHABLE).
+    
+    Args:
+        argv: Command line without the program name
+        stdin_text: Text the command reads from stdin
+        batch: Run for batch instead of the daemon
+    
+    Returns:
+        Dictionary with exit_code, stdout and stderr
+    """
+    import io
+    import traceback
+    from contextlib import redirect_stdout, redirect_stderr
+    
+    stdout, stderr = io.StringIO(), io.StringIO()
+    exit_code = 0
+    original_stdin = sys.stdin
+    sys.stdin = io.StringIO(stdin_text or "")
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                parser = build_parser(argv)
+                args = parser.parse_args(argv)
+                if not args.command:
+                    parser.print_help()
+                elif batch and args.command in NOT_BATCHABLE:
+                    print(f"❌ '{args.command}' cannot be run inside batch")
+                    exit_code = 1
+                elif batch or COMMANDS[args.command].forwardable:
+                    run_command(args)
+                else:
+                    print(f"❌ '{args.command}' cannot be run through the daemon")
+                    exit_code = 1
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except Exception:
+                traceback.print_exc()
+                exit_code = 1
+    finally:
+        sys.stdin = original_stdin
+    
+    return {"exit_code": exit_code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def main(argv=None):
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    try:
+        with _phase("build parser"):
+            parser = build_parser(argv)
+        with _phase("parse arguments"):
+            args = parser.parse_args(argv)
+        
+        if not args.command:
+            parser.print_help()
+            return
+        
+        # Forward to the daemon when it is running, otherwise run in-process
+        if COMMANDS[args.command].forwardable and not args.no_daemon:
+            with _phase("daemon forward"):
+                import orchestrator_daemon
+                stdin_text = sys.stdin.read() if _reads_stdin(args) else None
+                response = orchestrator_daemon.forward_command(argv, stdin_text)
+            if response is not None:
+                sys.stdout.write(response.get("stdout", ""))
+                sys.stderr.write(response.get("stderr", ""))
+                sys.exit(response.get("exit_code", 0))
+            if stdin_text is not None:
+                import io
+                sys.stdin = io.StringIO(stdin_text)
+        
+        with _phase(f"run '{args.command}'"):
+            run_command(args)
+    finally:
+        if PROFILER:
+            PROFILER.uninstall()
+            sys.stdout.flush()
+            print(PROFILER.report(), file=sys.stderr)
+
 
 if __name__ == "__main__":
     main()
@@ -3,46 +3,227 @@
 Rule Injection Hook - Periodically reminds about critical rules
 
 This hook can be called to inject rule reminders into the conversation.
+
+FAST PATH:
+The hook runs on every turn, so in the steady state it must not load the
+rules or add tokens to the conversation. The reminder is precomputed into
+.orchestrator/state/rule-reminder.json and only rebuilt (through the
+RuleEnforcer) when a rule file or config/defaults.yaml changes. The fast
+path only imports os, sys, json and time.
+
+INJECTION POLICY (config/defaults.yaml, rule_injection section):
+The reminder is printed only when
+- the rules changed since the last injection
+- every_n_turns hook calls have passed since the last injection
+- context usage crossed one of context_thresholds (percent) since then
+Otherwise the hook prints nothing. Use --always to bypass the policy.
 """
 
+import os
 import sys
-from pathlib import Path
+import json
+import time
+
+ORCHESTRATOR_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RULES_DIR = os.path.join(ORCHESTRATOR_DIR, "brain", "rules")
+CONFIG_FILE = os.path.join(ORCHESTRATOR_DIR, "config", "defaults.yaml")
+# Same folder as utils.get_state_dir(), derived without importing it
+STATE_DIR = os.path.join(os.path.dirname(ORCHESTRATOR_DIR), ".orchestrator", "state")
+ARTIFACT_FILE = os.path.join(STATE_DIR, "rule-reminder.json")
+POLICY_STATE_FILE = os.path.join(STATE_DIR, "rule-injection-state.json")
+CONTEXT_STATE_FILE = os.path.join(os.path.expanduser("~"), ".claude-orchestrate", "context_state.json")
+
+ARTIFACT_VERSION = 1
+MAX_REMINDER_RULES = 5
+
+DEFAULT_POLICY = {
+    "every_n_turns": 20,
+    "context_thresholds": [70, 80, 90],
+    "max_tokens": 200000
+}
 
 # Add brain directory to path
-brain_path = Path(__file__).parent.parent.parent / "brain"
-sys.path.insert(0, str(brain_path))
+sys.path.insert(0, os.path.join(ORCHESTRATOR_DIR, "brain"))
 
-from rule_enforcer import RuleEnforcer
 
-def inject_rules():
-    """Inject critical rules reminder"""
-    enforcer = RuleEnforcer()
-    
+def render_reminder(core_rules, session_name):
+    """Format the reminder text for the given core rules and session folder"""
+    if not core_rules:
+        return ""
+
+    lines = ["", "=" * 60, "📋 CRITICAL RULES REMINDER", "=" * 60]
+
+    # Show top 5 core rules
+    for i, rule in enumerate(core_rules[:MAX_REMINDER_RULES], 1):
+        lines.append(f"{i}. {rule}")
+
+    lines.append(f"\n📅 Current session: agent-feedback/{session_name}/")
+
+    # Reminder about documentation placement
+    lines.append("\n📚 Documentation Placement:")
+    lines.append("• Permanent knowledge → Docs/")
+    lines.append("• Transient reports → agent-feedback/")
+    lines.append("• Operational data → .orchestrator/")
+
+    lines.append("=" * 60 + "\n")
+    return "\n".join(lines) + "\n"
+
+
+def inject_rules(enforcer=None):
+    """Inject critical rules reminder
+
+    Args:
+        enforcer: Already loaded RuleEnforcer to reuse (loads one if None)
+    """
+    if enforcer is None:
+        from rule_enforcer import RuleEnforcer
+        enforcer = RuleEnforcer()
+
     # Get core rules
     core_rules = enforcer.rules.get('core', {}).get('rules', [])
-    
-    if core_rules:
-        print("\n" + "="*60)
-        print("📋 CRITICAL RULES REMINDER")
-        print("="*60)
-        
-        # Show top 5 core rules
-        for i, rule in enumerate(core_rules[:5], 1):
-            print(f"{i}. {rule}")
-        
-        # Check current session naming
-        session_name = enforcer.enforce_session_naming()
-        print(f"\n📅 Current session: agent-feedback/{session_name}/")
-        
-        # Reminder about documentation placement
-        print("\n📚 Documentation Placement:")
-        print("• Permanent knowledge → Docs/")
-        print("• Transient reports → agent-feedback/")
-        print("• Operational data → .orchestrator/")
-        
-        print("="*60 + "\n")
-    
+    sys.stdout.write(render_reminder(core_rules, enforcer.enforce_session_naming()))
+
+    return True
+
+
+def get_inputs_signature():
+    """Return [name, mtime_ns, size] for every rule file and the config file"""
+    signature = []
+    try:
+        with os.scandir(RULES_DIR) as entries:
+            for entry in entries:
+                if entry.name.endswith('.yaml') and entry.is_file():
+                    stat = entry.stat()
+                    signature.append([entry.name, stat.st_mtime_ns, stat.st_size])
+    except OSError:
+        pass
+    try:
+        stat = os.stat(CONFIG_FILE)
+        signature.append(["config/defaults.yaml", stat.st_mtime_ns, stat.st_size])
+    except OSError:
+        pass
+    return sorted(signature)
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    """Write atomically so a concurrent hook never reads half a file"""
+    try:
+        os.makedirs(STATE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def load_policy():
+    """Read the rule_injection policy from config/defaults.yaml (slow path only)"""
+    policy = dict(DEFAULT_POLICY)
+    try:
+        import yaml
+        with open(CONFIG_FILE, 'r') as f:
+            config = yaml.safe_load(f) or {}
+    except Exception:
+        return policy
+
+    policy["max_tokens"] = config.get('context', {}).get('max_tokens', policy["max_tokens"])
+    for key, value in (config.get('rule_injection') or {}).items():
+        if key in policy:
+            policy[key] = value
+    return policy
+
+
+def build_artifact(signature):
+    """Load the rules and precompute everything the fast path needs"""
+    from rule_enforcer import RuleEnforcer
+    enforcer = RuleEnforcer()
+    core_rules = enforcer.rules.get('core', {}).get('rules', []) or []
+    artifact = {
+        "version": ARTIFACT_VERSION,
+        "signature": signature,
+        "core_rules": [str(rule) for rule in core_rules[:MAX_REMINDER_RULES]],
+        "policy": load_policy()
+    }
+    _write_json(ARTIFACT_FILE, artifact)
+    return artifact
+
+
+def get_context_percentage(max_tokens):
+    """Current context usage as tracked by the context guardian"""
+    state = _read_json(CONTEXT_STATE_FILE)
+    if not state or not max_tokens:
+        return 0.0
+    return state.get("current_tokens", 0) / max_tokens * 100
+
+
+def should_inject(artifact, state, rules_changed):
+    """Apply the injection policy
+
+    Args:
+        artifact: Precomputed reminder artifact (holds the policy)
+        state: Policy state, updated in place
+        rules_changed: Whether the artifact was just rebuilt
+
+    Returns:
+        Reason for injecting, or None to stay silent
+    """
+    policy = artifact["policy"]
+    state["turns"] = state.get("turns", 0) + 1
+
+    percentage = get_context_percentage(policy.get("max_tokens"))
+    level = max([t for t in policy.get("context_thresholds", []) if percentage >= t], default=0)
+
+    reason = None
+    if rules_changed:
+        reason = "rules changed"
+    elif level > state.get("context_level", 0):
+        reason = f"context at {level}%"
+    elif policy.get("every_n_turns") and state["turns"] >= policy["every_n_turns"]:
+        reason = f"{state['turns']} turns since last reminder"
+
+    # Track the level downwards too, so a reset context can trigger again
+    state["context_level"] = level
+    if reason:
+        state["turns"] = 0
+    return reason
+
+
+def main(argv=None):
+    """Print the reminder when the policy asks for it
+
+    Returns:
+        True if a reminder was injected
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    always = "--always" in argv
+
+    signature = get_inputs_signature()
+    artifact = _read_json(ARTIFACT_FILE)
+    rules_changed = (not artifact or artifact.get("version") != ARTIFACT_VERSION
+                     or artifact.get("signature") != signature)
+    if rules_changed:
+        artifact = build_artifact(signature)
+
+    state = _read_json(POLICY_STATE_FILE) or {}
+    reason = should_inject(artifact, state, rules_changed)
+    _write_json(POLICY_STATE_FILE, state)
+
+    if not (reason or always):
+        return False
+
+    session_name = f"session-{time.strftime('%Y-%m-%d')}"
+    sys.stdout.write(render_reminder(artifact["core_rules"], session_name))
     return True
 
+
 if __name__ == "__main__":
-    inject_rules()
+    main()
@@ -61,8 +61,105 @@ CREATE TABLE IF NOT EXISTS checkpoint_schedule (
     FOREIGN KEY (session_id) REFERENCES session_state(session_id)
 );
 
+-- Maintenance task decisions: one set per task and session, one row per item
+-- (brain/decision_store.py; exported as decisions_<task>_<session>.json for agents)
+CREATE TABLE IF NOT EXISTS task_decision_sets (
+    set_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    task TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    approved_by_user BOOLEAN DEFAULT TRUE,
+    extra TEXT,  -- other top-level keys as a JSON object (e.g. findings_count)
+    UNIQUE (task, session_id)
+);
+
+CREATE TABLE IF NOT EXISTS task_decisions (
+    decision_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    set_id INTEGER NOT NULL,
+    session_id TEXT NOT NULL,
+    task TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    item TEXT,
+    action TEXT,
+    details TEXT,
+    approved BOOLEAN DEFAULT TRUE,
+    status TEXT NOT NULL DEFAULT 'pending',  -- pending, done, failed, skipped
+    timestamp TEXT NOT NULL,
+    extra TEXT,  -- other item keys as a JSON object
+    FOREIGN KEY (set_id) REFERENCES task_decision_sets(set_id)
+);
+
 -- Indexes for performance
 CREATE INDEX IF NOT EXISTS idx_decisions_session ON decisions(session_id);
 CREATE INDEX IF NOT EXISTS idx_issues_session ON issues(session_id);
 CREATE INDEX IF NOT EXISTS idx_checkpoints_session ON checkpoints(session_id);
 CREATE INDEX IF NOT EXISTS idx_checkpoints_timestamp ON checkpoints(timestamp);
+CREATE INDEX IF NOT EXISTS idx_task_decisions_task ON task_decisions(task, action, status, approved);
+CREATE INDEX IF NOT EXISTS idx_task_decisions_session ON task_decisions(session_id, task);
+CREATE INDEX IF NOT EXISTS idx_task_decisions_item ON task_decisions(item);
+CREATE INDEX IF NOT EXISTS idx_task_decisions_timestamp ON task_decisions(timestamp);
+CREATE INDEX IF NOT EXISTS idx_task_decisions_set ON task_decisions(set_id);
+
+-- Row counters maintained by triggers, so status checks never COUNT(*)
+-- (brain/db_stats.py adds them to databases created before this table existed)
+CREATE TABLE IF NOT EXISTS table_stats (
+    table_name TEXT PRIMARY KEY,
+    row_count INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT OR IGNORE INTO table_stats (table_name, row_count) SELECT 'session_state', COUNT(*) FROM session_state;
+INSERT OR IGNORE INTO table_stats (table_name, row_count) SELECT 'decisions', COUNT(*) FROM decisions;
+INSERT OR IGNORE INTO table_stats (table_name, row_count) SELECT 'issues', COUNT(*) FROM issues;
+INSERT OR IGNORE INTO table_stats (table_name, row_count) SELECT 'checkpoints', COUNT(*) FROM checkpoints;
+INSERT OR IGNORE INTO table_stats (table_name, row_count) SELECT 'checkpoint_schedule', COUNT(*) FROM checkpoint_schedule;
+INSERT OR IGNORE INTO table_stats (table_name, row_count) SELECT 'task_decision_sets', COUNT(*) FROM task_decision_sets;
+INSERT OR IGNORE INTO table_stats (table_name, row_count) SELECT 'task_decisions', COUNT(*) FROM task_decisions;
+
+CREATE TRIGGER IF NOT EXISTS session_state_count_insert AFTER INSERT ON session_state BEGIN
+    UPDATE table_stats SET row_count = row_count + 1 WHERE table_name = 'session_state';
+END;
+CREATE TRIGGER IF NOT EXISTS session_state_count_delete AFTER DELETE ON session_state BEGIN
+    UPDATE table_stats SET row_count = row_count - 1 WHERE table_name = 'session_state';
+END;
+
+CREATE TRIGGER IF NOT EXISTS decisions_count_insert AFTER INSERT ON decisions BEGIN
+    UPDATE table_stats SET row_count = row_count + 1 WHERE table_name = 'decisions';
+END;
+CREATE TRIGGER IF NOT EXISTS decisions_count_delete AFTER DELETE ON decisions BEGIN
+    UPDATE table_stats SET row_count = row_count - 1 WHERE table_name = 'decisions';
+END;
+
+CREATE TRIGGER IF NOT EXISTS issues_count_insert AFTER INSERT ON issues BEGIN
+    UPDATE table_stats SET row_count = row_count + 1 WHERE table_name = 'issues';
+END;
+CREATE TRIGGER IF NOT EXISTS issues_count_delete AFTER DELETE ON issues BEGIN
+    UPDATE table_stats SET row_count = row_count - 1 WHERE table_name = 'issues';
+END;
+
+CREATE TRIGGER IF NOT EXISTS checkpoints_count_insert AFTER INSERT ON checkpoints BEGIN
+    UPDATE table_stats SET row_count = row_count + 1 WHERE table_name = 'checkpoints';
+END;
+CREATE TRIGGER IF NOT EXISTS checkpoints_count_delete AFTER DELETE ON checkpoints BEGIN
+    UPDATE table_stats SET row_count = row_count - 1 WHERE table_name = 'checkpoints';
+END;
+
+CREATE TRIGGER IF NOT EXISTS checkpoint_schedule_count_insert AFTER INSERT ON checkpoint_schedule BEGIN
+    UPDATE table_stats SET row_count = row_count + 1 WHERE table_name = 'checkpoint_schedule';
+END;
+CREATE TRIGGER IF NOT EXISTS checkpoint_schedule_count_delete AFTER DELETE ON checkpoint_schedule BEGIN
+    UPDATE table_stats SET row_count = row_count - 1 WHERE table_name = 'checkpoint_schedule';
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_decision_sets_count_insert AFTER INSERT ON task_decision_sets BEGIN
+    UPDATE table_stats SET row_count = row_count + 1 WHERE table_name = 'task_decision_sets';
+END;
+CREATE TRIGGER IF NOT EXISTS task_decision_sets_count_delete AFTER DELETE ON task_decision_sets BEGIN
+    UPDATE table_stats SET row_count = row_count - 1 WHERE table_name = 'task_decision_sets';
+END;
+
+CREATE TRIGGER IF NOT EXISTS task_decisions_count_insert AFTER INSERT ON task_decisions BEGIN
+    UPDATE table_stats SET row_count = row_count + 1 WHERE table_name = 'task_decisions';
+END;
+CREATE TRIGGER IF NOT EXISTS task_decisions_count_delete AFTER DELETE ON task_decisions BEGIN
+    UPDATE table_stats SET row_count = row_count - 1 WHERE table_name = 'task_decisions';
+END;
@@ -0,0 +1,8 @@
+"""Make orchestrate.py and the brain modules importable from the tests"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "brain"))
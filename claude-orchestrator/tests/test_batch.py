@@ -0,0 +1,32 @@
+"""batch runs commands in one process, including ones the daemon refuses"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ORCHESTRATE = Path(__file__).resolve().parent.parent / "orchestrate.py"
+
+
+def run_batch(lines, cwd):
+    stdin = "".join(json.dumps(line) + "\n" for line in lines)
+    completed = subprocess.run([sys.executable, str(ORCHESTRATE), "batch"], input=stdin,
+                               capture_output=True, text=True, cwd=cwd, timeout=60)
+    return [json.loads(line) for line in completed.stdout.splitlines()]
+
+
+def test_validate_runs_through_batch(tmp_path):
+    (tmp_path / "docs").mkdir()
+    results = run_batch([{"argv": ["validate", str(tmp_path / "docs"), "--workers", "1"]}], tmp_path)
+
+    assert len(results) == 1
+    assert "cannot be run" not in results[0]["stdout"]
+    assert "Validating project tree" in results[0]["stdout"]
+    assert results[0]["exit_code"] == 0
+
+
+def test_process_commands_are_refused_with_a_batch_message(tmp_path):
+    results = run_batch([{"cmd": "daemon status"}], tmp_path)
+
+    assert results[0]["exit_code"] == 1
+    assert "cannot be run inside batch" in results[0]["stdout"]
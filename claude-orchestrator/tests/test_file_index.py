@@ -0,0 +1,35 @@
+"""FileIndex refresh and queries"""
+
+from file_index import FileIndex, hash_file
+
+
+def make_index(tmp_path):
+    root = tmp_path / "project"
+    (root / "docs").mkdir(parents=True)
+    return root, FileIndex(root, db_path=tmp_path / "file-index.db")
+
+
+def test_hash_is_filled_in_for_rows_indexed_without_hashing(tmp_path):
+    root, index = make_index(tmp_path)
+    (root / "docs" / "a.md").write_text("# A\n")
+
+    index.refresh(hash_files=False)
+    assert index.get("docs/a.md")["hash"] is None
+
+    changes = index.refresh()
+    assert index.get("docs/a.md")["hash"] == hash_file(root / "docs" / "a.md")
+    assert changes == {"added": [], "modified": [], "removed": []}
+    index.close()
+
+
+def test_suffix_filter_is_case_sensitive_and_literal(tmp_path):
+    root, index = make_index(tmp_path)
+    for name in ("a.md", "B.MD", "c.md.bak", "a_b", "axb", "notes%md"):
+        (root / "docs" / name).write_text("x\n")
+    index.refresh()
+
+    assert [entry["path"] for entry in index.files("docs", suffix=".md")] == ["docs/a.md"]
+    assert [entry["path"] for entry in index.files("docs", suffix=".MD")] == ["docs/B.MD"]
+    assert [entry["path"] for entry in index.list_dir("docs", suffix="_b")] == ["docs/a_b"]
+    assert [entry["path"] for entry in index.recent(under="docs", suffix="%md")] == ["docs/notes%md"]
+    index.close()
@@ -0,0 +1,30 @@
+"""HandoverArchive instances share one index.json"""
+
+from handover_archive import HandoverArchive
+
+
+def handover(title):
+    return f"# {title}\n\n## Status\n\n{title} body text\n"
+
+
+def test_cached_archive_sees_and_keeps_entries_from_other_instances(tmp_path):
+    daemon = HandoverArchive(tmp_path)
+    daemon.add(handover("First"), "20250101-1000")
+    assert len(daemon.entries) == 1
+
+    # Another process (a --no-daemon save) adds to the same index
+    HandoverArchive(tmp_path).add(handover("Second"), "20250101-1100")
+    assert [entry["title"] for entry in daemon.entries] == ["First", "Second"]
+
+    daemon.add(handover("Third"), "20250101-1200")
+    assert [entry["title"] for entry in HandoverArchive(tmp_path).entries] == ["First", "Second", "Third"]
+
+
+def test_import_legacy_keeps_entries_added_elsewhere(tmp_path):
+    daemon = HandoverArchive(tmp_path)
+    daemon.add(handover("Saved"), "20250102-1000")
+    HandoverArchive(tmp_path).add(handover("Other"), "20250102-1100")
+    (tmp_path / "handover-20250101-0900.md").write_text(handover("Legacy"))
+
+    assert daemon.import_legacy()["imported"] == 1
+    assert [entry["title"] for entry in HandoverArchive(tmp_path).entries] == ["Legacy", "Saved", "Other"]
@@ -0,0 +1,73 @@
+"""SearchIndex stays current in a long-lived process"""
+
+import sqlite3
+import importlib.util
+from pathlib import Path
+
+BRAIN = Path(__file__).resolve().parent.parent / "brain"
+
+
+def load_handover_manager():
+    spec = importlib.util.spec_from_file_location("handover_manager", BRAIN / "handover-manager.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def handover(title, term):
+    return (f"---\ntitle: {title}\nproject: test\nsummary:\n  - {term}\n---\n\n# {title}\n\n"
+            f"## Work Completed\n\nThis session covered {term} in detail and nothing else.\n")
+
+
+def test_save_search_save_search_in_one_process(tmp_path, monkeypatch):
+    module = load_handover_manager()
+    monkeypatch.setattr(module, "get_state_dir", lambda: tmp_path / "state")
+    manager = module.HandoverManager(project_root=tmp_path)
+    manager.db_path = tmp_path / "session_state.db"
+
+    manager.archive_and_save_handover(handover("Session A", "zeppelin"))
+    index = manager.get_search_index()
+    assert index.search("zeppelin")
+    assert not index.search("quokka")
+
+    manager.archive_and_save_handover(handover("Session B", "quokka"))
+    manager.archive_and_save_handover(handover("Session C", "axolotl"))
+    assert manager.get_search_index() is index
+    # B was archived after the first search and is no longer handover-next.md
+    assert index.search("quokka")
+    assert index.search("axolotl")
+    assert index.search("zeppelin")
+    manager.close()
+
+
+def test_edited_database_rows_are_reindexed(tmp_path):
+    from search_index import SearchIndex
+
+    db_path = tmp_path / "session_state.db"
+    with sqlite3.connect(db_path) as db:
+        db.execute("CREATE TABLE decisions (decision_id INTEGER PRIMARY KEY, session_id TEXT, "
+                   "timestamp TEXT, what_was_decided TEXT, reason TEXT)")
+        db.execute("CREATE TABLE issues (issue_id INTEGER PRIMARY KEY, session_id TEXT, timestamp TEXT, "
+                   "issue_description TEXT, resolution_attempted TEXT, resolved BOOLEAN)")
+        db.execute("INSERT INTO issues VALUES (1, 's1', '2025-01-01', 'socket timeout', NULL, 0)")
+        db.execute("INSERT INTO decisions VALUES (1, 's1', '2025-01-01', 'use sqlite', 'simple')")
+
+    index = SearchIndex(tmp_path / "search.db", tmp_path / "docs", db_path)
+    assert index.search("socket")
+    assert not index.search("keepalive")
+
+    with sqlite3.connect(db_path) as db:
+        db.execute("UPDATE issues SET resolution_attempted = 'added keepalive', resolved = 1")
+        db.execute("UPDATE decisions SET what_was_decided = 'use postgres'")
+        db.execute("INSERT INTO decisions VALUES (2, 's2', '2025-01-02', 'cache tokens', NULL)")
+
+    assert [result["ref"] for result in index.search("keepalive")] == ["issue-1 (s1)"]
+    assert index.search("postgres")
+    assert not index.search("sqlite")
+    assert len(index.search("socket OR keepalive")) == 1
+    assert index.search("tokens")
+
+    with sqlite3.connect(db_path) as db:
+        db.execute("INSERT INTO decisions VALUES (3, 's2', '2025-01-02', 'drop cache', NULL)")
+    assert index.refresh()["decision"] == 1
+    index.close()
@@ -18,6 +18,25 @@ DEFAULT_MAX_TOKENS = 200000  # Claude's approximate context limit
 WARNING_LEVELS = [70, 80, 90]  # Percentage thresholds
 CHECKPOINT_LEVEL = 80  # Auto-checkpoint at this level
 
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate token count for text (shared by ContextMonitor and the
+    session loader, which budgets handover sections with it).
+    Rough approximation: 1 token ≈ 4 characters for English text
+    """
+    # More accurate estimation based on common patterns
+    # Average English word is ~4.7 characters, ~1.3 tokens per word
+    words = len(text.split())
+    chars = len(text)
+    
+    # Use combination of methods for better accuracy
+    token_estimate = max(
+        chars / 4,  # Character-based estimate
+        words * 1.3  # Word-based estimate
+    )
+    
+    return int(token_estimate)
+
 class ContextMonitor:
     """Monitors context usage and provides warnings"""
     
@@ -41,18 +60,7 @@ class ContextMonitor:
         Estimate token count for text.
         Rough approximation: 1 token ≈ 4 characters for English text
         """
-        # More accurate estimation based on common patterns
-        # Average English word is ~4.7 characters, ~1.3 tokens per word
-        words = len(text.split())
-        chars = len(text)
-        
-        # Use combination of methods for better accuracy
-        token_estimate = max(
-            chars / 4,  # Character-based estimate
-            words * 1.3  # Word-based estimate
-        )
-        
-        return int(token_estimate)
+        return estimate_tokens(text)
     
     def add_content(self, content: str, content_type: str = "message") -> Dict:
         """Add content and check context usage"""